@@ -0,0 +1,143 @@
+"""
+Benchmark: per-call Zotero clients versus the pooled client.
+
+Runs a local stand-in for the Zotero Web API that counts accepted connections
+and sleeps for ``--handshake-ms`` on every new connection to model the TCP+TLS
+handshake with api.zotero.org. The same sequence of item requests is then made
+with a fresh ``pyzotero`` client per call (the old ``get_zotero_client()``
+behaviour) and with leases from ``ZoteroClientPool``. Fresh clients also pay
+for building a new SSL context on every call, which the numbers include.
+
+Usage:
+    python benchmarks/bench_client_pool.py --calls 200 --threads 8
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pyzotero import zotero
+
+from zotero_web_mcp.client_pool import ZoteroClientPool
+
+ITEM = {
+    "key": "ABCD1234",
+    "version": 1,
+    "data": {"key": "ABCD1234", "itemType": "journalArticle", "title": "Benchmark"},
+}
+
+
+class StandInServer:
+    """Minimal keep-alive HTTP server answering every GET with one item."""
+
+    def __init__(self, handshake_delay: float):
+        self.connections = 0
+        self.requests = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with lock:
+                    server.connections += 1
+                time.sleep(handshake_delay)
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with lock:
+                    server.requests += 1
+                body = json.dumps(ITEM).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Last-Modified-Version", "1")
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def reset(self):
+        self.connections = 0
+        self.requests = 0
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def fresh_client_call(url: str) -> None:
+    zot = zotero.Zotero("1", "user", "key")
+    zot.endpoint = url
+    zot.item("ABCD1234")
+    zot.client.close()
+
+
+def run(label, fn, calls, threads, server):
+    server.reset()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: fn(), range(calls)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<10} {calls:>6} calls  {server.connections:>5} connections  "
+        f"{elapsed * 1000:>9.1f} ms total  {elapsed / calls * 1000:>7.2f} ms/call"
+    )
+    return elapsed, server.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument(
+        "--handshake-ms",
+        type=float,
+        default=30.0,
+        help="Simulated handshake cost per new connection (default: 30)",
+    )
+    args = parser.parse_args()
+
+    server = StandInServer(args.handshake_ms / 1000)
+    pool = ZoteroClientPool(
+        "1", "user", "key", size=args.pool_size, endpoint=server.url
+    )
+
+    def pooled_call():
+        with pool.client() as zot:
+            zot.item("ABCD1234")
+
+    try:
+        fresh_time, fresh_conns = run(
+            "fresh",
+            lambda: fresh_client_call(server.url),
+            args.calls,
+            args.threads,
+            server,
+        )
+        pooled_time, pooled_conns = run(
+            "pooled", pooled_call, args.calls, args.threads, server
+        )
+    finally:
+        pool.close()
+        server.close()
+
+    print(
+        f"\nhandshakes saved: {fresh_conns - pooled_conns} "
+        f"({fresh_conns} -> {pooled_conns}), speedup: {fresh_time / pooled_time:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Benchmark: import and cold-start time of the command-line entry points.
+
+Every stdio spawn from Claude Desktop pays for the imports of the server
+before the first handshake, so heavy dependencies (markitdown, pyzotero and
+bibtexparser) must load on first use. This benchmark measures, in fresh
+interpreters:
+
+- the import time of ``zotero_web_mcp.cli`` and ``zotero_web_mcp.server``,
+  from ``python -X importtime``, with the slowest modules of the server;
+- the wall time of ``zotero-web-mcp version``;
+- the time until ``serve`` answers an ``initialize`` request over stdio, and
+  that markitdown and pyzotero are still not loaded at that point.
+
+It exits with status 1 if a threshold is exceeded, so it can guard against
+import-time regressions.
+
+Usage:
+    python benchmarks/bench_import_time.py --runs 5 --max-version-ms 100
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# Modules that must not be imported before the first tool call that needs them
+LAZY_MODULES = ("markitdown", "pyzotero", "bibtexparser")
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "bench", "version": "0"},
+    },
+}
+
+# Reports which lazy modules the server process loaded, after initialize
+LOADED_AFTER_INITIALIZE = f"""
+import asyncio, json, sys
+from fastmcp import Client
+from zotero_web_mcp.server import mcp
+
+async def main():
+    async with Client(mcp):
+        pass
+
+asyncio.run(main())
+print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    # Credentials are only needed by tool calls, never at startup
+    env.setdefault("ZOTERO_LIBRARY_ID", "0")
+    env.setdefault("ZOTERO_API_KEY", "bench")
+    env["PYTHONWARNINGS"] = "ignore"
+    return env
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        (module, self_us, cumulative_us) for every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def cumulative_ms(times: List[Tuple[str, int, int]], module: str) -> float:
+    return next(c for name, _, c in times if name == module) / 1000
+
+
+def version_ms() -> float:
+    """Wall time of ``zotero-web-mcp version`` in a fresh interpreter."""
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "zotero_web_mcp.cli", "version"],
+        env=_env(),
+        capture_output=True,
+        check=True,
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def initialize_ms() -> float:
+    """Time from spawning ``serve`` until it answers ``initialize`` over stdio."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "zotero_web_mcp.cli", "serve", "--no-warm-up"],
+        env=_env(),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        process.stdin.write(json.dumps(INITIALIZE) + "\n")
+        process.stdin.flush()
+        response = json.loads(process.stdout.readline())
+        elapsed = (time.perf_counter() - started) * 1000
+        if "result" not in response:
+            raise RuntimeError(f"initialize failed: {response}")
+        return elapsed
+    finally:
+        process.kill()
+        process.wait()
+
+
+def loaded_after_initialize() -> List[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", LOADED_AFTER_INITIALIZE],
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument(
+        "--max-version-ms",
+        type=float,
+        default=100.0,
+        help="Maximum median wall time of 'zotero-web-mcp version'",
+    )
+    parser.add_argument(
+        "--max-cli-import-ms",
+        type=float,
+        default=20.0,
+        help="Maximum median import time of zotero_web_mcp.cli",
+    )
+    parser.add_argument(
+        "--max-initialize-ms",
+        type=float,
+        default=None,
+        help="Maximum median time until 'serve' answers initialize (default: "
+        "report only)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Slowest server imports to list"
+    )
+    args = parser.parse_args()
+    runs = max(1, args.runs)
+
+    cli_ms = statistics.median(
+        cumulative_ms(import_times("zotero_web_mcp.cli"), "zotero_web_mcp.cli")
+        for _ in range(runs)
+    )
+    server_times = import_times("zotero_web_mcp.server")
+    server_ms = cumulative_ms(server_times, "zotero_web_mcp.server")
+    version = statistics.median(version_ms() for _ in range(runs))
+    initialize = statistics.median(initialize_ms() for _ in range(runs))
+    loaded = loaded_after_initialize()
+
+    print(f"import zotero_web_mcp.cli:      {cli_ms:8.1f} ms")
+    print(f"import zotero_web_mcp.server:   {server_ms:8.1f} ms")
+    print(f"zotero-web-mcp version:         {version:8.1f} ms (wall)")
+    print(f"serve until initialize answered: {initialize:7.1f} ms (wall)")
+    print(f"lazy modules loaded after initialize: {', '.join(loaded) or 'none'}")
+    print(f"\nSlowest imports of the server (cumulative, top {args.top}):")
+    top_level = [t for t in server_times if not t[0].startswith("zotero_web_mcp")]
+    for name, _, cumulative in sorted(top_level, key=lambda t: -t[2])[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failures = []
+    if version > args.max_version_ms:
+        failures.append(f"version took {version:.1f} ms > {args.max_version_ms} ms")
+    if cli_ms > args.max_cli_import_ms:
+        failures.append(
+            f"cli import took {cli_ms:.1f} ms > {args.max_cli_import_ms} ms"
+        )
+    if args.max_initialize_ms is not None and initialize > args.max_initialize_ms:
+        failures.append(
+            f"initialize took {initialize:.1f} ms > {args.max_initialize_ms} ms"
+        )
+    if loaded:
+        failures.append(f"loaded before first use: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
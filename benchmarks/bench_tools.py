@@ -0,0 +1,230 @@
+"""
+Benchmark: wall time and upstream requests of every tool, by library size.
+
+For each library size, a synthetic library is generated and served by the
+local fake Web API (see fake_zotero.py) with the injected latency, and every
+tool is called in-process through an MCP client:
+
+- once cold, right after the server process state for that library was
+  created (empty caches, no mirror), and
+- ``--repeat`` more times warm, reporting the median.
+
+For each call the fake counts the requests and response bytes the tool
+caused, so a change that adds round trips shows up even when latency hides
+nothing locally. Write tools are left out unless named with ``--tools``; they
+change the library version and so the warm numbers of later tools.
+
+Usage:
+    python benchmarks/bench_tools.py --sizes 1000,10000,100000 --latency-ms 20
+    python benchmarks/bench_tools.py --sizes 1000 --tools zotero_get_recent \\
+        --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from fake_zotero import (  # noqa: E402
+    LIBRARY_ID,
+    WORDS,
+    FakeZoteroServer,
+    SyntheticLibrary,
+    make_library,
+)
+
+# Tools that write to the library, only run when named explicitly
+WRITE_TOOLS = ("zotero_batch_update_tags", "zotero_create_note")
+
+
+def tool_cases(library: SyntheticLibrary) -> List[Tuple[str, Dict[str, Any]]]:
+    """A representative call of every tool, with arguments from the library."""
+    top = library.top_level_keys
+    item = top[0]
+    with_fulltext = next(
+        (
+            library.items[key]["data"]["parentItem"]
+            for key in library.fulltext
+            if key in library.items
+        ),
+        item,
+    )
+    tag = max(library.tags(), key=lambda t: t[1])[0]
+    collection = max(library.collections, key=lambda k: len(library.in_collection(k)))
+    word = WORDS[0]
+    return [
+        ("zotero_search_items", {"query": word}),
+        ("zotero_search_by_tag", {"tag": [tag]}),
+        ("zotero_get_item_metadata", {"item_key": item}),
+        ("zotero_get_item_children", {"item_key": item}),
+        ("zotero_get_item_fulltext", {"item_key": with_fulltext}),
+        ("zotero_get_collections", {}),
+        ("zotero_get_collection_items", {"collection_key": collection}),
+        ("zotero_get_tags", {}),
+        ("zotero_get_recent", {}),
+        ("zotero_get_annotations", {"item_key": item}),
+        ("zotero_get_notes", {"item_key": item}),
+        ("zotero_search_notes", {"query": word}),
+        ("zotero_search_fulltext", {"query": word}),
+        (
+            "zotero_advanced_search",
+            {
+                "conditions": [
+                    {"field": "title", "operation": "contains", "value": word},
+                    {"field": "tag", "operation": "is", "value": tag},
+                ]
+            },
+        ),
+        (
+            "zotero_batch_update_tags",
+            {"query": f"{word} {WORDS[1]}", "add_tags": ["benchmark"], "limit": 10},
+        ),
+        (
+            "zotero_create_note",
+            {"item_key": item, "note_title": "Benchmark", "note_text": "Benchmark"},
+        ),
+    ]
+
+
+async def _call(client: Any, server: FakeZoteroServer, tool: str, args: dict) -> dict:
+    requests, sent = server.counts()
+    started = time.perf_counter()
+    error = None
+    try:
+        result = await client.call_tool(tool, args)
+        content = getattr(result, "content", result)
+        text = content[0].text if content else ""
+        if text.startswith("Error"):
+            error = text.splitlines()[0]
+    except Exception as e:
+        error = str(e).splitlines()[0]
+    elapsed = time.perf_counter() - started
+    requests_after, sent_after = server.counts()
+    return {
+        "ms": elapsed * 1000,
+        "requests": requests_after - requests,
+        "bytes": sent_after - sent,
+        "error": error,
+    }
+
+
+async def run_size(
+    size: int, latency: float, repeat: int, tools: Optional[List[str]]
+) -> List[Dict[str, Any]]:
+    """Benchmark the tools against a fresh library of ``size`` items."""
+    from fastmcp import Client
+
+    from zotero_web_mcp.server import mcp
+
+    library = make_library(size)
+    n_items = len(library.items)
+    results = []
+    with FakeZoteroServer(library, latency=latency) as server:
+        # A new endpoint gets new pools, caches and validators in the server
+        os.environ["ZOTERO_API_BASE_URL"] = server.url
+        os.environ["ZOTERO_CACHE_DIR"] = tempfile.mkdtemp(prefix="zotero-bench-")
+        cases = [
+            (tool, args)
+            for tool, args in tool_cases(library)
+            if (tools is None and tool not in WRITE_TOOLS)
+            or (tools is not None and tool in tools)
+        ]
+        async with Client(mcp) as client:
+            for tool, args in cases:
+                cold = await _call(client, server, tool, args)
+                warm = [await _call(client, server, tool, args) for _ in range(repeat)]
+                results.append(
+                    {
+                        "size": n_items,
+                        "tool": tool,
+                        "cold_ms": cold["ms"],
+                        "cold_requests": cold["requests"],
+                        "cold_bytes": cold["bytes"],
+                        "warm_ms": (
+                            statistics.median(w["ms"] for w in warm) if warm else None
+                        ),
+                        "warm_requests": (
+                            max(w["requests"] for w in warm) if warm else None
+                        ),
+                        "error": cold["error"]
+                        or next((w["error"] for w in warm if w["error"]), None),
+                    }
+                )
+    return results
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:9.1f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Comma-separated library sizes in items (default: 1000,10000; "
+        "100000 takes a while)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=20.0,
+        help="Latency of every fake API request (default: 20)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Warm calls per tool (default: 3)"
+    )
+    parser.add_argument(
+        "--tools",
+        help="Comma-separated tools to run (default: every read-only tool)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="ZOTERO_RATE_LIMIT for the run (default: 0, no client-side limit)",
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    os.environ["ZOTERO_LIBRARY_ID"] = LIBRARY_ID
+    os.environ["ZOTERO_LIBRARY_TYPE"] = "user"
+    os.environ["ZOTERO_API_KEY"] = "benchmark"
+    os.environ["ZOTERO_RATE_LIMIT"] = str(args.rate_limit)
+    tools = [t.strip() for t in args.tools.split(",")] if args.tools else None
+
+    results: List[Dict[str, Any]] = []
+    print(
+        f"{'items':>7}  {'tool':<28} {'cold ms':>9} {'req':>5} {'KiB':>7} "
+        f"{'warm ms':>9} {'req':>5}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        for row in asyncio.run(
+            run_size(size, args.latency_ms / 1000, max(0, args.repeat), tools)
+        ):
+            results.append(row)
+            print(
+                f"{row['size']:>7}  {row['tool']:<28} {_format_ms(row['cold_ms'])} "
+                f"{row['cold_requests']:>5} {row['cold_bytes'] / 1024:>7.0f} "
+                f"{_format_ms(row['warm_ms'])} "
+                f"{'-' if row['warm_requests'] is None else row['warm_requests']:>5}"
+                + (f"  ERROR: {row['error']}" if row["error"] else "")
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(row["error"] for row in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
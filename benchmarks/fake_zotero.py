@@ -0,0 +1,790 @@
+"""
+Local stand-in for the Zotero Web API, serving a synthetic library.
+
+The benchmarks run the real tools against this server instead of
+api.zotero.org, so results are reproducible offline and every upstream
+request can be counted. It emulates the parts of the API the tools use:
+
+- ``/users/<id>/items`` (also ``/items/top``, ``/items/<key>``,
+  ``/items/<key>/children``, ``/items/<key>/fulltext`` and
+  ``/items/<key>/file``) with ``q``/``qmode``, ``itemType``, ``tag``,
+  ``itemKey``, ``since``, ``sort``/``direction`` and ``format=versions``;
+- ``/collections`` (``/top``, ``/<key>``, ``/<key>/items``,
+  ``/<key>/collections``), ``/tags``, ``/fulltext``, ``/searches`` and
+  ``/deleted``;
+- item writes (``POST /items`` and ``PATCH /items/<key>``) with version
+  checks, so write tools can be measured too.
+
+Multi-object responses are paged like the API's: at most 100 objects per page,
+with ``Total-Results`` and ``Link`` headers. Every response carries
+``Last-Modified-Version`` and reads honor ``If-Modified-Since-Version`` and
+``If-Unmodified-Since-Version``. A fixed latency (plus optional jitter) can be
+injected into every request, and throttle() rejects the next requests with
+429 or 503 to exercise backoff.
+
+Run it on its own to point a server or a load test at it:
+
+    python benchmarks/fake_zotero.py --items 10000 --port 8080 --latency-ms 50
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+# Maximum number of objects per page, like the Web API
+MAX_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = 25
+
+# Library ID the fake answers for (any ID is accepted)
+LIBRARY_ID = "1"
+
+WORDS = (
+    "neural quantum climate graph learning protein market robot language vision "
+    "network memory ocean carbon genome policy signal matter energy model "
+    "theory data cell brain urban trade light sound risk health"
+).split()
+
+LAST_NAMES = (
+    "Smith Garcia Chen Müller Rossi Tanaka Okafor Novak Silva Kowalski "
+    "Nguyen Haddad Johansson Dubois Kim Patel Ivanova Moreau Santos Berg"
+).split()
+
+
+def minimal_pdf(text: str) -> bytes:
+    """A valid one-page PDF showing ``text``, for the /file endpoint."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1", "replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+@dataclass
+class SyntheticLibrary:
+    """A generated library with the indexes the fake server answers from."""
+
+    items: Dict[str, Dict[str, Any]]
+    collections: Dict[str, Dict[str, Any]]
+    fulltext: Dict[str, Dict[str, Any]]
+    version: int
+
+    def __post_init__(self):
+        self.lock = threading.RLock()
+        self.deleted: Dict[str, List[str]] = {
+            "items": [],
+            "collections": [],
+            "searches": [],
+            "tags": [],
+        }
+        self.reindex()
+
+    @property
+    def top_level_keys(self) -> List[str]:
+        return self._top
+
+    def reindex(self) -> None:
+        """Rebuild the indexes and encoded objects, e.g. after a write."""
+        with self.lock:
+            self.order = list(self.items)
+            self._top = [
+                k for k in self.order if "parentItem" not in self.items[k]["data"]
+            ]
+            self._children: Dict[str, List[str]] = defaultdict(list)
+            self._by_collection: Dict[str, List[str]] = defaultdict(list)
+            self._tag_counts: Dict[str, int] = defaultdict(int)
+            self._title_text: Dict[str, str] = {}
+            self._all_text: Dict[str, str] = {}
+            for key in self.order:
+                data = self.items[key]["data"]
+                if "parentItem" in data:
+                    self._children[data["parentItem"]].append(key)
+                for collection in data.get("collections", []):
+                    self._by_collection[collection].append(key)
+                for tag in data.get("tags", []):
+                    self._tag_counts[tag["tag"]] += 1
+                creators = " ".join(
+                    c.get("lastName", c.get("name", ""))
+                    for c in data.get("creators", [])
+                )
+                title = (
+                    f"{data.get('title', '')} {creators} {data.get('date', '')}".lower()
+                )
+                self._title_text[key] = title
+                self._all_text[key] = " ".join(
+                    [
+                        title,
+                        data.get("abstractNote", ""),
+                        data.get("note", ""),
+                        data.get("annotationText", ""),
+                        data.get("annotationComment", ""),
+                    ]
+                ).lower()
+            self._encoded = {
+                key: json.dumps(obj).encode() for key, obj in self.items.items()
+            }
+            self._encoded_collections = {
+                key: json.dumps(obj).encode() for key, obj in self.collections.items()
+            }
+            self._sorted: Dict[str, List[str]] = {}
+
+    def encoded(self, key: str) -> bytes:
+        return self._encoded.get(key) or self._encoded_collections[key]
+
+    def edit(self, key: str, **data: Any) -> None:
+        """Change an item as another client would, bumping the version."""
+        with self.lock:
+            self.version += 1
+            item = self.items[key]
+            item["data"].update(data)
+            item["version"] = item["data"]["version"] = self.version
+            self.reindex()
+
+    def delete(self, key: str) -> None:
+        """Delete an item as another client would, bumping the version."""
+        with self.lock:
+            self.version += 1
+            del self.items[key]
+            self.fulltext.pop(key, None)
+            self.deleted["items"].append(key)
+            self.reindex()
+
+    def children(self, key: str) -> List[str]:
+        return self._children.get(key, [])
+
+    def in_collection(self, key: str) -> List[str]:
+        return self._by_collection.get(key, [])
+
+    def tags(self) -> List[Tuple[str, int]]:
+        return sorted(self._tag_counts.items())
+
+    def matches(self, key: str, words: List[str], everything: bool) -> bool:
+        text = (self._all_text if everything else self._title_text)[key]
+        return all(word in text for word in words)
+
+    def sorted_keys(self, keys: List[str], field: str) -> List[str]:
+        """``keys`` ordered by a data field, using a cached order of all items."""
+        order = self._sorted.get(field)
+        if order is None:
+            order = self._sorted[field] = sorted(
+                self.order, key=lambda k: str(self.items[k]["data"].get(field, ""))
+            )
+        if len(keys) == len(self.order):
+            return order
+        wanted = set(keys)
+        return [k for k in order if k in wanted]
+
+
+def make_library(
+    n_items: int = 1000,
+    n_collections: Optional[int] = None,
+    fulltext_ratio: float = 0.5,
+    seed: int = 1,
+) -> SyntheticLibrary:
+    """
+    Generate a library of about ``n_items`` items of all types.
+
+    Every record is a journal article with a PDF attachment and two highlight
+    annotations on it; every fifth article also has a child note. Records are
+    added until the item count (children included) reaches ``n_items``.
+
+    Args:
+        n_items: Total number of items, children included.
+        n_collections: Number of collections, some nested (default: one per
+            100 articles, at least 5).
+        fulltext_ratio: Share of attachments with indexed full text.
+        seed: Random seed; the same arguments give the same library.
+    """
+    rnd = random.Random(seed)
+    n_records = max(1, round(n_items / 4.2))
+    if n_collections is None:
+        n_collections = max(5, n_records // 100)
+
+    collections: Dict[str, Dict[str, Any]] = {}
+    for i in range(n_collections):
+        key = f"C{i:07d}"
+        parent = (
+            rnd.choice(list(collections))
+            if collections and rnd.random() < 0.3
+            else False
+        )
+        data = {
+            "key": key,
+            "version": 1,
+            "name": f"{rnd.choice(WORDS).title()} {rnd.choice(WORDS)} {i}",
+            "parentCollection": parent,
+            "relations": {},
+        }
+        collections[key] = {
+            "key": key,
+            "version": 1,
+            "library": {"type": "user", "id": int(LIBRARY_ID)},
+            "data": data,
+            "meta": {"numCollections": 0, "numItems": 0},
+        }
+    collection_keys = list(collections)
+
+    items: Dict[str, Dict[str, Any]] = {}
+    fulltext: Dict[str, Dict[str, Any]] = {}
+    version = 1
+
+    def add(key: str, data: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        data.update(key=key, version=version)
+        items[key] = {
+            "key": key,
+            "version": version,
+            "library": {"type": "user", "id": int(LIBRARY_ID)},
+            "data": data,
+            "meta": meta,
+        }
+
+    for i in range(n_records):
+        if len(items) >= n_items:
+            break
+        version += 1
+        key = f"I{i:07d}"
+        title = " ".join(rnd.sample(WORDS, rnd.randint(3, 7))).capitalize()
+        added = time.strftime(
+            "%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_500_000_000 + i * 3600)
+        )
+        creators = [
+            {
+                "creatorType": "author",
+                "firstName": rnd.choice("ABCDEFGHJKLMNPRS") + ".",
+                "lastName": rnd.choice(LAST_NAMES),
+            }
+            for _ in range(rnd.randint(1, 4))
+        ]
+        add(
+            key,
+            {
+                "itemType": "journalArticle",
+                "title": title,
+                "creators": creators,
+                "abstractNote": " ".join(rnd.choices(WORDS, k=60)),
+                "publicationTitle": f"Journal of {rnd.choice(WORDS).title()}",
+                "date": str(1980 + i % 45),
+                "DOI": f"10.5555/{i}",
+                "tags": [{"tag": w} for w in rnd.sample(WORDS, rnd.randint(1, 4))],
+                "collections": rnd.sample(
+                    collection_keys, min(len(collection_keys), rnd.randint(0, 2))
+                ),
+                "relations": {},
+                "dateAdded": added,
+                "dateModified": added,
+            },
+            {"creatorSummary": creators[0]["lastName"], "numChildren": 1},
+        )
+        attachment = f"A{i:07d}"
+        add(
+            attachment,
+            {
+                "itemType": "attachment",
+                "parentItem": key,
+                "linkMode": "imported_file",
+                "title": "Full Text PDF",
+                "contentType": "application/pdf",
+                "filename": f"{attachment}.pdf",
+                "md5": f"{i:032x}",
+                "tags": [],
+                "relations": {},
+                "dateAdded": added,
+                "dateModified": added,
+            },
+            {},
+        )
+        if rnd.random() < fulltext_ratio:
+            fulltext[attachment] = {
+                "content": f"{title}\n\n" + " ".join(rnd.choices(WORDS, k=2000)),
+                "indexedPages": 10,
+                "totalPages": 10,
+                "version": version,
+            }
+        for j in range(2):
+            annotation = f"N{i:06d}{j}"
+            add(
+                annotation,
+                {
+                    "itemType": "annotation",
+                    "parentItem": attachment,
+                    "annotationType": "highlight",
+                    "annotationText": " ".join(rnd.choices(WORDS, k=12)),
+                    "annotationComment": "",
+                    "annotationColor": "#ffd400",
+                    "annotationPageLabel": str(j + 1),
+                    "tags": [],
+                    "relations": {},
+                    "dateAdded": added,
+                    "dateModified": added,
+                },
+                {},
+            )
+        if i % 5 == 0:
+            note = f"M{i:07d}"
+            add(
+                note,
+                {
+                    "itemType": "note",
+                    "parentItem": key,
+                    "note": f"<p>Notes on {title}: "
+                    + " ".join(rnd.choices(WORDS, k=30))
+                    + "</p>",
+                    "tags": [],
+                    "relations": {},
+                    "dateAdded": added,
+                    "dateModified": added,
+                },
+                {},
+            )
+
+    for item in items.values():
+        for collection in item["data"].get("collections", []):
+            collections[collection]["meta"]["numItems"] += 1
+    return SyntheticLibrary(items, collections, fulltext, version)
+
+
+class FakeZoteroServer:
+    """HTTP server emulating the Zotero Web API for one synthetic library."""
+
+    def __init__(
+        self,
+        library: SyntheticLibrary,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Start serving in a background thread.
+
+        Args:
+            library: The library to serve.
+            latency: Seconds added to every request.
+            jitter: Maximum random seconds added on top of ``latency``.
+            host: Interface to bind to.
+            port: Port to bind to (0 picks a free one).
+        """
+        self.library = library
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.bytes_sent = 0
+        self.request_log: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        # Responses to send instead of answering the next requests
+        self._throttled: List[Tuple[int, Dict[str, str]]] = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                fake._handle(self, "GET")
+
+            def do_POST(self) -> None:
+                fake._handle(self, "POST")
+
+            def do_PATCH(self) -> None:
+                fake._handle(self, "PATCH")
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeZoteroServer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def throttle(
+        self,
+        count: int = 1,
+        status: int = 429,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Answer the next ``count`` requests with an error, as an overloaded API would.
+
+        Args:
+            count: Number of requests to reject.
+            status: Status code of the rejections (429 or 503).
+            headers: Headers of the rejections, e.g. ``Retry-After``.
+        """
+        with self._lock:
+            self._throttled.extend([(status, headers or {})] * count)
+
+    def counts(self) -> Tuple[int, int]:
+        """(requests, response bytes) served so far."""
+        with self._lock:
+            return self.requests, self.bytes_sent
+
+    # -- HTTP plumbing -----------------------------------------------------
+
+    def _send(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        body: Any = b"",
+        headers: Optional[Dict[str, str]] = None,
+        content_type: str = "application/json",
+    ) -> None:
+        raw = body if isinstance(body, bytes) else json.dumps(body).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(raw)))
+        handler.send_header("Last-Modified-Version", str(self.library.version))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(raw)
+        with self._lock:
+            self.bytes_sent += len(raw)
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        url = urlparse(handler.path)
+        query = parse_qs(url.query)
+        with self._lock:
+            self.requests += 1
+            self.request_log.append((method, handler.path))
+            throttled = self._throttled.pop(0) if self._throttled else None
+        if throttled is not None:
+            status, headers = throttled
+            return self._send(
+                handler,
+                status,
+                b"Too many requests",
+                headers,
+                content_type="text/plain",
+            )
+        path = re.sub(r"^/(users|groups)/[^/]+", "", url.path).rstrip("/")
+        try:
+            if method == "GET":
+                self._get(handler, url.path, path, query)
+            else:
+                self._write(handler, method, path)
+        except KeyError:
+            self._send(handler, 404, b"Not found", content_type="text/plain")
+
+    # -- Reads ---------------------------------------------------------------
+
+    def _get(
+        self,
+        handler: BaseHTTPRequestHandler,
+        full_path: str,
+        path: str,
+        query: Dict[str, List[str]],
+    ) -> None:
+        lib = self.library
+        since_version = handler.headers.get("If-Modified-Since-Version")
+        if since_version is not None and int(since_version) >= lib.version:
+            return self._send(handler, 304)
+        pinned_version = handler.headers.get("If-Unmodified-Since-Version")
+        if pinned_version is not None and int(pinned_version) != lib.version:
+            return self._send(
+                handler, 412, b"Library has been modified", content_type="text/plain"
+            )
+
+        with lib.lock:
+            if match := re.fullmatch(r"/items/(\w+)/file(/view)?", path):
+                item = lib.items[match.group(1)]
+                return self._send(
+                    handler,
+                    200,
+                    minimal_pdf(item["data"].get("title", match.group(1))),
+                    content_type="application/pdf",
+                )
+            if match := re.fullmatch(r"/items/(\w+)/fulltext", path):
+                return self._send(handler, 200, lib.fulltext[match.group(1)])
+            if path == "/fulltext":
+                since = int(query.get("since", ["0"])[0])
+                return self._send(
+                    handler,
+                    200,
+                    {
+                        k: v["version"]
+                        for k, v in lib.fulltext.items()
+                        if v["version"] > since
+                    },
+                )
+            if path == "/deleted":
+                return self._send(handler, 200, lib.deleted)
+            if path == "/searches":
+                return self._send(handler, 200, [], {"Total-Results": "0"})
+            if path == "/tags":
+                tags = [
+                    {"tag": tag, "links": {}, "meta": {"type": 0, "numItems": count}}
+                    for tag, count in lib.tags()
+                ]
+                return self._page(
+                    handler, full_path, query, [json.dumps(t).encode() for t in tags]
+                )
+            if path in ("/collections", "/collections/top") or re.fullmatch(
+                r"/collections/\w+/collections", path
+            ):
+                collections = list(lib.collections.values())
+                if path == "/collections/top":
+                    collections = [
+                        c for c in collections if not c["data"]["parentCollection"]
+                    ]
+                elif path != "/collections":
+                    parent = path.split("/")[2]
+                    collections = [
+                        c
+                        for c in collections
+                        if c["data"]["parentCollection"] == parent
+                    ]
+                if "collectionKey" in query:
+                    wanted = set(query["collectionKey"][0].split(","))
+                    collections = [c for c in collections if c["key"] in wanted]
+                return self._objects(
+                    handler, full_path, query, [c["key"] for c in collections]
+                )
+            if match := re.fullmatch(r"/collections/(\w+)", path):
+                return self._send(handler, 200, lib.collections[match.group(1)])
+            if match := re.fullmatch(r"/collections/(\w+)/items(/top)?", path):
+                lib.collections[match.group(1)]
+                keys = lib.in_collection(match.group(1))
+                if match.group(2):
+                    keys = [k for k in keys if "parentItem" not in lib.items[k]["data"]]
+                return self._items(handler, full_path, query, keys)
+            if path == "/items":
+                return self._items(handler, full_path, query, lib.order)
+            if path == "/items/top":
+                return self._items(handler, full_path, query, lib.top_level_keys)
+            if match := re.fullmatch(r"/items/(\w+)/children", path):
+                lib.items[match.group(1)]
+                return self._items(
+                    handler, full_path, query, lib.children(match.group(1))
+                )
+            if match := re.fullmatch(r"/items/(\w+)", path):
+                item = lib.items[match.group(1)]
+                return self._send(handler, 200, lib.encoded(item["key"]))
+        raise KeyError(path)
+
+    def _items(
+        self,
+        handler: BaseHTTPRequestHandler,
+        full_path: str,
+        query: Dict[str, List[str]],
+        keys: List[str],
+    ) -> None:
+        lib = self.library
+        if "since" in query:
+            since = int(query["since"][0])
+            keys = [k for k in keys if lib.items[k]["version"] > since]
+        if "itemKey" in query:
+            wanted = set(query["itemKey"][0].split(","))
+            keys = [k for k in keys if k in wanted]
+        if item_type := query.get("itemType", [""])[0]:
+            negate = item_type.startswith("-")
+            types = {t.strip() for t in item_type.lstrip("-").split("||")}
+            keys = [
+                k
+                for k in keys
+                if (lib.items[k]["data"].get("itemType") in types) != negate
+            ]
+        for tag in query.get("tag", []):
+            negate = tag.startswith("-")
+            alternatives = {t.strip() for t in tag.lstrip("-").split("||")}
+            keys = [
+                k
+                for k in keys
+                if bool(
+                    alternatives
+                    & {t["tag"] for t in lib.items[k]["data"].get("tags", [])}
+                )
+                != negate
+            ]
+        if text := query.get("q", [""])[0].lower():
+            everything = query.get("qmode", [""])[0] == "everything"
+            words = text.split()
+            keys = [k for k in keys if lib.matches(k, words, everything)]
+        if field := query.get("sort", [""])[0]:
+            keys = lib.sorted_keys(keys, field)
+            if query.get("direction", ["asc"])[0] == "desc":
+                keys = keys[::-1]
+        elif query.get("direction", [""])[0] == "desc":
+            keys = keys[::-1]
+        self._objects(handler, full_path, query, keys)
+
+    def _objects(
+        self,
+        handler: BaseHTTPRequestHandler,
+        full_path: str,
+        query: Dict[str, List[str]],
+        keys: List[str],
+    ) -> None:
+        lib = self.library
+        response_format = query.get("format", ["json"])[0]
+        if response_format == "versions":
+            if "limit" in query:
+                keys = keys[: int(query["limit"][0])]
+            objects = {**lib.items, **lib.collections}
+            return self._send(handler, 200, {k: objects[k]["version"] for k in keys})
+        if response_format == "keys":
+            return self._send(
+                handler, 200, "\n".join(keys).encode(), content_type="text/plain"
+            )
+        self._page(handler, full_path, query, [lib.encoded(k) for k in keys])
+
+    def _page(
+        self,
+        handler: BaseHTTPRequestHandler,
+        full_path: str,
+        query: Dict[str, List[str]],
+        encoded: List[bytes],
+    ) -> None:
+        total = len(encoded)
+        start = int(query.get("start", ["0"])[0])
+        limit = min(int(query.get("limit", [DEFAULT_PAGE_SIZE])[0]), MAX_PAGE_SIZE)
+        body = b"[" + b",".join(encoded[start : start + limit]) + b"]"
+        headers = {"Total-Results": str(total)}
+        links = []
+        params = {k: v[0] for k, v in query.items()}
+        if start + limit < total:
+            next_query = urlencode({**params, "start": start + limit, "limit": limit})
+            links.append(f'<{self.url}{full_path}?{next_query}>; rel="next"')
+            last_start = (total - 1) // limit * limit
+            last_query = urlencode({**params, "start": last_start, "limit": limit})
+            links.append(f'<{self.url}{full_path}?{last_query}>; rel="last"')
+        if links:
+            headers["Link"] = ", ".join(links)
+        self._send(handler, 200, body, headers)
+
+    # -- Writes --------------------------------------------------------------
+
+    def _write(self, handler: BaseHTTPRequestHandler, method: str, path: str) -> None:
+        lib = self.library
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length) or b"null")
+        with lib.lock:
+            if method == "POST" and path == "/items":
+                if not isinstance(body, list) or len(body) > 50:
+                    return self._send(
+                        handler, 413, b"Too many objects", content_type="text/plain"
+                    )
+                result: Dict[str, Dict[str, Any]] = {
+                    "success": {},
+                    "successful": {},
+                    "unchanged": {},
+                    "failed": {},
+                }
+                for index, obj in enumerate(body):
+                    key = obj.get("key") or f"W{len(lib.items):07d}"
+                    existing = lib.items.get(key)
+                    if (
+                        existing
+                        and obj.get("version", existing["version"])
+                        != existing["version"]
+                    ):
+                        result["failed"][str(index)] = {
+                            "key": key,
+                            "code": 412,
+                            "message": "Item has been modified since specified version",
+                        }
+                        continue
+                    lib.version += 1
+                    if existing:
+                        existing["data"].update(obj)
+                    else:
+                        lib.items[key] = existing = {
+                            "key": key,
+                            "library": {"type": "user", "id": int(LIBRARY_ID)},
+                            "data": dict(obj),
+                            "meta": {},
+                        }
+                    existing["version"] = lib.version
+                    existing["data"].update(key=key, version=lib.version)
+                    result["success"][str(index)] = key
+                    result["successful"][str(index)] = existing
+                lib.reindex()
+                return self._send(handler, 200, result)
+            if method == "PATCH" and (match := re.fullmatch(r"/items/(\w+)", path)):
+                item = lib.items[match.group(1)]
+                expected = handler.headers.get("If-Unmodified-Since-Version")
+                if expected is not None and int(expected) != item["version"]:
+                    return self._send(
+                        handler, 412, b"Precondition failed", content_type="text/plain"
+                    )
+                lib.version += 1
+                item["data"].update(body)
+                item["version"] = item["data"]["version"] = lib.version
+                lib.reindex()
+                return self._send(handler, 204)
+        raise KeyError(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=10000, help="Library size")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Latency added to every request"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="Maximum random extra latency"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    library = make_library(args.items)
+    server = FakeZoteroServer(
+        library,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        host=args.host,
+        port=args.port,
+    )
+    print(
+        f"Serving {len(library.items)} items and {len(library.collections)} "
+        f"collections (generated in {time.perf_counter() - started:.1f}s) at "
+        f"{server.url}; set ZOTERO_API_BASE_URL={server.url} "
+        f"ZOTERO_LIBRARY_ID={LIBRARY_ID}"
+    )
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Load test: concurrent MCP sessions against the streamable-http transport.
+
+Starts the fake Web API (see fake_zotero.py) and a
+``zotero-web-mcp serve --transport streamable-http`` process pointed at it,
+then opens ``--sessions`` MCP sessions that each replay a weighted mix of tool
+calls for ``--duration`` seconds. It reports throughput, latency percentiles
+and error rates, overall and per tool, plus the upstream requests the fake
+served per call. Everything runs locally, so results are reproducible
+offline; ``--url`` targets an already running server instead (the fake is
+then not used).
+
+The sessions share one client process, so at high concurrency the client can
+become the bottleneck; compare the server's own latencies on /metrics.
+
+Usage:
+    python benchmarks/load_test.py --sessions 20 --duration 30
+    python benchmarks/load_test.py --sessions 50 --latency-ms 80 \\
+        --mix zotero_get_recent=5,zotero_search_items=3,zotero_get_item_metadata=2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import warnings
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from bench_tools import WRITE_TOOLS, tool_cases
+from fake_zotero import LIBRARY_ID, FakeZoteroServer, make_library
+
+# Tool mix used without --mix: mostly cheap reads, some searches
+DEFAULT_MIX = {
+    "zotero_get_item_metadata": 4,
+    "zotero_get_item_children": 2,
+    "zotero_get_recent": 2,
+    "zotero_search_items": 3,
+    "zotero_search_by_tag": 1,
+    "zotero_get_collections": 1,
+    "zotero_get_collection_items": 1,
+    "zotero_get_tags": 1,
+    "zotero_get_notes": 1,
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class CallResult:
+    tool: str
+    started: float
+    seconds: float
+    error: Optional[str] = None
+
+
+def parse_mix(value: Optional[str]) -> Dict[str, float]:
+    """Parse "tool=weight,tool=weight" (a bare tool name has weight 1)."""
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in value.split(","):
+        tool, _, weight = part.strip().partition("=")
+        if tool:
+            mix[tool.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, api_url: str, rate_limit: float) -> subprocess.Popen:
+    """Start ``serve --transport streamable-http`` against the fake API."""
+    src = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    env.update(
+        ZOTERO_API_BASE_URL=api_url,
+        ZOTERO_LIBRARY_ID=LIBRARY_ID,
+        ZOTERO_LIBRARY_TYPE="user",
+        ZOTERO_API_KEY="load-test",
+        ZOTERO_RATE_LIMIT=str(rate_limit),
+        PYTHONWARNINGS="ignore",
+    )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "zotero_web_mcp.cli",
+            "serve",
+            "--transport",
+            "streamable-http",
+            "--port",
+            str(port),
+            "--no-warm-up",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/metrics", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not start within {timeout:g}s")
+
+
+async def run_session(
+    url: str,
+    cases: List[Tuple[str, Dict[str, Any]]],
+    weights: List[float],
+    deadline: float,
+    seed: int,
+    results: List[CallResult],
+) -> None:
+    """One MCP session calling random tools from the mix until the deadline."""
+    from fastmcp import Client
+
+    rnd = random.Random(seed)
+    async with Client(url) as client:
+        while time.monotonic() < deadline:
+            tool, args = rnd.choices(cases, weights)[0]
+            started = time.monotonic()
+            error = None
+            try:
+                result = await client.call_tool(tool, args)
+                content = getattr(result, "content", result)
+                text = content[0].text if content else ""
+                if text.startswith("Error"):
+                    error = text.splitlines()[0]
+            except Exception as e:
+                error = (str(e) or type(e).__name__).splitlines()[0]
+            results.append(CallResult(tool, started, time.monotonic() - started, error))
+
+
+async def run_load(
+    url: str,
+    cases: List[Tuple[str, Dict[str, Any]]],
+    weights: List[float],
+    sessions: int,
+    duration: float,
+    ramp_up: float,
+    seed: int,
+) -> Tuple[List[CallResult], float, int, int]:
+    """
+    Run the sessions.
+
+    Returns:
+        The calls started after the ramp-up, the measured wall time, the
+        number of calls including the ramp-up and the number of sessions that
+        failed.
+    """
+    results: List[CallResult] = []
+    started = time.monotonic()
+    deadline = started + ramp_up + duration
+
+    async def delayed(index: int) -> None:
+        if ramp_up and sessions > 1:
+            await asyncio.sleep(ramp_up * index / (sessions - 1))
+        await run_session(url, cases, weights, deadline, seed + index, results)
+
+    outcomes = await asyncio.gather(
+        *(delayed(i) for i in range(sessions)), return_exceptions=True
+    )
+    failed = [o for o in outcomes if isinstance(o, BaseException)]
+    if failed:
+        print(f"{len(failed)} sessions failed, e.g.: {failed[0]!r}", file=sys.stderr)
+    # Only calls started after the ramp-up count toward throughput
+    measured = [r for r in results if r.started >= started + ramp_up]
+    elapsed = time.monotonic() - (started + ramp_up)
+    return measured, elapsed, len(results), len(failed)
+
+
+def summarize(results: List[CallResult], elapsed: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles and error rate, overall and per tool."""
+
+    def stats(calls: List[CallResult]) -> Dict[str, Any]:
+        latencies = sorted(c.seconds * 1000 for c in calls)
+        errors = sum(1 for c in calls if c.error)
+        summary = {
+            "calls": len(calls),
+            "throughput_per_s": len(calls) / elapsed if elapsed > 0 else 0.0,
+            "error_rate": errors / len(calls) if calls else 0.0,
+            "mean_ms": sum(latencies) / len(latencies) if latencies else math.nan,
+        }
+        for p in PERCENTILES:
+            summary[f"p{p}_ms"] = percentile(latencies, p)
+        return summary
+
+    by_tool: Dict[str, List[CallResult]] = defaultdict(list)
+    for call in results:
+        by_tool[call.tool].append(call)
+    errors: Dict[str, int] = defaultdict(int)
+    for call in results:
+        if call.error:
+            errors[call.error] += 1
+    return {
+        "elapsed_s": elapsed,
+        "overall": stats(results),
+        "tools": {tool: stats(calls) for tool, calls in sorted(by_tool.items())},
+        "errors": dict(sorted(errors.items(), key=lambda e: -e[1])),
+    }
+
+
+def print_summary(
+    summary: Dict[str, Any], upstream: Optional[int], total_calls: int
+) -> None:
+    header = f"{'tool':<28} {'calls':>7} {'calls/s':>8} {'err %':>6} " + " ".join(
+        f"{f'p{p} ms':>8}" for p in PERCENTILES
+    )
+    print(header)
+    rows = list(summary["tools"].items()) + [("TOTAL", summary["overall"])]
+    for tool, s in rows:
+        print(
+            f"{tool:<28} {s['calls']:>7} {s['throughput_per_s']:>8.1f} "
+            f"{s['error_rate'] * 100:>6.1f} "
+            + " ".join(f"{s[f'p{p}_ms']:>8.1f}" for p in PERCENTILES)
+        )
+    if upstream is not None and total_calls:
+        print(
+            f"\nupstream requests: {upstream} ({upstream / total_calls:.2f} per call, "
+            "ramp-up included)"
+        )
+    for error, count in list(summary["errors"].items())[:5]:
+        print(f"{count:>6} x {error}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sessions", type=int, default=10, help="Concurrent MCP sessions"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=20.0, help="Seconds of measured load"
+    )
+    parser.add_argument(
+        "--ramp-up",
+        type=float,
+        default=2.0,
+        help="Seconds over which sessions are opened; not measured (default: 2)",
+    )
+    parser.add_argument(
+        "--mix",
+        help="Weighted tool mix, e.g. 'zotero_get_recent=5,zotero_search_items=2' "
+        "(default: a read-heavy mix of the listing and lookup tools)",
+    )
+    parser.add_argument(
+        "--items", type=int, default=10000, help="Size of the fake library"
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=50.0,
+        help="Latency of every fake API request (default: 50)",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=10.0,
+        help="Maximum random extra latency per fake API request (default: 10)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="ZOTERO_RATE_LIMIT of the server (default: 0, no client-side limit)",
+    )
+    parser.add_argument(
+        "--url",
+        help="MCP endpoint of an already running server, e.g. "
+        "http://localhost:8000/mcp/ (default: start one against the fake API)",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=0.0,
+        help="Exit with status 1 above this share of failed calls (default: 0)",
+    )
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    mix = parse_mix(args.mix)
+    library = make_library(args.items)
+    cases = {tool: call for tool, call in tool_cases(library)}
+    unknown = set(mix) - set(cases)
+    if unknown:
+        parser.error(f"unknown tools in --mix: {', '.join(sorted(unknown))}")
+    if set(mix) & set(WRITE_TOOLS):
+        print("Note: the mix writes to the library", file=sys.stderr)
+    chosen = [(tool, cases[tool]) for tool in mix]
+    weights = [mix[tool] for tool in mix]
+
+    fake = None
+    process = None
+    try:
+        if args.url:
+            url = args.url
+        else:
+            fake = FakeZoteroServer(
+                library,
+                latency=args.latency_ms / 1000,
+                jitter=args.jitter_ms / 1000,
+            )
+            port = _free_port()
+            process = start_server(port, fake.url, args.rate_limit)
+            wait_until_ready(f"http://127.0.0.1:{port}", process)
+            url = f"http://127.0.0.1:{port}/mcp/"
+
+        print(
+            f"{args.sessions} sessions for {args.duration:g}s against {url} "
+            f"({len(library.items)} items, {args.latency_ms:g} ms latency)\n"
+        )
+        upstream_before = fake.counts()[0] if fake else None
+        results, elapsed, total_calls, failed_sessions = asyncio.run(
+            run_load(
+                url,
+                chosen,
+                weights,
+                max(1, args.sessions),
+                args.duration,
+                args.ramp_up,
+                args.seed,
+            )
+        )
+        upstream = fake.counts()[0] - upstream_before if fake else None
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if fake is not None:
+            fake.close()
+
+    summary = summarize(results, elapsed)
+    summary["sessions"] = args.sessions
+    summary["failed_sessions"] = failed_sessions
+    summary["upstream_requests"] = upstream
+    print_summary(summary, upstream, total_calls)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    failed = (
+        failed_sessions
+        or not results
+        or summary["overall"]["error_rate"] > args.max_error_rate
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,17 @@ This module provides tools for AI assistants to interact with Zotero libraries.
 """
 
 from ._version import __version__
-from .server import mcp
+
+
+def __getattr__(name):
+    # The server pulls in fastmcp; load it only when ``mcp`` is used, so that
+    # commands like ``zotero-web-mcp version`` start instantly
+    if name == "mcp":
+        from .server import mcp
+
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # These modules are not imported by default but are available
 # pdfannots_helper and pdfannots_downloader
@@ -0,0 +1,386 @@
+"""
+Annotation records and their markdown rendering.
+
+Retrieval functions return typed Annotation records; rendering them as
+markdown is a separate step, so callers such as zotero_search_notes can filter
+records before anything is formatted.
+"""
+
+import contextvars
+import os
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+from zotero_web_mcp.client import ParentResolver, download_attachment, iter_pages
+from zotero_web_mcp.mirror import LibraryMirror
+from zotero_web_mcp.pagination import fetch_all_pages
+from zotero_web_mcp.pdfannots_helper import IMAGE_TYPES, extract_annotations_from_pdf
+
+if TYPE_CHECKING:
+    from pyzotero import zotero
+
+# PDF attachments downloaded and extracted at the same time
+PDF_WORKERS = 4
+
+# Tags per tag=A || B request when searching annotations by tag
+TAG_BATCH_SIZE = 20
+
+
+@dataclass
+class Annotation:
+    """A single annotation, from the Zotero API or extracted from a PDF."""
+
+    key: str
+    annotation_type: str = "Unknown type"
+    text: str = ""
+    comment: str = ""
+    color: str = ""
+    parent_key: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    page: Optional[int] = None
+    page_label: Optional[str] = None
+    color_category: Optional[str] = None
+    attachment_title: Optional[str] = None
+    # Where the annotation came from: "zotero", "pdf" or "better_bibtex"
+    source: str = "zotero"
+    has_image: bool = False
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "Annotation":
+        """
+        Build an annotation from a Zotero API annotation item.
+
+        Args:
+            item: A Zotero item dictionary with itemType 'annotation'.
+
+        Returns:
+            The annotation record.
+        """
+        data = item.get("data", {})
+        return cls(
+            key=item.get("key", ""),
+            annotation_type=data.get("annotationType", "Unknown type"),
+            text=data.get("annotationText", ""),
+            comment=data.get("annotationComment", ""),
+            color=data.get("annotationColor", ""),
+            parent_key=data.get("parentItem") or None,
+            tags=[tag["tag"] for tag in data.get("tags", [])],
+        )
+
+    @classmethod
+    def from_pdf_extraction(
+        cls,
+        extracted: Dict[str, Any],
+        attachment: Dict[str, Any],
+        parent_key: str,
+    ) -> Optional["Annotation"]:
+        """
+        Build an annotation from a pdfannots2json-style extraction record.
+
+        Args:
+            extracted: One record returned by extract_annotations_from_pdf().
+            attachment: The Zotero attachment item the PDF belongs to.
+            parent_key: Key of the item the attachment belongs to.
+
+        Returns:
+            The annotation record, or None for text annotations without
+            content.
+        """
+        anno_type = extracted.get("type", "highlight")
+        # Skip empty annotations; an image or drawing is content of its own
+        if (
+            anno_type not in IMAGE_TYPES
+            and not extracted.get("annotatedText")
+            and not extracted.get("comment")
+        ):
+            return None
+
+        att_key = attachment.get("key", "")
+        return cls(
+            key=f"pdf_{att_key}_{extracted.get('id', uuid.uuid4().hex[:8])}",
+            annotation_type=anno_type,
+            text=extracted.get("annotatedText", ""),
+            comment=extracted.get("comment", ""),
+            color=extracted.get("color", ""),
+            parent_key=parent_key,
+            page=extracted.get("page", 0),
+            page_label=extracted.get("pageLabel"),
+            attachment_title=attachment.get("data", {}).get("title", "PDF"),
+            source="pdf",
+            # Also when the image was not rendered, e.g. in text-only mode
+            has_image=anno_type in IMAGE_TYPES,
+        )
+
+    def matches(self, query: str) -> bool:
+        """Whether the query occurs in the text, comment or tags (case-insensitive)."""
+        query = query.lower()
+        return any(
+            query in value.lower() for value in [self.text, self.comment, *self.tags]
+        )
+
+
+def _extract_attachment_annotations(
+    zot: "zotero.Zotero", attachment: Dict[str, Any], parent_key: str
+) -> List[Annotation]:
+    annotations = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        att_key = attachment.get("key", "")
+        file_path = os.path.join(tmpdir, f"{att_key}.pdf")
+        download_attachment(zot, att_key, file_path)
+
+        if not os.path.exists(file_path):
+            return []
+
+        # Images are never shown, so skip rendering them; image and ink
+        # annotations are still listed
+        for extracted in extract_annotations_from_pdf(
+            file_path, tmpdir, text_only=True
+        ):
+            annotation = Annotation.from_pdf_extraction(
+                extracted, attachment, parent_key
+            )
+            if annotation is not None:
+                annotations.append(annotation)
+    return annotations
+
+
+def extract_pdf_annotations(
+    zot: "zotero.Zotero",
+    attachments: List[Dict[str, Any]],
+    parent_key: str,
+    max_workers: int = PDF_WORKERS,
+) -> List[Annotation]:
+    """
+    Download PDF attachments and extract their annotations directly.
+
+    Extraction runs in-process with pypdf when it is installed, falling back
+    to the pdfannots2json binary otherwise. Attachments are downloaded and
+    extracted concurrently, so an item with several PDFs takes about as long
+    as its largest one.
+
+    Args:
+        zot: A Zotero client instance.
+        attachments: PDF attachment items to process.
+        parent_key: Key of the item the attachments belong to.
+        max_workers: Maximum number of attachments processed at once.
+
+    Returns:
+        Annotations found in the PDFs, in attachment order.
+    """
+    if len(attachments) <= 1 or max_workers <= 1:
+        return [
+            annotation
+            for attachment in attachments
+            for annotation in _extract_attachment_annotations(
+                zot, attachment, parent_key
+            )
+        ]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(attachments))) as pool:
+        # Each job gets a copy of the caller's context so upstream request
+        # counters keep counting inside the workers
+        futures = [
+            pool.submit(
+                contextvars.copy_context().run,
+                _extract_attachment_annotations,
+                zot,
+                attachment,
+                parent_key,
+            )
+            for attachment in attachments
+        ]
+        # Merge in attachment order, regardless of which finished first
+        return [annotation for future in futures for annotation in future.result()]
+
+
+def fetch_library_annotations(
+    zot: "zotero.Zotero", limit: Optional[int] = None, start: int = 0
+) -> List[Annotation]:
+    """
+    Fetch the library's annotations, requesting several pages at a time.
+
+    Args:
+        zot: A Zotero client instance.
+        limit: Maximum number of annotations to fetch (None for all).
+        start: Offset of the first annotation.
+
+    Returns:
+        Annotation records, in library order.
+    """
+    return [
+        Annotation.from_item(item)
+        for item in fetch_all_pages(
+            zot, "/items", limit=limit, start=start, itemType="annotation"
+        )
+    ]
+
+
+def _iter_matching_candidates(zot: "zotero.Zotero", query: str) -> Iterator[Annotation]:
+    """
+    Iterate over the annotations the Web API matches for ``query``.
+
+    A quick search (q= with qmode=everything) covers annotation text and
+    comments; annotations tagged with a tag that contains the query are
+    requested by tag afterwards. Each annotation is yielded once.
+    """
+    seen = set()
+
+    def unseen(items: Iterable[Dict[str, Any]]) -> Iterator[Annotation]:
+        for item in items:
+            if item.get("key") not in seen:
+                seen.add(item.get("key"))
+                yield Annotation.from_item(item)
+
+    yield from unseen(
+        iter_pages(zot.items, itemType="annotation", q=query, qmode="everything")
+    )
+
+    # Tags starting with "-" or containing "||" would be read as search syntax
+    needle = query.lower()
+    tags = [
+        tag["tag"]
+        for tag in fetch_all_pages(zot, "/tags", q=query)
+        if needle in tag.get("tag", "").lower()
+        and not tag["tag"].startswith("-")
+        and "||" not in tag["tag"]
+    ]
+    for i in range(0, len(tags), TAG_BATCH_SIZE):
+        batch = tags[i : i + TAG_BATCH_SIZE]
+        yield from unseen(
+            iter_pages(zot.items, itemType="annotation", tag=" || ".join(batch))
+        )
+
+
+def search_annotations(
+    zot: "zotero.Zotero",
+    query: str,
+    limit: Optional[int] = 20,
+    mirror: Optional[LibraryMirror] = None,
+) -> List[Annotation]:
+    """
+    Find annotations whose text, comment or tags contain ``query``.
+
+    With a local mirror the candidates are narrowed in SQLite. Otherwise the
+    Web API narrows them: a quick search over annotation text and comments,
+    then a request per batch of tags containing the query. Only those
+    candidates are downloaded, and requests stop as soon as ``limit`` matches
+    were found. Candidates are checked again locally, since the quick search
+    also matches other fields.
+
+    Args:
+        zot: A Zotero client instance.
+        query: Text to look for (case-insensitive).
+        limit: Maximum number of matches to return.
+        mirror: Optional local mirror to search instead of the Web API.
+
+    Returns:
+        Matching annotation records.
+    """
+    if mirror is not None:
+        candidates: Iterator[Annotation] = (
+            Annotation.from_item(item)
+            for item in mirror.search_items(
+                query, qmode="everything", item_type="annotation"
+            )
+        )
+    else:
+        candidates = _iter_matching_candidates(zot, query)
+
+    matches = []
+    for annotation in candidates:
+        if annotation.matches(query):
+            matches.append(annotation)
+            if limit and len(matches) >= limit:
+                break
+    return matches
+
+
+def format_annotation(
+    annotation: Annotation, index: int, parent_info: str = ""
+) -> List[str]:
+    """
+    Render one annotation as markdown lines.
+
+    Args:
+        annotation: The annotation to render.
+        index: Position of the annotation in the listing.
+        parent_info: Optional parent context, e.g. ' (from "Title")'.
+
+    Returns:
+        Markdown lines, ending with an empty separator line.
+    """
+    # Annotation source details
+    source_info = ""
+    if annotation.source == "better_bibtex":
+        source_info = " (extracted via Better BibTeX)"
+    elif annotation.source == "pdf":
+        source_info = " (extracted directly from PDF)"
+
+    # Attachment context
+    attachment_info = ""
+    if annotation.attachment_title:
+        attachment_info = f" in {annotation.attachment_title}"
+
+    lines = [
+        f"## Annotation {index}{parent_info}{attachment_info}{source_info}",
+        f"**Type:** {annotation.annotation_type}",
+        f"**Key:** {annotation.key}",
+    ]
+
+    # Color information
+    if annotation.color:
+        lines.append(f"**Color:** {annotation.color}")
+        if annotation.color_category:
+            lines.append(f"**Color Category:** {annotation.color_category}")
+
+    # Page information
+    if annotation.page is not None:
+        label = annotation.page_label or str(annotation.page)
+        lines.append(f"**Page:** {annotation.page} (Label: {label})")
+
+    # Annotation content
+    if annotation.text:
+        lines.append(f"**Text:** {annotation.text}")
+
+    if annotation.comment:
+        lines.append(f"**Comment:** {annotation.comment}")
+
+    # Image annotation
+    if annotation.has_image:
+        lines.append(
+            "**Image:** This annotation includes an image (not displayed in this interface)"
+        )
+
+    # Tags
+    if annotation.tags:
+        lines.append(f"**Tags:** {' '.join(f'`{tag}`' for tag in annotation.tags)}")
+
+    lines.append("")  # Empty line between annotations
+    return lines
+
+
+def format_annotations(
+    annotations: List[Annotation],
+    heading: str = "# Annotations",
+    parents: Optional[ParentResolver] = None,
+) -> str:
+    """
+    Render a list of annotations as a markdown document.
+
+    Args:
+        annotations: The annotations to render.
+        heading: Top-level heading of the document.
+        parents: Resolver used to show each annotation's parent item; parent
+            context is omitted when None.
+
+    Returns:
+        Markdown-formatted annotations.
+    """
+    output = [heading, ""]
+    for i, annotation in enumerate(annotations, 1):
+        parent_info = parents.parent_info(annotation.parent_key) if parents else ""
+        output.extend(format_annotation(annotation, i, parent_info))
+    return "\n".join(output)
@@ -0,0 +1,252 @@
+"""
+Async Zotero Web API client for the read paths of the tools.
+
+pyzotero is synchronous, so a tool that fetches an item and its children pays
+for two round trips back to back. This client issues read requests on an
+``httpx.AsyncClient`` - over HTTP/2 when the ``h2`` package is installed, with
+a bounded keep-alive connection pool otherwise - so independent requests can
+be awaited together with ``asyncio.gather``. Requests go through the same
+process-wide rate limiter as the pooled pyzotero clients and are counted by
+``count_upstream_requests()``; identical concurrent requests are coalesced
+like theirs. Responses have the same shape as pyzotero's.
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from zotero_web_mcp.client_pool import (
+    DEFAULT_ENDPOINT,
+    _count_request,
+    _count_response,
+)
+from zotero_web_mcp.pagination import MAX_PAGE_SIZE, PAGE_WORKERS
+from zotero_web_mcp.rate_limit import (
+    DEFAULT_MAX_RETRIES,
+    AsyncRateLimitedTransport,
+    RateLimiter,
+)
+from zotero_web_mcp.single_flight import AsyncSingleFlightTransport, SingleFlight
+
+# Maximum number of keys the Web API accepts in one itemKey= request
+ITEM_KEY_BATCH_SIZE = 50
+
+# Default number of concurrent connections (or HTTP/2 streams per connection)
+DEFAULT_MAX_CONNECTIONS = 10
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+async def _count_async_request(request: httpx.Request) -> None:
+    _count_request(request)
+
+
+async def _count_async_response(response: httpx.Response) -> None:
+    _count_response(response)
+
+
+class AsyncZoteroClient:
+    """Read-only async access to one Zotero library."""
+
+    def __init__(
+        self,
+        library_id: str,
+        library_type: str = "user",
+        api_key: Optional[str] = None,
+        endpoint: str = DEFAULT_ENDPOINT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        http2: bool = True,
+        single_flight: Optional[SingleFlight] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Create an async client.
+
+        Args:
+            library_id: Zotero library ID.
+            library_type: Zotero library type ('user' or 'group').
+            api_key: Zotero API key.
+            endpoint: Base URL of the Zotero Web API.
+            max_connections: Maximum number of open connections.
+            rate_limiter: Rate limiter shared with the synchronous clients
+                (None for no limit).
+            max_retries: Retries for failed requests when a rate limiter is set.
+            http2: Negotiate HTTP/2 when the h2 package is installed.
+            single_flight: Registry that identical concurrent GET requests
+                are coalesced through (None to send every request).
+            transport: Transport that sends the requests, e.g. to a stand-in
+                API (None for a new connection pool).
+        """
+        self.library_prefix = f"/{library_type.rstrip('s')}s/{library_id}"
+        self.http2 = http2 and HTTP2_AVAILABLE
+
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+            )
+        if rate_limiter is not None:
+            transport = AsyncRateLimitedTransport(transport, rate_limiter, max_retries)
+        if single_flight is not None:
+            transport = AsyncSingleFlightTransport(transport, single_flight)
+
+        headers = {"Zotero-API-Version": "3"}
+        if api_key:
+            headers["Zotero-API-Key"] = api_key
+        self._http = httpx.AsyncClient(
+            base_url=endpoint.rstrip("/"),
+            headers=headers,
+            follow_redirects=True,
+            event_hooks={
+                "request": [_count_async_request],
+                "response": [_count_async_response],
+            },
+            transport=transport,
+        )
+
+    async def get(self, path: str, **params: Any) -> Any:
+        """
+        GET a library-relative path and decode the JSON response.
+
+        Args:
+            path: Path below the library prefix, e.g. '/items/ABCD1234'.
+            **params: Query parameters.
+
+        Returns:
+            The decoded JSON body.
+
+        Raises:
+            httpx.HTTPStatusError: If the API returned an error status.
+        """
+        return (await self._get_response(path, params)).json()
+
+    async def _get_response(self, path: str, params: Dict[str, Any]) -> httpx.Response:
+        params = {"format": "json", **params}
+        response = await self._http.get(self.library_prefix + path, params=params)
+        response.raise_for_status()
+        return response
+
+    async def get_all(
+        self, path: str, limit: Optional[int] = None, start: int = 0, **params: Any
+    ) -> List[Any]:
+        """
+        GET every object of a multi-object request, several pages at a time.
+
+        Like fetch_all_pages(), the first page is fetched alone to learn
+        ``Total-Results`` and the remaining pages are requested concurrently;
+        without the header, pages are followed in sequence. The Web API
+        returns 25 objects per request unless asked for more.
+
+        Args:
+            path: Path below the library prefix, e.g. '/items'.
+            limit: Maximum number of objects to fetch (None for all).
+            start: Offset of the first object.
+            **params: Additional query parameters for every request.
+
+        Returns:
+            The objects, in the order the API returned them.
+
+        Raises:
+            httpx.HTTPStatusError: If a page request failed.
+        """
+        first_size = MAX_PAGE_SIZE if limit is None else min(MAX_PAGE_SIZE, limit)
+        if first_size <= 0:
+            return []
+
+        response = await self._get_response(
+            path, {**params, "start": start, "limit": first_size}
+        )
+        results = response.json()
+        try:
+            total: Optional[int] = int(response.headers["Total-Results"])
+        except (KeyError, ValueError):
+            total = None
+
+        if total is None:
+            end = None if limit is None else start + limit
+        else:
+            end = total if limit is None else min(total, start + limit)
+        if len(results) < first_size or (
+            end is not None and start + len(results) >= end
+        ):
+            return results
+
+        if end is None:
+            offset = start + len(results)
+            while True:
+                page = await self.get(path, **params, start=offset, limit=MAX_PAGE_SIZE)
+                results.extend(page)
+                if len(page) < MAX_PAGE_SIZE:
+                    return results
+                offset += len(page)
+
+        last = end
+        semaphore = asyncio.Semaphore(PAGE_WORKERS)
+
+        async def fetch_page(offset: int) -> List[Any]:
+            async with semaphore:
+                return await self.get(
+                    path,
+                    **params,
+                    start=offset,
+                    limit=min(MAX_PAGE_SIZE, last - offset),
+                )
+
+        pages = await asyncio.gather(
+            *(
+                fetch_page(offset)
+                for offset in range(start + len(results), last, MAX_PAGE_SIZE)
+            )
+        )
+        for page in pages:
+            results.extend(page)
+        return results
+
+    async def item(self, item_key: str) -> Dict[str, Any]:
+        """Return a single item, like zot.item()."""
+        return await self.get(f"/items/{item_key.upper()}")
+
+    async def children(self, item_key: str, **params: Any) -> List[Dict[str, Any]]:
+        """Return all child items of an item, like zot.children() with paging."""
+        return await self.get_all(f"/items/{item_key.upper()}/children", **params)
+
+    async def items(self, **params: Any) -> List[Dict[str, Any]]:
+        """Return items matching query parameters, like zot.items() with paging."""
+        return await self.get_all("/items", **params)
+
+    async def items_by_keys(
+        self, item_keys: Iterable[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch items by key, one concurrent itemKey= request per 50 keys.
+
+        Args:
+            item_keys: Keys to fetch; duplicates are ignored.
+
+        Returns:
+            The items the API returned, keyed by item key.
+        """
+        keys = list(dict.fromkeys(k.upper() for k in item_keys if k))
+        batches = [
+            keys[i : i + ITEM_KEY_BATCH_SIZE]
+            for i in range(0, len(keys), ITEM_KEY_BATCH_SIZE)
+        ]
+        pages = await asyncio.gather(
+            *(self.items(itemKey=",".join(b), limit=len(b)) for b in batches)
+        )
+        return {item["key"]: item for page in pages for item in page}
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        await self._http.aclose()
@@ -3,10 +3,9 @@ Command-line interface for Zotero MCP server.
 """
 
 import argparse
+import os
 import sys
 
-from zotero_web_mcp.server import mcp
-
 
 def main():
     """Main entry point for the CLI."""
@@ -34,6 +33,35 @@ def main():
         default=8000,
         help="Port to bind to for SSE transport (default: 8000)",
     )
+    server_parser.add_argument(
+        "--warm-up",
+        default="all",
+        metavar="TARGETS",
+        help="Comma-separated caches to fill in the background at startup: "
+        "version, collections, tags, recent (default: all)",
+    )
+    server_parser.add_argument(
+        "--no-warm-up",
+        action="store_true",
+        help="Start with cold caches",
+    )
+    server_parser.add_argument(
+        "--profile-dir",
+        metavar="DIR",
+        help="Profile tool calls with cProfile and write the reports to DIR "
+        "(default: $ZOTERO_PROFILE_DIR, or no profiling)",
+    )
+    server_parser.add_argument(
+        "--profile-sample-rate",
+        type=float,
+        metavar="RATE",
+        help="Share of tool calls to profile, from 0 to 1 (default: 1)",
+    )
+    server_parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Also report the peak memory of profiled calls with tracemalloc",
+    )
 
     # Setup command
     setup_parser = subparsers.add_parser(
@@ -74,6 +102,39 @@ def main():
         sys.exit(setup_main(args))
 
     elif args.command == "serve":
+        # Profiling is configured through the environment, read on first use
+        if getattr(args, "profile_dir", None):
+            os.environ["ZOTERO_PROFILE_DIR"] = args.profile_dir
+        if getattr(args, "profile_sample_rate", None) is not None:
+            os.environ["ZOTERO_PROFILE_SAMPLE_RATE"] = str(args.profile_sample_rate)
+        if getattr(args, "profile_memory", False):
+            os.environ["ZOTERO_PROFILE_MEMORY"] = "1"
+
+        from zotero_web_mcp.warm_up import (
+            WARM_UP_TARGETS,
+            save_results_at_exit,
+            start_warm_up,
+        )
+
+        # Fill the caches while the transport already accepts requests
+        save_results_at_exit()
+        if not getattr(args, "no_warm_up", False):
+            targets = getattr(args, "warm_up", "all")
+            if targets == "all":
+                targets = WARM_UP_TARGETS
+            else:
+                targets = [t.strip() for t in targets.split(",") if t.strip()]
+                unknown = set(targets) - set(WARM_UP_TARGETS)
+                if unknown:
+                    server_parser.error(
+                        f"unknown warm-up targets: {', '.join(sorted(unknown))}"
+                    )
+            start_warm_up(targets)
+
+        # Loaded only here: the server imports fastmcp, which other commands
+        # do not need
+        from zotero_web_mcp.server import mcp
+
         # Get transport with a default value if not specified
         transport = getattr(args, "transport", "stdio")
         if transport == "stdio":
@@ -2,20 +2,115 @@
 Zotero client wrapper for MCP server.
 """
 
+import asyncio
+import functools
+import json
 import os
+import threading
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from dotenv import load_dotenv
-from markitdown import MarkItDown
-from pyzotero import zotero
 
+from zotero_web_mcp.async_client import AsyncZoteroClient
+from zotero_web_mcp.client_pool import (
+    DEFAULT_ENDPOINT,
+    DEFAULT_POOL_SIZE,
+    ZoteroClientPool,
+)
+from zotero_web_mcp.conversion import DEFAULT_TIMEOUT, ConversionEngine
+from zotero_web_mcp.conversion_cache import (
+    DEFAULT_MAX_BYTES,
+    CacheStats,
+    ConversionCache,
+)
+from zotero_web_mcp.library_version import (
+    DEFAULT_VALIDATION_TTL,
+    LibraryVersionValidator,
+)
+from zotero_web_mcp.metrics import MetricFamily, get_metrics
+from zotero_web_mcp.mirror import (
+    LibraryMirror,
+    default_cache_dir,
+    default_mirror_path,
+)
+from zotero_web_mcp.pagination import MAX_PAGE_SIZE
+from zotero_web_mcp.rate_limit import (
+    DEFAULT_BURST,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RATE,
+    RateLimiter,
+)
+from zotero_web_mcp.result_cache import DEFAULT_MAX_ENTRIES, ToolResultCache
+from zotero_web_mcp.single_flight import SingleFlight
 from zotero_web_mcp.utils import format_creators
 
+if TYPE_CHECKING:
+    from pyzotero import zotero
+
 # Load environment variables
 load_dotenv()
 
+# Seconds between incremental syncs of the local mirror
+DEFAULT_MIRROR_SYNC_INTERVAL = 60.0
+
+# Maximum number of objects the Web API accepts in one multi-object write
+WRITE_BATCH_SIZE = 50
+
+# Maximum number of keys the Web API accepts in one itemKey= request
+ITEM_KEY_BATCH_SIZE = 50
+
+# Client pools, one per library and credentials
+_pools: Dict[str, ZoteroClientPool] = {}
+_pools_lock = threading.Lock()
+
+# Rate limiter shared by every client pool, created on first use
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+# Registry of in-flight GET requests, shared so that identical requests from
+# the pooled and async clients are coalesced
+_single_flight = SingleFlight()
+
+# Async clients, one per event loop since their connections are bound to it
+_async_clients: "weakref.WeakKeyDictionary[Any, Dict[str, AsyncZoteroClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Local mirrors, one per library, shared by all tool calls in the process
+_mirrors: Dict[str, LibraryMirror] = {}
+_mirrors_lock = threading.Lock()
+
+# Library version validators, one per library
+_validators: Dict[str, LibraryVersionValidator] = {}
+_validators_lock = threading.Lock()
+
+# Tool result caches, one per library
+_result_caches: Dict[str, ToolResultCache] = {}
+_result_caches_lock = threading.Lock()
+
+# Markdown conversion engine, created on first use
+_conversion_engine: Optional[ConversionEngine] = None
+_conversion_engine_lock = threading.Lock()
+
+# Markdown conversion cache, created on first use
+_conversion_cache: Optional[ConversionCache] = None
+_conversion_cache_lock = threading.Lock()
+
 
 @dataclass
 class AttachmentDetails:
@@ -25,15 +120,16 @@ class AttachmentDetails:
     title: str
     filename: str
     content_type: str
+    md5: str = ""
+    version: int = 0
 
 
-def get_zotero_client() -> zotero.Zotero:
+def _get_credentials() -> Tuple[str, str, str]:
     """
-    Get authenticated Zotero client using environment variables.
-    This version only supports the web API (no local API).
+    Read the Zotero Web API credentials from the environment.
 
     Returns:
-        A configured Zotero client instance.
+        A (library_id, library_type, api_key) tuple.
 
     Raises:
         ValueError: If required environment variables are missing.
@@ -49,12 +145,618 @@ def get_zotero_client() -> zotero.Zotero:
             "This version only supports Zotero Web API."
         )
 
-    return zotero.Zotero(
+    return library_id, library_type, api_key
+
+
+def get_api_endpoint() -> str:
+    """Base URL of the Zotero Web API (ZOTERO_API_BASE_URL, mainly for testing)."""
+    return os.getenv("ZOTERO_API_BASE_URL", DEFAULT_ENDPOINT)
+
+
+def get_zotero_client() -> "zotero.Zotero":
+    """
+    Get authenticated Zotero client using environment variables.
+    This version only supports the web API (no local API).
+
+    The client is not pooled and opens its own connections; tools should lease
+    a client with zotero_client() instead.
+
+    Returns:
+        A configured Zotero client instance.
+
+    Raises:
+        ValueError: If required environment variables are missing.
+    """
+    from pyzotero import zotero
+
+    library_id, library_type, api_key = _get_credentials()
+
+    zot = zotero.Zotero(
         library_id=library_id,
         library_type=library_type,
         api_key=api_key,
         local=False,  # Always use web API
     )
+    zot.endpoint = get_api_endpoint()
+    return zot
+
+
+def get_client_pool() -> ZoteroClientPool:
+    """
+    Get the process-wide client pool for the configured library.
+
+    The pool size is read from ZOTERO_CLIENT_POOL_SIZE, and the number of
+    retries for failed GET requests from ZOTERO_MAX_RETRIES.
+
+    Returns:
+        The shared ZoteroClientPool instance.
+
+    Raises:
+        ValueError: If required environment variables are missing.
+    """
+    library_id, library_type, api_key = _get_credentials()
+    endpoint = get_api_endpoint()
+
+    cache_key = f"{endpoint}|{library_type}:{library_id}|{api_key}"
+    with _pools_lock:
+        pool = _pools.get(cache_key)
+        if pool is None:
+            try:
+                size = int(os.getenv("ZOTERO_CLIENT_POOL_SIZE", DEFAULT_POOL_SIZE))
+            except ValueError:
+                size = DEFAULT_POOL_SIZE
+            pool = ZoteroClientPool(
+                library_id,
+                library_type,
+                api_key,
+                size=size,
+                endpoint=endpoint,
+                rate_limiter=get_rate_limiter(),
+                max_retries=int(_env_number("ZOTERO_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+                single_flight=get_single_flight(),
+            )
+            _pools[cache_key] = pool
+        return pool
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide rate limiter for Web API requests.
+
+    The sustained rate is read from ZOTERO_RATE_LIMIT (requests per second,
+    0 for no limit) and the burst size from ZOTERO_RATE_BURST.
+
+    Returns:
+        The shared RateLimiter instance.
+    """
+    global _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            rate = _env_number("ZOTERO_RATE_LIMIT", DEFAULT_RATE)
+            _rate_limiter = RateLimiter(
+                rate=rate,
+                burst=int(_env_number("ZOTERO_RATE_BURST", max(DEFAULT_BURST, rate))),
+            )
+        return _rate_limiter
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Get the process-wide registry of in-flight Web API requests.
+
+    Identical GET requests that are in flight at the same time, from any
+    pooled or async client, share one upstream request. Its stats() report
+    how many requests were issued and how many were coalesced.
+
+    Returns:
+        The shared SingleFlight instance.
+    """
+    return _single_flight
+
+
+@contextmanager
+def zotero_client() -> Iterator["zotero.Zotero"]:
+    """
+    Lease a pooled Zotero client for the configured library.
+
+    Yields:
+        A Zotero client reserved for the caller until the block exits.
+
+    Raises:
+        ValueError: If required environment variables are missing.
+    """
+    with get_client_pool().client() as zot:
+        yield zot
+
+
+def get_async_client() -> AsyncZoteroClient:
+    """
+    Get the async client of the running event loop for the configured library.
+
+    It shares the process-wide rate limiter with the pooled clients.
+
+    Returns:
+        The AsyncZoteroClient for the current event loop.
+
+    Raises:
+        RuntimeError: If called outside an event loop.
+        ValueError: If required environment variables are missing.
+    """
+    library_id, library_type, api_key = _get_credentials()
+    endpoint = get_api_endpoint()
+
+    cache_key = f"{endpoint}|{library_type}:{library_id}|{api_key}"
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(cache_key)
+    if client is None:
+        client = AsyncZoteroClient(
+            library_id,
+            library_type,
+            api_key,
+            endpoint=endpoint,
+            rate_limiter=get_rate_limiter(),
+            max_retries=int(_env_number("ZOTERO_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+            single_flight=get_single_flight(),
+        )
+        clients[cache_key] = client
+    return client
+
+
+def is_mirror_enabled() -> bool:
+    """Whether the local library mirror is enabled via ZOTERO_LOCAL_MIRROR."""
+    return os.getenv("ZOTERO_LOCAL_MIRROR", "").lower() in ("1", "true", "yes", "on")
+
+
+def get_mirror_sync_interval() -> float:
+    """Seconds between incremental mirror syncs (ZOTERO_MIRROR_SYNC_INTERVAL)."""
+    try:
+        return float(
+            os.getenv("ZOTERO_MIRROR_SYNC_INTERVAL", DEFAULT_MIRROR_SYNC_INTERVAL)
+        )
+    except ValueError:
+        return DEFAULT_MIRROR_SYNC_INTERVAL
+
+
+def get_library_mirror(even_if_disabled: bool = False) -> Optional[LibraryMirror]:
+    """
+    Get the local mirror for the configured library.
+
+    The mirror is only used when ZOTERO_LOCAL_MIRROR is set. Its database lives
+    at ZOTERO_MIRROR_PATH, or in the cache directory by default.
+
+    Args:
+        even_if_disabled: Open the mirror even if ZOTERO_LOCAL_MIRROR is not
+            set, for features that only work locally (such as the full-text
+            index).
+
+    Returns:
+        The shared LibraryMirror instance, or None if the mirror is disabled.
+    """
+    if not even_if_disabled and not is_mirror_enabled():
+        return None
+
+    library_id = os.getenv("ZOTERO_LIBRARY_ID")
+    library_type = os.getenv("ZOTERO_LIBRARY_TYPE", "user")
+    if not library_id:
+        return None
+
+    cache_key = f"{library_type}:{library_id}"
+    with _mirrors_lock:
+        mirror = _mirrors.get(cache_key)
+        if mirror is None:
+            path = os.getenv("ZOTERO_MIRROR_PATH") or default_mirror_path(
+                library_id, library_type
+            )
+            mirror = LibraryMirror(path, library_id, library_type)
+            _mirrors[cache_key] = mirror
+        return mirror
+
+
+def get_library_validator() -> LibraryVersionValidator:
+    """
+    Get the version validator of the configured library.
+
+    A probed library version is trusted for ZOTERO_VALIDATION_TTL seconds
+    (default: 30), so validating cached data costs at most one small request
+    per window.
+
+    Returns:
+        The shared LibraryVersionValidator instance.
+
+    Raises:
+        ValueError: If required environment variables are missing.
+    """
+    library_id, library_type, _ = _get_credentials()
+
+    cache_key = f"{get_api_endpoint()}|{library_type}:{library_id}"
+    with _validators_lock:
+        validator = _validators.get(cache_key)
+        if validator is None:
+            validator = LibraryVersionValidator(
+                ttl=_env_number("ZOTERO_VALIDATION_TTL", DEFAULT_VALIDATION_TTL)
+            )
+            _validators[cache_key] = validator
+        return validator
+
+
+def get_result_cache() -> Optional[ToolResultCache]:
+    """
+    Get the tool result cache of the configured library.
+
+    The cache holds at most ZOTERO_RESULT_CACHE_SIZE results (default: 256;
+    0 disables it). It follows the library's version validator, so results
+    survive version changes that do not affect them, and starts with the
+    results saved by save_result_cache().
+
+    Returns:
+        The shared ToolResultCache instance, or None if caching is disabled.
+
+    Raises:
+        ValueError: If required environment variables are missing.
+    """
+    max_entries = int(_env_number("ZOTERO_RESULT_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+    if max_entries <= 0:
+        return None
+    library_id, library_type, _ = _get_credentials()
+
+    cache_key = f"{get_api_endpoint()}|{library_type}:{library_id}"
+    with _result_caches_lock:
+        cache = _result_caches.get(cache_key)
+        if cache is None:
+            cache = ToolResultCache(max_entries=max_entries)
+            # Start from the results saved by the previous server process
+            version = cache.load(_result_cache_path(library_id, library_type))
+            validator = get_library_validator()
+            if version is not None:
+                validator.restore(version)
+            validator.add_listener(cache.apply_changes)
+            _result_caches[cache_key] = cache
+        return cache
+
+
+def _result_cache_path(library_id: str, library_type: str) -> str:
+    return os.path.join(
+        default_cache_dir(), "results", f"{library_type}-{library_id}.json"
+    )
+
+
+def save_result_cache() -> None:
+    """
+    Save the tool result cache to the cache directory.
+
+    The next server process loads it in get_result_cache(), so its first calls
+    are answered from the saved results once a version probe confirms them.
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return
+    library_id, library_type, _ = _get_credentials()
+    cache.save(
+        _result_cache_path(library_id, library_type), get_library_validator().version
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_stale_budgets(value: str) -> Dict[str, float]:
+    budgets = {}
+    for part in value.split(","):
+        tool, _, seconds = part.strip().rpartition("=")
+        try:
+            budgets[tool.strip() or "*"] = float(seconds)
+        except ValueError:
+            continue
+    return budgets
+
+
+def get_stale_budget(tool: str) -> float:
+    """
+    Seconds a stale cached result of ``tool`` may be served while it refreshes.
+
+    Stale-while-revalidate is opt-in through ZOTERO_STALE_WHILE_REVALIDATE: a
+    number sets the budget of every cached tool, and ``tool=seconds`` pairs
+    set it per tool, e.g. "60,zotero_get_collections=3600".
+
+    Args:
+        tool: Name of the tool.
+
+    Returns:
+        The staleness budget in seconds (0 when disabled).
+    """
+    budgets = _parse_stale_budgets(os.getenv("ZOTERO_STALE_WHILE_REVALIDATE", ""))
+    return max(0.0, budgets.get(tool, budgets.get("*", 0.0)))
+
+
+def collect_library_metrics() -> List[MetricFamily]:
+    """
+    Metrics of the caches, request coalescing and rate limiting.
+
+    Only components that already exist are reported; reading metrics never
+    creates a cache or a client.
+
+    Returns:
+        The metric families, for the process metrics registry.
+    """
+    families = []
+    caches: List[Tuple[str, str, CacheStats]] = [
+        ("result", library.split("|")[-1], cache.stats())
+        for library, cache in list(_result_caches.items())
+    ]
+    if _conversion_cache is not None:
+        caches.append(("conversion", "", _conversion_cache.stats()))
+    for name, type_, help_text, attr in (
+        ("zotero_cache_hits_total", "counter", "Cache lookups that hit.", "hits"),
+        (
+            "zotero_cache_misses_total",
+            "counter",
+            "Cache lookups that missed.",
+            "misses",
+        ),
+        (
+            "zotero_cache_stale_hits_total",
+            "counter",
+            "Outdated results served while a fresh one is computed.",
+            "stale_hits",
+        ),
+        ("zotero_cache_evictions_total", "counter", "Entries evicted.", "evictions"),
+        ("zotero_cache_entries", "gauge", "Entries in the cache.", "entries"),
+        ("zotero_cache_size_bytes", "gauge", "Size of the cached values.", "size"),
+        (
+            "zotero_cache_hit_ratio",
+            "gauge",
+            "Share of cache lookups that hit.",
+            "hit_ratio",
+        ),
+    ):
+        family = MetricFamily(name, type_, help_text)
+        for cache, library, stats in caches:
+            labels = {"cache": cache, **({"library": library} if library else {})}
+            family.samples.append((labels, getattr(stats, attr)))
+        families.append(family)
+
+    flights = _single_flight.stats()
+    families.append(
+        MetricFamily(
+            "zotero_single_flight_requests_total",
+            "counter",
+            "GET requests sent upstream or answered by an identical one in flight.",
+            [
+                ({"outcome": "issued"}, flights.issued),
+                ({"outcome": "coalesced"}, flights.coalesced),
+            ],
+        )
+    )
+
+    if _rate_limiter is not None:
+        limits = _rate_limiter.stats()
+        for name, help_text, value in (
+            (
+                "zotero_rate_limiter_requests_total",
+                "Requests that passed the rate limiter.",
+                limits.requests,
+            ),
+            (
+                "zotero_rate_limiter_retries_total",
+                "Requests retried after a failure or a 429.",
+                limits.retries,
+            ),
+            (
+                "zotero_rate_limiter_pauses_total",
+                "Backoff or Retry-After pauses requested by the server.",
+                limits.pauses,
+            ),
+            (
+                "zotero_rate_limiter_wait_seconds_total",
+                "Time requests spent waiting for the rate limiter.",
+                limits.wait_time,
+            ),
+        ):
+            families.append(MetricFamily(name, "counter", help_text, [({}, value)]))
+
+    validators = list(_validators.items())
+    families.append(
+        MetricFamily(
+            "zotero_library_version_probes_total",
+            "counter",
+            "Library version probes sent.",
+            [({"library": k.split("|")[-1]}, v.probes) for k, v in validators],
+        )
+    )
+    return families
+
+
+get_metrics().add_collector(collect_library_metrics)
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_conversion_engine() -> ConversionEngine:
+    """
+    Get the engine that converts attachments to markdown.
+
+    Conversions run in ZOTERO_CONVERSION_WORKERS worker processes (default: up
+    to 4, one per core; 0 converts inline). At most ZOTERO_CONVERSION_QUEUE
+    further jobs may wait for a worker, each job may take
+    ZOTERO_CONVERSION_TIMEOUT seconds once started (default: 120), and
+    ZOTERO_CONVERSION_MEMORY_MB caps the memory of every worker (default: no
+    limit).
+
+    Returns:
+        The shared ConversionEngine instance.
+    """
+    global _conversion_engine
+
+    with _conversion_engine_lock:
+        if _conversion_engine is None:
+            workers = int(
+                _env_number("ZOTERO_CONVERSION_WORKERS", min(4, os.cpu_count() or 1))
+            )
+            memory_mb = _env_number("ZOTERO_CONVERSION_MEMORY_MB", 0)
+            _conversion_engine = ConversionEngine(
+                max_workers=workers,
+                max_pending=int(_env_number("ZOTERO_CONVERSION_QUEUE", workers)),
+                timeout=_env_number("ZOTERO_CONVERSION_TIMEOUT", DEFAULT_TIMEOUT),
+                memory_limit=int(memory_mb * 1024 * 1024) if memory_mb > 0 else None,
+            )
+        return _conversion_engine
+
+
+def get_conversion_cache() -> Optional[ConversionCache]:
+    """
+    Get the on-disk cache of attachment-to-markdown conversions.
+
+    The cache lives in the "conversions" subdirectory of the cache directory and
+    holds at most ZOTERO_CONVERSION_CACHE_MB megabytes; setting that to 0
+    disables it.
+
+    Returns:
+        The shared ConversionCache instance, or None if caching is disabled.
+    """
+    global _conversion_cache
+
+    max_bytes = int(
+        _env_number("ZOTERO_CONVERSION_CACHE_MB", DEFAULT_MAX_BYTES >> 20) * 1024 * 1024
+    )
+    if max_bytes <= 0:
+        return None
+
+    with _conversion_cache_lock:
+        if _conversion_cache is None:
+            _conversion_cache = ConversionCache(
+                os.path.join(default_cache_dir(), "conversions"), max_bytes
+            )
+        return _conversion_cache
+
+
+def iter_pages(
+    fetch: Callable[..., List[Any]],
+    limit: Optional[int] = None,
+    start: int = 0,
+    page_size: int = MAX_PAGE_SIZE,
+    **params: Any,
+) -> Iterator[Any]:
+    """
+    Lazily iterate over a multi-object Web API request, one page at a time.
+
+    Unlike zot.everything(), the next page is only requested once the previous
+    one has been consumed, so iteration stops issuing requests as soon as
+    ``limit`` objects were yielded or the caller stops reading.
+
+    Args:
+        fetch: A pyzotero read method such as zot.items or zot.children.
+        limit: Maximum number of objects to yield (None for all).
+        start: Offset of the first object, to resume a previous iteration.
+        page_size: Objects per request (capped at the API maximum of 100).
+        **params: Additional query parameters for every request.
+
+    Yields:
+        The objects returned by the API, in order.
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    yielded = 0
+    while limit is None or yielded < limit:
+        size = page_size if limit is None else min(page_size, limit - yielded)
+        page = fetch(start=start, limit=size, **params)
+        if not page:
+            return
+        for obj in page:
+            yield obj
+        yielded += len(page)
+        start += len(page)
+        if len(page) < size:
+            return
+
+
+class ParentResolver:
+    """
+    Resolve parent items in batches, memoizing them for the rest of a tool call.
+
+    Looking up each parent with zot.item() costs one request per child; the
+    resolver de-duplicates keys and fetches unknown parents with itemKey=
+    requests of up to 50 keys, so N children cost at most ceil(N / 50) requests.
+    """
+
+    def __init__(
+        self,
+        zot: "zotero.Zotero",
+        mirror: Optional[LibraryMirror] = None,
+        batch_size: int = ITEM_KEY_BATCH_SIZE,
+    ):
+        """
+        Args:
+            zot: A Zotero client instance.
+            mirror: Optional local mirror consulted before the Web API.
+            batch_size: Number of keys per itemKey= request (max 50).
+        """
+        self.zot = zot
+        self.mirror = mirror
+        self.batch_size = min(batch_size, ITEM_KEY_BATCH_SIZE)
+        # None marks keys the API did not return, so they are not refetched
+        self._items: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def _missing(self, keys: Iterable[str]) -> List[str]:
+        """Keys that are neither resolved yet nor found in the mirror."""
+        missing = list(dict.fromkeys(k for k in keys if k and k not in self._items))
+        if missing and self.mirror is not None:
+            found = self.mirror.items_by_keys(missing)
+            self._items.update(found)
+            missing = [k for k in missing if k not in found]
+        return missing
+
+    def resolve(self, keys: Iterable[str]) -> None:
+        """
+        Fetch every key that has not been resolved yet.
+
+        Args:
+            keys: Item keys to resolve; duplicates and falsy keys are ignored.
+        """
+        missing = self._missing(keys)
+        for i in range(0, len(missing), self.batch_size):
+            chunk = missing[i : i + self.batch_size]
+            for key in chunk:
+                self._items[key] = None
+            results = self.zot.items(itemKey=",".join(chunk), limit=len(chunk))
+            for item in results:
+                self._items[item["key"]] = item
+
+    async def resolve_async(
+        self, keys: Iterable[str], client: AsyncZoteroClient
+    ) -> None:
+        """
+        Like resolve(), but request every batch at once on an async client.
+
+        Args:
+            keys: Item keys to resolve; duplicates and falsy keys are ignored.
+            client: The async client of the running event loop.
+        """
+        missing = self._missing(keys)
+        if not missing:
+            return
+        for key in missing:
+            self._items[key] = None
+        self._items.update(await client.items_by_keys(missing))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the item for ``key``, fetching it if necessary."""
+        self.resolve([key])
+        return self._items.get(key)
+
+    def parent_info(self, key: Optional[str]) -> str:
+        """Format the ' (from "Title")' suffix used when listing child items."""
+        if not key:
+            return ""
+        try:
+            parent = self.get(key)
+        except Exception:
+            parent = None
+        if parent is None:
+            return f" (parent key: {key})"
+        return f' (from "{parent["data"].get("title", "Untitled")}")'
 
 
 def format_item_metadata(item: Dict[str, Any], include_abstract: bool = True) -> str:
@@ -236,7 +938,7 @@ def generate_bibtex(item: Dict[str, Any]) -> str:
 
 
 def get_attachment_details(
-    zot: zotero.Zotero, item: Dict[str, Any]
+    zot: "zotero.Zotero", item: Dict[str, Any]
 ) -> Optional[AttachmentDetails]:
     """
     Get attachment details for a Zotero item, finding the most relevant attachment.
@@ -259,6 +961,8 @@ def get_attachment_details(
             title=data.get("title", "Untitled"),
             filename=data.get("filename", ""),
             content_type=data.get("contentType", ""),
+            md5=data.get("md5") or "",
+            version=item.get("version", data.get("version", 0)),
         )
 
     # For regular items, look for child attachments
@@ -281,7 +985,7 @@ def get_attachment_details(
                 # Use MD5 as proxy for size (longer MD5 usually means larger file)
                 size_proxy = len(child_data.get("md5", ""))
 
-                attachment = (key, title, filename, content_type, size_proxy)
+                attachment = (key, title, filename, content_type, size_proxy, child)
 
                 if content_type == "application/pdf":
                     pdfs.append(attachment)
@@ -295,12 +999,14 @@ def get_attachment_details(
         for category in [pdfs, htmls, others]:
             if category:
                 category.sort(key=lambda x: x[4], reverse=True)
-                key, title, filename, content_type, _ = category[0]
+                key, title, filename, content_type, _, child = category[0]
                 return AttachmentDetails(
                     key=key,
                     title=title,
                     filename=filename,
                     content_type=content_type,
+                    md5=child.get("data", {}).get("md5") or "",
+                    version=child.get("version", 0),
                 )
     except Exception:
         pass
@@ -308,10 +1014,64 @@ def get_attachment_details(
     return None
 
 
+def write_items(zot: "zotero.Zotero", objects: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Create or update up to WRITE_BATCH_SIZE items in a single request.
+
+    Objects may be partial (e.g. only ``key``, ``version`` and ``tags``). An
+    object that carries a ``version`` is only written if the item is still at
+    that version, the per-object form of If-Unmodified-Since-Version; otherwise
+    it is reported under ``failed`` with code 412 and the rest are written.
+
+    Args:
+        zot: A Zotero client instance.
+        objects: Item JSON objects to write.
+
+    Returns:
+        The Web API write response, with "success", "unchanged" and "failed"
+        entries keyed by the object's index in ``objects``.
+    """
+    if len(objects) > WRITE_BATCH_SIZE:
+        raise ValueError(f"At most {WRITE_BATCH_SIZE} items can be written at once")
+
+    response = zot.client.post(
+        f"{zot.endpoint}/{zot.library_type}/{zot.library_id}/items",
+        content=json.dumps(objects),
+        headers={**zot.default_headers(), "Content-Type": "application/json"},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def download_attachment(
+    zot: "zotero.Zotero", item_key: str, file_path: Union[str, Path]
+) -> None:
+    """
+    Download an attachment's file.
+
+    Unlike zot.dump(), this leaves the client's per-request state alone, so
+    several threads may download through the same client at once.
+
+    Args:
+        zot: A Zotero client instance.
+        item_key: Key of the attachment item.
+        file_path: Where to write the file.
+    """
+    url = f"{zot.endpoint}/{zot.library_type}/{zot.library_id}/items/{item_key}/file"
+    with zot.client.stream("GET", url, headers=zot.default_headers()) as response:
+        response.raise_for_status()
+        with open(file_path, "wb") as f:
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+
+
 def convert_to_markdown(file_path: Union[str, Path]) -> str:
     """
     Convert a file to markdown using markitdown library.
 
+    The conversion runs on the shared conversion engine, so it does not block
+    the calling thread's CPU and concurrent conversions use several cores.
+
     Args:
         file_path: Path to the file to convert.
 
@@ -319,8 +1079,6 @@ def convert_to_markdown(file_path: Union[str, Path]) -> str:
         Markdown text.
     """
     try:
-        md = MarkItDown()
-        result = md.convert(str(file_path))
-        return result.text_content
+        return get_conversion_engine().convert(file_path)
     except Exception as e:
         return f"Error converting file to markdown: {str(e)}"
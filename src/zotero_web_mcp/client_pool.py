@@ -0,0 +1,279 @@
+"""
+Pool of reusable Zotero Web API clients.
+
+``pyzotero.zotero.Zotero`` keeps per-request state on the instance
+(``add_parameters()`` stores URL parameters that the next call consumes, and
+pagination follows ``links`` from the previous response), so an instance must
+never be shared by two tool calls at the same time. The pool hands out
+instances exclusively, reuses them across calls, and backs all of them with a
+single keep-alive ``httpx.Client`` per library so TCP and TLS handshakes are
+paid once per connection rather than once per tool call.
+"""
+
+import contextvars
+import queue
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+from zotero_web_mcp.rate_limit import (
+    DEFAULT_MAX_RETRIES,
+    RateLimitedTransport,
+    RateLimiter,
+)
+from zotero_web_mcp.single_flight import COALESCED, SingleFlight, SingleFlightTransport
+
+if TYPE_CHECKING:
+    from pyzotero import zotero
+
+DEFAULT_ENDPOINT = "https://api.zotero.org"
+
+# Default number of clients (and keep-alive connections) per library
+DEFAULT_POOL_SIZE = 4
+
+# Clients leased by the current task, so nested helpers reuse the same lease
+_leased: contextvars.ContextVar[Dict[int, "zotero.Zotero"]] = contextvars.ContextVar(
+    "zotero_leased_clients"
+)
+
+
+@dataclass
+class RequestCounter:
+    """Number of upstream HTTP requests made while the counter was active."""
+
+    requests: int = 0
+    # Requests answered by an identical request already in flight
+    coalesced: int = 0
+    # Response body bytes received from the API, as sent (before decoding)
+    bytes: int = 0
+
+
+# Counters active in the current task; nested counters all see each request
+_counters: contextvars.ContextVar[Tuple[RequestCounter, ...]] = contextvars.ContextVar(
+    "zotero_request_counters", default=()
+)
+
+
+def _count_request(request: httpx.Request) -> None:
+    for counter in _counters.get():
+        counter.requests += 1
+
+
+class _CountingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Response stream that adds the bytes read to the active counters."""
+
+    def __init__(self, stream: Any, counters: Tuple[RequestCounter, ...]):
+        self._stream = stream
+        self._counters = counters
+
+    def _count(self, chunk: bytes) -> bytes:
+        for counter in self._counters:
+            counter.bytes += len(chunk)
+        return chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            yield self._count(chunk)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield self._count(chunk)
+
+    def close(self) -> None:
+        self._stream.close()
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+def _count_response(response: httpx.Response) -> None:
+    counters = _counters.get()
+    if not counters:
+        return
+    # A coalesced request never reached the API
+    if response.extensions.get(COALESCED):
+        for counter in counters:
+            counter.requests -= 1
+            counter.coalesced += 1
+    else:
+        response.stream = _CountingStream(response.stream, counters)
+
+
+@contextmanager
+def count_upstream_requests() -> Iterator[RequestCounter]:
+    """
+    Count the Web API requests made by pooled clients inside the ``with`` block.
+
+    Yields:
+        A RequestCounter that is updated as requests are sent.
+    """
+    counter = RequestCounter()
+    token = _counters.set(_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _counters.reset(token)
+
+
+class ZoteroClientPool:
+    """Bounded pool of Zotero clients for a single library."""
+
+    def __init__(
+        self,
+        library_id: str,
+        library_type: str = "user",
+        api_key: Optional[str] = None,
+        size: int = DEFAULT_POOL_SIZE,
+        endpoint: str = DEFAULT_ENDPOINT,
+        timeout: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        single_flight: Optional[SingleFlight] = None,
+    ):
+        """
+        Create a client pool.
+
+        Args:
+            library_id: Zotero library ID.
+            library_type: Zotero library type ('user' or 'group').
+            api_key: Zotero API key.
+            size: Maximum number of clients leased at once; also caps the number
+                of open connections to the API.
+            endpoint: Base URL of the Zotero Web API.
+            timeout: Seconds to wait for a free client before raising
+                TimeoutError (None waits indefinitely).
+            rate_limiter: Rate limiter every request passes through; share one
+                between pools to limit the whole process (None for no limit).
+            max_retries: Retries for failed idempotent requests when a rate
+                limiter is set.
+            single_flight: Registry that identical concurrent GET requests
+                are coalesced through (None to send every request).
+        """
+        self.library_id = str(library_id)
+        self.library_type = library_type
+        self.api_key = api_key
+        self.size = max(1, size)
+        self.endpoint = endpoint.rstrip("/")
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.single_flight = single_flight
+
+        self._idle: "queue.LifoQueue[zotero.Zotero]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._http: Optional[httpx.Client] = None
+        self.leases = 0
+
+    @property
+    def created(self) -> int:
+        """Number of Zotero clients created so far (at most ``size``)."""
+        return self._created
+
+    def _create_client(self) -> "zotero.Zotero":
+        # pyzotero (and bibtexparser with it) loads on the first lease
+        from pyzotero import zotero
+
+        zot = zotero.Zotero(
+            library_id=self.library_id,
+            library_type=self.library_type,
+            api_key=self.api_key,
+            local=False,  # Always use web API
+        )
+        zot.endpoint = self.endpoint
+        with self._lock:
+            if self._http is None:
+                transport: httpx.BaseTransport = httpx.HTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=self.size,
+                        max_keepalive_connections=self.size,
+                    ),
+                )
+                if self.rate_limiter is not None:
+                    transport = RateLimitedTransport(
+                        transport, self.rate_limiter, self.max_retries
+                    )
+                if self.single_flight is not None:
+                    # Outside the rate limiter: waiting requests take no token
+                    transport = SingleFlightTransport(transport, self.single_flight)
+                self._http = httpx.Client(
+                    headers=zot.default_headers(),
+                    follow_redirects=True,
+                    event_hooks={
+                        "request": [_count_request],
+                        "response": [_count_response],
+                    },
+                    transport=transport,
+                )
+            # Replace the private client pyzotero opened with the shared one
+            zot.client.close()
+            zot.client = self._http
+            self._created += 1
+        return zot
+
+    @staticmethod
+    def _reset(zot: "zotero.Zotero") -> None:
+        """Clear per-request state left behind by the previous lease."""
+        zot.url_params = None
+        zot.links = None
+        zot.tag_data = False
+        zot.snapshot = False
+
+    @contextmanager
+    def client(self) -> Iterator["zotero.Zotero"]:
+        """
+        Lease a client for the duration of the ``with`` block.
+
+        Leases are re-entrant within a task: nested calls made while a client is
+        already leased from this pool get the same client back.
+
+        Yields:
+            A Zotero client that no other caller is using.
+
+        Raises:
+            TimeoutError: If no client became free within the pool timeout.
+        """
+        leased = _leased.get(None)
+        if leased is not None and id(self) in leased:
+            yield leased[id(self)]
+            return
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(
+                f"No Zotero client became available within {self.timeout}s"
+            )
+        try:
+            try:
+                zot = self._idle.get_nowait()
+            except queue.Empty:
+                zot = self._create_client()
+            self._reset(zot)
+            self.leases += 1
+
+            token = _leased.set({**(leased or {}), id(self): zot})
+            try:
+                yield zot
+            finally:
+                _leased.reset(token)
+                self._reset(zot)
+                self._idle.put(zot)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close the shared HTTP connection pool."""
+        with self._lock:
+            while True:
+                try:
+                    zot = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                # pyzotero closes its client on garbage collection
+                zot.client = None
+            if self._http is not None:
+                self._http.close()
+                self._http = None
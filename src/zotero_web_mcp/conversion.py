@@ -0,0 +1,271 @@
+"""
+Document-to-markdown conversion engine.
+
+markitdown conversions are CPU-bound and can take seconds per PDF, so they run
+in a bounded pool of worker processes, each of which builds one ``MarkItDown``
+instance at startup and reuses it for every job. The engine limits how many
+jobs may wait for a worker (callers beyond that are rejected instead of piling
+up) and can cap the address space of every worker so a pathological file
+cannot take the server down with it.
+
+The per-job timeout counts from when a worker starts the job, not from when it
+was queued: the worker arms a timer that interrupts the conversion, and only a
+worker that misses its deadline by KILL_GRACE seconds (stuck in native code,
+say) is killed. Each worker is a pool of its own, so killing one leaves the
+jobs of the others running.
+"""
+
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from zotero_web_mcp.metrics import get_metrics
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Seconds a single conversion may run once a worker has started it
+DEFAULT_TIMEOUT = 120.0
+
+# Seconds past its deadline a worker gets before it is killed
+KILL_GRACE = 30.0
+
+# Seconds a caller waits for room in the queue before giving up
+DEFAULT_QUEUE_TIMEOUT = 30.0
+
+# The MarkItDown instance of the current process (worker or inline engine)
+_converter: Any = None
+_converter_lock = threading.Lock()
+
+
+class ConversionError(Exception):
+    """A document could not be converted."""
+
+
+class ConversionTimeout(ConversionError):
+    """A conversion took longer than the engine's per-job timeout."""
+
+
+class ConversionQueueFull(ConversionError):
+    """Too many conversions are already running or waiting."""
+
+
+def _get_converter() -> Any:
+    global _converter
+
+    if _converter is None:
+        from markitdown import MarkItDown
+
+        _converter = MarkItDown()
+    return _converter
+
+
+def _init_worker(memory_limit: Optional[int]) -> None:
+    """Worker process initializer: apply the memory cap and warm up markitdown."""
+    if memory_limit and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    _get_converter()
+
+
+def _convert(file_path: str, timeout: Optional[float] = None) -> str:
+    """Convert a file, giving up after timeout seconds where signals allow it."""
+    # Worker jobs run in the main thread, where SIGALRM can interrupt them
+    if (
+        not timeout
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        return _get_converter().convert(file_path).text_content
+
+    def expire(signum: int, frame: Any) -> None:
+        raise ConversionTimeout(
+            f"Conversion of {Path(file_path).name} timed out after {timeout:g}s"
+        )
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return _get_converter().convert(file_path).text_content
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class ConversionEngine:
+    """Runs markitdown conversions in a bounded pool of warm worker processes."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        memory_limit: Optional[int] = None,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+    ):
+        """
+        Create a conversion engine.
+
+        Args:
+            max_workers: Number of worker processes; 0 converts inline in the
+                calling thread with a single shared converter.
+            max_pending: Jobs allowed to wait for a free worker (default: one
+                per worker).
+            timeout: Seconds a single conversion may take.
+            memory_limit: Address-space limit per worker in bytes (None for
+                no limit; ignored where the platform does not support it).
+            queue_timeout: Seconds to wait for room in the queue before
+                raising ConversionQueueFull.
+        """
+        self.max_workers = max(0, max_workers)
+        self.max_pending = max_workers if max_pending is None else max(0, max_pending)
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.queue_timeout = queue_timeout
+
+        self._slots = threading.BoundedSemaphore(
+            max(1, self.max_workers + self.max_pending)
+        )
+        # Each worker is a single-process pool, so one can be killed alone
+        self._available = threading.Condition()
+        self._idle: List[ProcessPoolExecutor] = []
+        self._workers: List[ProcessPoolExecutor] = []
+
+    def _checkout(self) -> ProcessPoolExecutor:
+        """Wait for an idle worker, starting one while the pool is not full."""
+        with self._available:
+            while not self._idle and len(self._workers) >= self.max_workers:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            worker = ProcessPoolExecutor(
+                max_workers=1,
+                # Forking a threaded server process is unsafe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.memory_limit,),
+            )
+            self._workers.append(worker)
+            return worker
+
+    def _checkin(self, worker: ProcessPoolExecutor) -> None:
+        with self._available:
+            if worker in self._workers:
+                self._idle.append(worker)
+                self._available.notify()
+                return
+        # The engine was shut down while the job ran
+        worker.shutdown(wait=False)
+
+    def _kill(self, worker: ProcessPoolExecutor) -> None:
+        """Kill a stuck or broken worker; the next job starts a new one."""
+        with self._available:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self._available.notify()
+        # A running job cannot be cancelled, so terminate its process
+        for process in list(getattr(worker, "_processes", {}).values()):
+            process.terminate()
+        worker.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, file_path: Union[str, Path]) -> "Future[str]":
+        """
+        Queue a conversion without waiting for it.
+
+        Args:
+            file_path: Path of the file to convert.
+
+        Returns:
+            A future resolving to the markdown text.
+
+        Raises:
+            ConversionQueueFull: If the queue stayed full for queue_timeout.
+        """
+        self._acquire_slot()
+        future: "Future[str]" = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self._run_in_worker(file_path))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._slots.release()
+
+        threading.Thread(target=run, name="conversion", daemon=True).start()
+        return future
+
+    def convert(self, file_path: Union[str, Path]) -> str:
+        """
+        Convert a file to markdown, waiting for the result.
+
+        Args:
+            file_path: Path of the file to convert.
+
+        Returns:
+            Markdown text.
+
+        Raises:
+            ConversionQueueFull: If the queue stayed full for queue_timeout.
+            ConversionTimeout: If the conversion took longer than timeout
+                once a worker had started it.
+            ConversionError: If the worker died, e.g. on hitting the memory cap.
+        """
+        with get_metrics().time_operation("markitdown"):
+            return self._run(file_path)
+
+    def _acquire_slot(self) -> None:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            if self.max_workers == 0:
+                raise ConversionQueueFull("A conversion is already running")
+            raise ConversionQueueFull(
+                f"Conversion queue is full ({self.max_workers} running, "
+                f"{self.max_pending} waiting)"
+            )
+
+    def _run(self, file_path: Union[str, Path]) -> str:
+        self._acquire_slot()
+        try:
+            if self.max_workers == 0:
+                # One shared converter, used by one thread at a time
+                with _converter_lock:
+                    return _convert(str(file_path))
+            return self._run_in_worker(file_path)
+        finally:
+            self._slots.release()
+
+    def _run_in_worker(self, file_path: Union[str, Path]) -> str:
+        worker = self._checkout()
+        try:
+            # The worker enforces the timeout itself from when the job starts;
+            # waiting longer only catches a worker that cannot be interrupted
+            future = worker.submit(_convert, str(file_path), self.timeout)
+            result = future.result(timeout=self.timeout + KILL_GRACE)
+        except FutureTimeoutError:
+            self._kill(worker)
+            raise ConversionTimeout(
+                f"Conversion of {Path(file_path).name} timed out after "
+                f"{self.timeout:g}s"
+            ) from None
+        except BrokenProcessPool as e:
+            self._kill(worker)
+            raise ConversionError(f"Conversion worker died: {e}") from None
+        except BaseException:
+            self._checkin(worker)
+            raise
+        self._checkin(worker)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._available:
+            workers, self._workers, self._idle = self._workers, [], []
+            self._available.notify_all()
+        for worker in workers:
+            worker.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,266 @@
+"""
+On-disk cache of attachment-to-markdown conversions.
+
+Converting a PDF with markitdown takes seconds of CPU, so the markdown is kept
+on disk keyed by the attachment key and the MD5 of the file Zotero stores
+(falling back to the attachment version for linked files without an MD5).
+A changed file gets a new key, so entries never need invalidating; the cache
+is bounded by total size and evicts the least recently read entries first.
+
+Finding the attachment of an item, and its MD5, takes two requests. A small
+record per item remembers which entry the item's full text came from and at
+which library version, so a repeated read in an unchanged library needs
+neither request. These records count towards the size bound and are evicted
+like the markdown itself.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Default upper bound for the total size of cached markdown
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how well the conversion cache is doing."""
+
+    hits: int = 0
+    misses: int = 0
+    # Outdated entries served while a fresh value is computed
+    stale_hits: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.stale_hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ConversionCache:
+    """Size-bounded LRU cache of converted markdown, stored as files."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) a conversion cache.
+
+        Args:
+            directory: Directory the cached markdown files are written to.
+            max_bytes: Maximum total size of the cache in bytes.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+        # Entry path -> (size, last access) for markdown and item records;
+        # file mtimes carry the access order across restarts
+        self._entries: Dict[Path, Tuple[int, float]] = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in [
+            *self.directory.glob("*/*.md"),
+            *self.directory.glob("items/*.json"),
+        ]:
+            stat = path.stat()
+            self._entries[path] = (stat.st_size, stat.st_mtime)
+        self._stats.entries = len(self._entries)
+        self._stats.size = sum(size for size, _ in self._entries.values())
+
+    @staticmethod
+    def cache_key(attachment_key: str, md5: str = "", version: int = 0) -> str:
+        """The content address of one version of an attachment's file."""
+        identity = (
+            f"{attachment_key}:md5={md5}" if md5 else f"{attachment_key}:v={version}"
+        )
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.md"
+
+    def get(
+        self, attachment_key: str, md5: str = "", version: int = 0
+    ) -> Optional[str]:
+        """
+        Look up the markdown converted from an attachment.
+
+        Args:
+            attachment_key: Zotero key of the attachment.
+            md5: MD5 of the attachment file, as reported by the Web API.
+            version: Attachment item version, used when there is no MD5.
+
+        Returns:
+            The cached markdown, or None on a miss.
+        """
+        path = self._path(self.cache_key(attachment_key, md5, version))
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            with self._lock:
+                self._stats.misses += 1
+            return None
+
+        with self._lock:
+            self._stats.hits += 1
+            self._touch(path)
+        return text
+
+    def put(
+        self, attachment_key: str, text: str, md5: str = "", version: int = 0
+    ) -> None:
+        """
+        Store the markdown converted from an attachment, evicting old entries.
+
+        Args:
+            attachment_key: Zotero key of the attachment.
+            text: The converted markdown.
+            md5: MD5 of the attachment file, as reported by the Web API.
+            version: Attachment item version, used when there is no MD5.
+        """
+        data = text.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(self.cache_key(attachment_key, md5, version))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see partial entries
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._entries[path] = (len(data), path.stat().st_mtime)
+            self._evict()
+
+    def _touch(self, path: Path) -> None:
+        # Mark an entry as just read; called with the lock held
+        try:
+            os.utime(path)
+            stat = path.stat()
+            self._entries[path] = (stat.st_size, stat.st_mtime)
+        except OSError:
+            pass
+
+    def _item_path(self, library: str, item_key: str) -> Path:
+        key = hashlib.sha256(f"{library}:{item_key}".encode()).hexdigest()
+        return self.directory / "items" / f"{key}.json"
+
+    def put_item(
+        self,
+        library: str,
+        item_key: str,
+        library_version: int,
+        attachment_key: str,
+        metadata: str,
+        md5: str = "",
+        version: int = 0,
+    ) -> None:
+        """
+        Remember the attachment an item's full text was converted from.
+
+        Args:
+            library: Library the item belongs to, e.g. 'users/123'.
+            item_key: Zotero key of the item.
+            library_version: Library version the item and its attachment
+                were read at.
+            attachment_key: Zotero key of the converted attachment.
+            metadata: The item metadata shown with the full text.
+            md5: MD5 of the attachment file, as reported by the Web API.
+            version: Attachment item version, used when there is no MD5.
+        """
+        record = {
+            "library_version": library_version,
+            "attachment_key": attachment_key,
+            "md5": md5,
+            "version": version,
+            "metadata": metadata,
+        }
+        data = json.dumps(record).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._item_path(library, item_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._entries[path] = (len(data), path.stat().st_mtime)
+            self._evict()
+
+    def get_item(
+        self, library: str, item_key: str, library_version: int
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Look up the full text of an item without knowing its attachment.
+
+        Args:
+            library: Library the item belongs to, e.g. 'users/123'.
+            item_key: Zotero key of the item.
+            library_version: The current library version; records from any
+                other version are ignored, since the item may have changed.
+
+        Returns:
+            The item metadata and the cached markdown, or None.
+        """
+        path = self._item_path(library, item_key)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if record.get("library_version") != library_version:
+            return None
+        with self._lock:
+            self._touch(path)
+        attachment_key = record["attachment_key"]
+        md5, version = record.get("md5", ""), record.get("version", 0)
+        # Evicted content is a miss of the attachment lookup that follows
+        if not self._path(self.cache_key(attachment_key, md5, version)).exists():
+            return None
+        text = self.get(attachment_key, md5=md5, version=version)
+        return None if text is None else (record["metadata"], text)
+
+    def _evict(self) -> None:
+        total = sum(size for size, _ in self._entries.values())
+        if total > self.max_bytes:
+            # Least recently read first
+            for path, (size, _) in sorted(
+                self._entries.items(), key=lambda entry: entry[1][1]
+            ):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                del self._entries[path]
+                self._stats.evictions += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._stats.entries = len(self._entries)
+        self._stats.size = total
+
+    def stats(self) -> CacheStats:
+        """A snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def clear(self) -> None:
+        """Remove every cached conversion."""
+        with self._lock:
+            for path in list(self._entries):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.size = 0
+            shutil.rmtree(self.directory / "items", ignore_errors=True)
@@ -0,0 +1,186 @@
+"""
+Whole-library cache validation with a single version probe.
+
+Every write to a Zotero library bumps its version, and every multi-object
+response carries the current version in ``Last-Modified-Version``. So one
+tiny request - ``/items?limit=1&format=versions`` with
+``If-Modified-Since-Version``, answered with an empty 304 when nothing
+changed - tells whether anything cached for the library is out of date.
+
+LibraryVersionValidator sends that probe at most once per TTL window. While
+the version is unchanged every cached result stays valid; when it moved, the
+keys changed in between are listed with ``format=versions&since=`` and the
+``/deleted`` endpoint, and listeners invalidate only what those keys touch.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+
+if TYPE_CHECKING:
+    from pyzotero import zotero
+
+# Default seconds during which a probed library version is trusted
+DEFAULT_VALIDATION_TTL = 30.0
+
+
+@dataclass
+class LibraryChanges:
+    """Objects changed between two versions of a library."""
+
+    previous_version: int
+    library_version: int
+    # Created, modified or deleted objects
+    item_keys: Set[str] = field(default_factory=set)
+    collection_keys: Set[str] = field(default_factory=set)
+    # The changed keys are unknown, so everything cached is invalid
+    everything: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return self.library_version != self.previous_version
+
+
+class LibraryVersionValidator:
+    """Tracks the version of one library with a cheap probe per TTL window."""
+
+    def __init__(self, ttl: float = DEFAULT_VALIDATION_TTL):
+        """
+        Create a validator.
+
+        Args:
+            ttl: Seconds a probed version is trusted before the next probe
+                (0 probes on every validation).
+        """
+        self.ttl = ttl
+        self.probes = 0
+        self._version: Optional[int] = None
+        self._checked: Optional[float] = None
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._listeners: List[Callable[[LibraryChanges], None]] = []
+
+    @property
+    def version(self) -> Optional[int]:
+        """The last known library version (None before the first probe)."""
+        with self._lock:
+            return self._version
+
+    def add_listener(self, listener: Callable[[LibraryChanges], None]) -> None:
+        """
+        Call ``listener`` with the LibraryChanges whenever the version moves.
+
+        Listeners run in the thread that ran the probe and must not raise.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def is_due(self) -> bool:
+        """Whether the known version is older than the TTL."""
+        with self._lock:
+            return self._checked is None or time.monotonic() - self._checked > self.ttl
+
+    def restore(self, version: int) -> None:
+        """
+        Start from a version saved by a previous process.
+
+        The version is not trusted until the next probe confirms it, but the
+        probe can then answer with a 304 and changes since it are reported.
+        """
+        with self._lock:
+            if self._version is None:
+                self._version = version
+
+    def invalidate(self) -> None:
+        """Probe again on the next validation, e.g. after a write."""
+        with self._lock:
+            self._checked = None
+
+    def validate(self, zot: "zotero.Zotero") -> int:
+        """
+        Return the current library version, probing if the TTL has expired.
+
+        Concurrent callers share one probe. If the version changed since the
+        previous probe, the listeners are told which objects changed.
+
+        Args:
+            zot: A Zotero client for the library.
+
+        Returns:
+            The library version.
+
+        Raises:
+            httpx.HTTPError: If the probe failed.
+        """
+        if not self.is_due():
+            return self.version
+        with self._probe_lock:
+            # Another caller may have probed while we waited for the lock
+            if not self.is_due():
+                return self.version
+
+            with self._lock:
+                known = self._version
+                listeners = list(self._listeners)
+            version = self._probe(zot, known)
+            changes = None
+            # Changed keys are only worth listing if someone invalidates them
+            if listeners and known is not None and version != known:
+                changes = self._changes(zot, known, version)
+            with self._lock:
+                self._version = version
+                self._checked = time.monotonic()
+
+        if changes is not None:
+            for listener in listeners:
+                listener(changes)
+        return version
+
+    def _library_url(self, zot: "zotero.Zotero", path: str) -> str:
+        return f"{zot.endpoint}/{zot.library_type}/{zot.library_id}{path}"
+
+    def _probe(self, zot: "zotero.Zotero", known: Optional[int]) -> int:
+        """Read the library version with one request of (at most) one key."""
+        headers = {}
+        if known is not None:
+            headers["If-Modified-Since-Version"] = str(known)
+        response = zot.client.get(
+            self._library_url(zot, "/items"),
+            params={"limit": 1, "format": "versions"},
+            headers=headers,
+        )
+        self.probes += 1
+        if response.status_code == 304:
+            return known
+        response.raise_for_status()
+        return int(response.headers.get("Last-Modified-Version", 0))
+
+    def _versions(self, zot: "zotero.Zotero", path: str, **params: Any) -> Set[str]:
+        response = zot.client.get(
+            self._library_url(zot, path), params={"format": "versions", **params}
+        )
+        response.raise_for_status()
+        return set(response.json())
+
+    def _changes(
+        self, zot: "zotero.Zotero", since: int, version: int
+    ) -> LibraryChanges:
+        """List the objects changed after ``since``; on failure, report everything."""
+        changes = LibraryChanges(previous_version=since, library_version=version)
+        try:
+            changes.item_keys = self._versions(
+                zot, "/items", since=since, includeTrashed=1
+            )
+            changes.collection_keys = self._versions(zot, "/collections", since=since)
+            response = zot.client.get(
+                self._library_url(zot, "/deleted"), params={"since": since}
+            )
+            response.raise_for_status()
+            deleted: Dict[str, List[str]] = response.json()
+        except Exception:
+            changes.everything = True
+            return changes
+        changes.item_keys.update(deleted.get("items", []))
+        changes.collection_keys.update(deleted.get("collections", []))
+        return changes
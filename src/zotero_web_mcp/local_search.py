@@ -0,0 +1,360 @@
+"""
+Local evaluation of Zotero saved-search conditions.
+
+zotero_advanced_search used to create a temporary saved search on the server,
+run it and delete it again - three round trips and two library writes for a
+read-only query. Instead, the conditions are compiled into a single SQL
+``WHERE`` clause over the local mirror, whose creator, date, tag, item type and
+collection columns are indexed. Every predicate refers to the ``items`` table
+of the mirror; values are always bound as parameters.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from zotero_web_mcp.mirror import LibraryMirror, _match_expression
+
+# Operations accepted in search conditions (the Zotero saved-search operators)
+OPERATIONS = (
+    "is",
+    "isNot",
+    "contains",
+    "doesNotContain",
+    "beginsWith",
+    "isLessThan",
+    "isGreaterThan",
+    "isBefore",
+    "isAfter",
+    "isInTheLast",
+)
+
+# Friendlier field names accepted in addition to the Zotero ones
+FIELD_ALIASES = {"author": "creator", "year": "date", "type": "itemType"}
+
+# Date-valued fields and the items column each one is stored in
+_DATE_COLUMNS = {
+    "date": "items.date",
+    "dateAdded": "items.date_added",
+    "dateModified": "items.date_modified",
+}
+
+# Quick search modes, matched against the precomputed lower-case text columns
+_TEXT_COLUMNS = {
+    "anyField": "items.all_text",
+    "quicksearch-everything": "items.all_text",
+    "quicksearch-fields": "items.all_text",
+    "quicksearch-titleCreatorYear": "items.title_text",
+}
+
+_NEGATED = {"isNot": "is", "doesNotContain": "contains"}
+
+_FIELD_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+_DATE_VALUE = re.compile(r"^\s*(\d{4})(?:[-/.](\d{1,2})(?:[-/.](\d{1,2}))?)?")
+_PERIOD = re.compile(
+    r"^\s*(\d+)\s*(day|week|month|year)s?\s*$",
+    re.IGNORECASE,
+)
+_PERIOD_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+# Sorts above every string that starts with a given prefix
+_PREFIX_END = "\uffff"
+
+
+class SearchConditionError(ValueError):
+    """A search condition cannot be evaluated."""
+
+
+@dataclass
+class SearchCondition:
+    """One ``field operation value`` condition of an advanced search."""
+
+    field: str
+    operation: str
+    value: str
+
+    @classmethod
+    def from_dict(cls, condition: Dict[str, Any]) -> "SearchCondition":
+        """
+        Build a condition from a tool argument.
+
+        Args:
+            condition: Dictionary with 'field', 'operation' and 'value' keys.
+
+        Returns:
+            The condition, with field aliases such as 'author' resolved.
+        """
+        field = str(condition["field"])
+        return cls(
+            field=FIELD_ALIASES.get(field, field),
+            operation=str(condition["operation"]),
+            value=str(condition["value"]),
+        )
+
+
+def normalize_date(value: str) -> str:
+    """
+    Turn a user-supplied date into the ``YYYY[-MM[-DD]]`` form stored locally.
+
+    Args:
+        value: A year, year-month or full date, separated by '-', '/' or '.'.
+
+    Returns:
+        The zero-padded ISO date prefix.
+
+    Raises:
+        SearchConditionError: If the value does not start with a year.
+    """
+    match = _DATE_VALUE.match(value)
+    if not match:
+        raise SearchConditionError(f"Invalid date: '{value}'")
+    year, month, day = match.groups()
+    parts = [year] + [f"{int(p):02d}" for p in (month, day) if p]
+    return "-".join(parts)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _text_predicate(expr: str, operation: str, value: str) -> Tuple[str, List[Any]]:
+    """A positive comparison of a text expression, case-insensitive."""
+    if operation == "is":
+        return f"{expr} = ? COLLATE NOCASE", [value]
+    if operation == "contains":
+        return f"instr(lower({expr}), ?) > 0", [value.lower()]
+    if operation == "beginsWith":
+        return f"{expr} LIKE ? ESCAPE '\\'", [_escape_like(value) + "%"]
+    if operation in ("isLessThan", "isGreaterThan"):
+        try:
+            number = float(value)
+        except ValueError:
+            raise SearchConditionError(
+                f"'{operation}' needs a numeric value, got '{value}'"
+            ) from None
+        comparison = "<" if operation == "isLessThan" else ">"
+        return f"CAST({expr} AS REAL) {comparison} ?", [number]
+    raise SearchConditionError(f"Operation '{operation}' is not supported here")
+
+
+def _date_predicate(column: str, operation: str, value: str) -> Tuple[str, List[Any]]:
+    if operation == "isInTheLast":
+        match = _PERIOD.match(value)
+        if not match:
+            raise SearchConditionError(
+                f"'isInTheLast' needs a period such as '30 days', got '{value}'"
+            )
+        days = int(match.group(1)) * _PERIOD_DAYS[match.group(2).lower()]
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        return f"{column} >= ?", [since.strftime("%Y-%m-%dT%H:%M:%SZ")]
+
+    date = normalize_date(value)
+    if operation in ("is", "isNot"):
+        # A year or month matches every date inside it
+        sql = f"{column} BETWEEN ? AND ?"
+        if operation == "isNot":
+            sql = f"({column} IS NULL OR {column} = '' OR NOT {sql})"
+        return sql, [date, date + _PREFIX_END]
+    if operation in ("isBefore", "isLessThan"):
+        return f"({column} <> '' AND {column} < ?)", [date]
+    if operation in ("isAfter", "isGreaterThan"):
+        return f"{column} > ?", [date + _PREFIX_END]
+    raise SearchConditionError(f"Operation '{operation}' is not supported for dates")
+
+
+def _membership(
+    table: str, predicate: str, params: List[Any], negate: bool
+) -> Tuple[str, List[Any]]:
+    """Match items with (or without) a related row; the subquery drives key lookups."""
+    keyword = "NOT IN" if negate else "IN"
+    return (
+        f"items.key {keyword} (SELECT x.item_key FROM {table} WHERE {predicate})",
+        params,
+    )
+
+
+def compile_condition(condition: SearchCondition) -> Tuple[str, List[Any]]:
+    """
+    Compile one condition into a SQL predicate over the mirror's ``items``.
+
+    Args:
+        condition: The condition to compile.
+
+    Returns:
+        The predicate and its bound parameters.
+
+    Raises:
+        SearchConditionError: For unknown operations, fields or bad values.
+    """
+    field, operation, value = condition.field, condition.operation, condition.value
+    if operation not in OPERATIONS:
+        raise SearchConditionError(
+            f"Unknown operation '{operation}' (expected one of: "
+            f"{', '.join(OPERATIONS)})"
+        )
+
+    if field in _DATE_COLUMNS:
+        return _date_predicate(_DATE_COLUMNS[field], operation, value)
+    if operation in ("isBefore", "isAfter", "isInTheLast"):
+        raise SearchConditionError(
+            f"Operation '{operation}' only applies to date fields, not '{field}'"
+        )
+
+    negate = operation in _NEGATED
+    positive = _NEGATED.get(operation, operation)
+
+    if field == "creator":
+        predicate, params = _text_predicate("x.name", positive, value)
+        if positive == "is":
+            # A bare last name matches, as in Zotero
+            predicate = f"({predicate} OR x.last_name = ? COLLATE NOCASE)"
+            params.append(value)
+        return _membership("item_creators x", predicate, params, negate)
+
+    if field == "tag":
+        predicate, params = _text_predicate("x.tag", positive, value)
+        return _membership("item_tags x", predicate, params, negate)
+
+    if field == "collection":
+        if positive != "is":
+            raise SearchConditionError("Collections only support 'is' and 'isNot'")
+        # Accept a collection key or a collection name
+        return _membership(
+            "item_collections x",
+            "(x.collection_key = ? OR x.collection_key IN"
+            " (SELECT key FROM collections WHERE name = ? COLLATE NOCASE))",
+            [value.upper(), value],
+            negate,
+        )
+
+    if field == "itemType":
+        if positive != "is":
+            raise SearchConditionError("Item types only support 'is' and 'isNot'")
+        sql = "items.item_type IS NOT ?" if negate else "items.item_type = ?"
+        return sql, [value]
+
+    if field == "fulltextContent":
+        if positive != "contains":
+            raise SearchConditionError(
+                "Full-text content only supports 'contains' and 'doesNotContain'"
+            )
+        keyword = "NOT IN" if negate else "IN"
+        matched = (
+            "SELECT d.item_key FROM search_docs d"
+            " JOIN search_index ON search_index.rowid = d.id"
+            " WHERE d.source = 'fulltext' AND search_index MATCH ?"
+        )
+        # Full text belongs to attachments; their parent items match too, so
+        # the condition combines with conditions on the parent's metadata
+        expression = _match_expression(value) or '""'
+        return (
+            f"items.key {keyword} ({matched} UNION SELECT a.parent_item FROM items a"
+            f" WHERE a.parent_item IS NOT NULL AND a.key IN ({matched}))",
+            [expression, expression],
+        )
+
+    if field in _TEXT_COLUMNS:
+        expr = _TEXT_COLUMNS[field]
+    elif _FIELD_NAME.match(field):
+        expr = f"json_extract(items.json, '$.data.{field}')"
+    else:
+        raise SearchConditionError(f"Invalid field name '{field}'")
+
+    predicate, params = _text_predicate(expr, positive, value)
+    if negate:
+        predicate = f"NOT COALESCE({predicate}, 0)"
+    return predicate, params
+
+
+def compile_conditions(
+    conditions: List[SearchCondition], join_mode: str = "all"
+) -> Tuple[str, List[Any]]:
+    """
+    Compile a list of conditions into one predicate.
+
+    Args:
+        conditions: The conditions of the search.
+        join_mode: 'all' to AND the conditions, 'any' to OR them.
+
+    Returns:
+        The combined predicate and its bound parameters.
+    """
+    if join_mode not in ("all", "any"):
+        raise SearchConditionError(f"Unknown join mode '{join_mode}'")
+    if not conditions:
+        return "1", []
+
+    predicates, params = [], []
+    for condition in conditions:
+        predicate, condition_params = compile_condition(condition)
+        predicates.append(f"({predicate})")
+        params.extend(condition_params)
+    joiner = " AND " if join_mode == "all" else " OR "
+    return joiner.join(predicates), params
+
+
+def compile_sort(sort_by: str = "", direction: str = "asc") -> str:
+    """
+    Compile a sort field into an ``ORDER BY`` expression over ``items``.
+
+    Args:
+        sort_by: Field to sort by (dateAdded, dateModified, title, creator,
+            date, itemType or any other item field); empty for most recently
+            modified first.
+        direction: 'asc' or 'desc'.
+
+    Returns:
+        The ORDER BY expression, without the keyword.
+    """
+    if not sort_by:
+        return "items.date_modified DESC, items.key"
+
+    sort_by = FIELD_ALIASES.get(sort_by, sort_by)
+    if sort_by in _DATE_COLUMNS:
+        expr = f"NULLIF({_DATE_COLUMNS[sort_by]}, '')"
+    elif sort_by == "creator":
+        expr = (
+            "(SELECT x.last_name FROM item_creators x"
+            " WHERE x.item_key = items.key ORDER BY x.position LIMIT 1)"
+        )
+    elif sort_by == "itemType":
+        expr = "items.item_type"
+    elif _FIELD_NAME.match(sort_by):
+        expr = f"NULLIF(lower(json_extract(items.json, '$.data.{sort_by}')), '')"
+    else:
+        raise SearchConditionError(f"Invalid sort field '{sort_by}'")
+
+    order = "DESC" if direction.lower() == "desc" else "ASC"
+    return f"{expr} {order} NULLS LAST, items.key"
+
+
+def advanced_search(
+    mirror: LibraryMirror,
+    conditions: List[SearchCondition],
+    join_mode: str = "all",
+    sort_by: str = "",
+    sort_direction: str = "asc",
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate an advanced search against the local mirror.
+
+    Args:
+        mirror: A synced library mirror.
+        conditions: The conditions of the search.
+        join_mode: 'all' to require every condition, 'any' for at least one.
+        sort_by: Field to sort by (empty for most recently modified first).
+        sort_direction: 'asc' or 'desc'.
+        limit: Maximum number of results.
+
+    Returns:
+        Matching non-trashed items, in the shape the Web API returns them.
+
+    Raises:
+        SearchConditionError: If a condition cannot be evaluated.
+    """
+    where, params = compile_conditions(conditions, join_mode)
+    return mirror.query_items(
+        where, params, order_by=compile_sort(sort_by, sort_direction), limit=limit
+    )
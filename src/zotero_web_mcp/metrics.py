@@ -0,0 +1,363 @@
+"""
+Built-in instrumentation of tool calls, upstream requests and conversions.
+
+Every tool call is timed and charged with the Web API requests and response
+bytes it caused (see count_upstream_requests()); slow operations outside the
+request path, such as markitdown conversions and pdfannots2json runs, are
+timed by name. Values go into fixed-bucket histograms like Prometheus', so
+recording is cheap and memory stays constant however long the server runs.
+
+Metrics can be read as a JSON summary (the ``zotero://metrics`` resource) or
+in the Prometheus text format (``/metrics`` on the HTTP transports). Values
+owned by other components, such as cache hit ratios, are added at read time
+by collectors.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+REQUEST_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+BYTES_BUCKETS = tuple(1024 * 4**i for i in range(10))  # 1 KiB to 256 MiB
+
+# Quantiles included in the JSON summary
+SUMMARY_QUANTILES = (0.5, 0.95, 0.99)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Counts of observed values per bucket, with their sum."""
+
+    def __init__(self, buckets: Iterable[float]):
+        """
+        Create an empty histogram.
+
+        Args:
+            buckets: Upper bounds of the buckets; an unbounded bucket is added.
+        """
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, observations at or below it) per bucket, +Inf last."""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation within its bucket.
+
+        Returns:
+            The estimate, within the smallest and largest observed values, or
+            None without observations.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower, previous = 0.0, 0
+        estimate = self.max
+        for bound, total in self.cumulative():
+            if total >= rank and total > previous:
+                if not math.isinf(bound):
+                    in_bucket = total - previous
+                    estimate = lower + (bound - lower) * (rank - previous) / in_bucket
+                break
+            lower, previous = bound, total
+        return min(max(estimate, self.min), self.max)
+
+    def summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "max": self.max if self.count else None,
+        }
+        for q in SUMMARY_QUANTILES:
+            summary[f"p{q * 100:g}"] = self.quantile(q)
+        return summary
+
+
+@dataclass
+class MetricFamily:
+    """A metric with its samples, as reported by a collector."""
+
+    name: str
+    type: str  # "counter" or "gauge"
+    help: str
+    # (labels, value) pairs
+    samples: List[Tuple[Dict[str, str], float]] = field(default_factory=list)
+
+
+@dataclass
+class _ToolMetrics:
+    calls: int = 0
+    errors: int = 0
+    coalesced: int = 0
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    requests: Histogram = field(default_factory=lambda: Histogram(REQUEST_BUCKETS))
+    bytes: Histogram = field(default_factory=lambda: Histogram(BYTES_BUCKETS))
+
+
+@dataclass
+class _OperationMetrics:
+    errors: int = 0
+    duration: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+
+
+class Metrics:
+    """Process-wide registry of tool and operation metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolMetrics] = {}
+        self._operations: Dict[str, _OperationMetrics] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self.started = time.time()
+
+    def observe_tool_call(
+        self,
+        tool: str,
+        seconds: float,
+        failed: bool = False,
+        requests: int = 0,
+        coalesced: int = 0,
+        response_bytes: int = 0,
+    ) -> None:
+        """
+        Record a finished tool call.
+
+        Args:
+            tool: Tool name.
+            seconds: Wall time of the call.
+            failed: Whether the call raised or returned an error.
+            requests: Web API requests sent during the call.
+            coalesced: Requests answered by an identical one in flight.
+            response_bytes: Response bytes received from the Web API.
+        """
+        with self._lock:
+            metrics = self._tools.setdefault(tool, _ToolMetrics())
+            metrics.calls += 1
+            metrics.errors += int(failed)
+            metrics.coalesced += coalesced
+            metrics.latency.observe(seconds)
+            metrics.requests.observe(requests)
+            metrics.bytes.observe(response_bytes)
+
+    def observe_operation(
+        self, operation: str, seconds: float, failed: bool = False
+    ) -> None:
+        """
+        Record a finished operation, e.g. a conversion or a subprocess run.
+
+        Args:
+            operation: Operation name.
+            seconds: Wall time of the operation.
+            failed: Whether the operation raised.
+        """
+        with self._lock:
+            metrics = self._operations.setdefault(operation, _OperationMetrics())
+            metrics.errors += int(failed)
+            metrics.duration.observe(seconds)
+
+    @contextmanager
+    def time_operation(self, operation: str) -> Iterator[None]:
+        """Record the duration of the ``with`` block; exceptions count as failures."""
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.observe_operation(operation, time.perf_counter() - started, failed)
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """
+        Add metrics computed at read time.
+
+        Args:
+            collector: Returns the current metric families; failures are
+                ignored so that one broken collector cannot hide the rest.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collected(self) -> List[MetricFamily]:
+        with self._lock:
+            collectors = list(self._collectors)
+        families = []
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception:
+                pass
+        return families
+
+    def summary(self) -> Dict[str, Any]:
+        """All metrics as a JSON-serializable dict."""
+        with self._lock:
+            tools = {
+                name: {
+                    "calls": m.calls,
+                    "errors": m.errors,
+                    "latency_seconds": m.latency.summary(),
+                    "upstream_requests": m.requests.summary(),
+                    "coalesced_requests": m.coalesced,
+                    "upstream_bytes": m.bytes.summary(),
+                }
+                for name, m in sorted(self._tools.items())
+            }
+            operations = {
+                name: {"errors": m.errors, "duration_seconds": m.duration.summary()}
+                for name, m in sorted(self._operations.items())
+            }
+        other: Dict[str, Any] = {}
+        for family in self.collected():
+            if len(family.samples) == 1 and not family.samples[0][0]:
+                other[family.name] = family.samples[0][1]
+            else:
+                other[family.name] = [
+                    {**labels, "value": value} for labels, value in family.samples
+                ]
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "tools": tools,
+            "operations": operations,
+            "other": other,
+        }
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            _header(lines, "zotero_tool_calls_total", "counter", "Tool calls.")
+            for name, m in sorted(self._tools.items()):
+                _sample(lines, "zotero_tool_calls_total", {"tool": name}, m.calls)
+            _header(
+                lines,
+                "zotero_tool_errors_total",
+                "counter",
+                "Tool calls that raised or returned an error.",
+            )
+            for name, m in sorted(self._tools.items()):
+                _sample(lines, "zotero_tool_errors_total", {"tool": name}, m.errors)
+            _header(
+                lines,
+                "zotero_tool_coalesced_requests_total",
+                "counter",
+                "Web API requests of tool calls answered by an identical "
+                "request in flight.",
+            )
+            for name, m in sorted(self._tools.items()):
+                _sample(
+                    lines,
+                    "zotero_tool_coalesced_requests_total",
+                    {"tool": name},
+                    m.coalesced,
+                )
+            for metric, attr, help_text in (
+                ("zotero_tool_duration_seconds", "latency", "Tool call latency."),
+                (
+                    "zotero_tool_upstream_requests",
+                    "requests",
+                    "Web API requests sent per tool call.",
+                ),
+                (
+                    "zotero_tool_upstream_bytes",
+                    "bytes",
+                    "Web API response bytes received per tool call.",
+                ),
+            ):
+                _header(lines, metric, "histogram", help_text)
+                for name, m in sorted(self._tools.items()):
+                    _histogram(lines, metric, {"tool": name}, getattr(m, attr))
+            _header(
+                lines,
+                "zotero_operation_duration_seconds",
+                "histogram",
+                "Duration of conversions and subprocess runs.",
+            )
+            for name, m in sorted(self._operations.items()):
+                _histogram(
+                    lines,
+                    "zotero_operation_duration_seconds",
+                    {"operation": name},
+                    m.duration,
+                )
+            _header(
+                lines,
+                "zotero_operation_errors_total",
+                "counter",
+                "Conversions and subprocess runs that failed.",
+            )
+            for name, m in sorted(self._operations.items()):
+                _sample(
+                    lines,
+                    "zotero_operation_errors_total",
+                    {"operation": name},
+                    m.errors,
+                )
+        for family in self.collected():
+            _header(lines, family.name, family.type, family.help)
+            for labels, value in family.samples:
+                _sample(lines, family.name, labels, value)
+        return "\n".join(lines) + "\n"
+
+
+def _header(lines: List[str], name: str, type_: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {type_}")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _sample(lines: List[str], name: str, labels: Dict[str, str], value: float) -> None:
+    if labels:
+        escaped = (
+            str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            for v in labels.values()
+        )
+        label_text = ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped))
+        name = f"{name}{{{label_text}}}"
+    lines.append(f"{name} {_format_value(value)}")
+
+
+def _histogram(
+    lines: List[str], name: str, labels: Dict[str, str], histogram: Histogram
+) -> None:
+    for bound, total in histogram.cumulative():
+        _sample(lines, f"{name}_bucket", {**labels, "le": _format_value(bound)}, total)
+    _sample(lines, f"{name}_sum", labels, histogram.sum)
+    _sample(lines, f"{name}_count", labels, histogram.count)
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """The metrics registry of the process."""
+    return _metrics
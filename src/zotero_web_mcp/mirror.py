@@ -0,0 +1,1037 @@
+"""
+Local SQLite mirror of a Zotero library, kept current with version-based sync.
+
+The mirror stores items, collections and saved searches exactly as the Web API
+returns them, so read tools can answer from disk instead of making a round trip
+for every call. Sync follows the Zotero sync protocol: every object newer than
+the last seen library version is fetched with ``since=<version>``, deletions are
+read from the ``/deleted`` endpoint, and the ``Last-Modified-Version`` header of
+the responses becomes the new high-water mark. Every request after the first is
+sent with ``If-Unmodified-Since-Version`` set to that mark, so a library that
+changes during a sync fails it with 412 and the sync starts over, instead of
+mixing objects from two versions. With a LibraryVersionValidator,
+a sync of an unchanged library is skipped after a single version probe.
+
+Titles, abstracts, notes and attachment full text are also kept in an FTS5
+index, so the whole library body text can be searched locally with BM25
+ranking. Attachment content is pulled separately from ``/fulltext?since=``,
+since it needs one request per changed attachment: a search indexes a small
+batch itself and leaves the rest to a background thread, so the first search
+of a large library answers from a partial index instead of waiting for all of
+it. Mirror syncs and background indexing send their requests at background
+priority, so they yield to interactive tool calls when the rate limiter is
+busy.
+"""
+
+import html
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
+
+from zotero_web_mcp.library_version import LibraryVersionValidator
+from zotero_web_mcp.pagination import fetch_all_pages
+from zotero_web_mcp.rate_limit import background_requests
+
+if TYPE_CHECKING:
+    from pyzotero import zotero
+
+# Bump whenever the schema changes; older mirrors are rebuilt from scratch.
+SCHEMA_VERSION = 3
+
+# Page size used when pulling changed objects from the Web API.
+SYNC_PAGE_SIZE = 100
+
+# Times a sync starts over after the library changed underneath it.
+MAX_SYNC_RESTARTS = 3
+
+# Attachments whose full text is fetched per batch of background indexing;
+# each batch leases a client only for its own requests.
+FULLTEXT_BATCH_SIZE = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    key TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    item_type TEXT,
+    parent_item TEXT,
+    date_added TEXT,
+    date_modified TEXT,
+    -- Sortable 'YYYY[-MM[-DD]]' form of the item's date field
+    date TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    title_text TEXT,
+    all_text TEXT,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_parent ON items (parent_item);
+CREATE INDEX IF NOT EXISTS items_type ON items (item_type);
+CREATE INDEX IF NOT EXISTS items_date_added ON items (date_added);
+CREATE INDEX IF NOT EXISTS items_date_modified ON items (date_modified);
+CREATE INDEX IF NOT EXISTS items_date ON items (date);
+CREATE TABLE IF NOT EXISTS item_tags (
+    item_key TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    type INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS item_tags_key ON item_tags (item_key);
+CREATE INDEX IF NOT EXISTS item_tags_tag ON item_tags (tag);
+CREATE INDEX IF NOT EXISTS item_tags_tag_nocase ON item_tags (tag COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS item_creators (
+    item_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    creator_type TEXT,
+    -- 'First Last' for two-field creators, the single name otherwise
+    name TEXT COLLATE NOCASE,
+    last_name TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS item_creators_key ON item_creators (item_key);
+CREATE INDEX IF NOT EXISTS item_creators_name ON item_creators (name);
+CREATE INDEX IF NOT EXISTS item_creators_last_name ON item_creators (last_name);
+CREATE TABLE IF NOT EXISTS item_collections (
+    item_key TEXT NOT NULL,
+    collection_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS item_collections_key ON item_collections (item_key);
+CREATE INDEX IF NOT EXISTS item_collections_coll ON item_collections (collection_key);
+CREATE TABLE IF NOT EXISTS collections (
+    key TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    parent_collection TEXT,
+    name TEXT,
+    json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS searches (
+    key TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    name TEXT,
+    json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS search_docs (
+    id INTEGER PRIMARY KEY,
+    item_key TEXT NOT NULL,
+    source TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (item_key, source)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5 (
+    title,
+    body,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+# Relative BM25 weights of the title and body columns of the search index
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+# Item types that are never indexed as metadata documents
+_CHILD_ITEM_TYPES = ("attachment", "note", "annotation")
+
+
+@dataclass
+class SyncResult:
+    """Summary of a single mirror sync."""
+
+    library_version: int
+    previous_version: int
+    items_updated: int = 0
+    collections_updated: int = 0
+    searches_updated: int = 0
+    objects_deleted: int = 0
+    duration: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return self.library_version != self.previous_version
+
+
+@dataclass
+class SearchHit:
+    """A top-level item matched by a full-text search."""
+
+    item_key: str
+    score: float
+    # The document that matched: the item itself, one of its notes or the
+    # full text of one of its attachments
+    matched_key: str
+    source: str
+    snippet: str
+
+
+def _title_text(data: Dict[str, Any]) -> str:
+    """Text matched by Zotero's ``titleCreatorYear`` quick search mode."""
+    parts = [data.get("title", ""), data.get("date", "")[:4]]
+    for creator in data.get("creators", []):
+        parts.extend(
+            [
+                creator.get("firstName", ""),
+                creator.get("lastName", ""),
+                creator.get("name", ""),
+            ]
+        )
+    return " ".join(p for p in parts if p).lower()
+
+
+def _all_text(data: Dict[str, Any]) -> str:
+    """Text matched by Zotero's ``everything`` quick search mode."""
+    parts = [_title_text(data)]
+    for field, value in data.items():
+        if isinstance(value, str) and field not in ("key", "parentItem", "itemType"):
+            parts.append(value)
+    parts.extend(tag["tag"] for tag in data.get("tags", []))
+    return " ".join(parts).lower()
+
+
+def _sortable_date(data: Dict[str, Any], meta: Dict[str, Any]) -> str:
+    """'YYYY[-MM[-DD]]' from the API's parsedDate, else the year of the date field."""
+    if parsed := meta.get("parsedDate"):
+        return str(parsed)
+    match = re.search(r"\b(\d{4})\b", data.get("date", ""))
+    return match.group(1) if match else ""
+
+
+def _html_text(note: str) -> str:
+    """Plain text of a Zotero note's HTML."""
+    return html.unescape(re.sub(r"<[^>]+>", " ", note))
+
+
+def _match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query that requires every word."""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def _split_alternatives(condition: str) -> List[str]:
+    """Split a ``a || b`` style condition into its alternatives."""
+    return [part.strip() for part in condition.split("||") if part.strip()]
+
+
+class LibraryMirror:
+    """SQLite-backed copy of a single Zotero library."""
+
+    def __init__(self, path: str, library_id: str, library_type: str = "user"):
+        """
+        Open (or create) a mirror database.
+
+        Args:
+            path: Path of the SQLite database file.
+            library_id: Zotero library ID the mirror belongs to.
+            library_type: Zotero library type ('user' or 'group').
+        """
+        self.path = path
+        self.library_id = str(library_id)
+        self.library_type = library_type
+        self.last_sync: Optional[float] = None
+        self.last_fulltext_sync: Optional[float] = None
+        # Attachments left to index after the last full-text run (None before
+        # the first run)
+        self.fulltext_pending: Optional[int] = None
+
+        # One connection shared by all threads; every access goes through _lock.
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        # Full-text indexing takes long and must not hold up item syncs
+        self._fulltext_lock = threading.Lock()
+        self._indexer: Optional[threading.Thread] = None
+        self._indexer_lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._lock, self._conn:
+            current = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            owner = None
+            if current == SCHEMA_VERSION:
+                row = self._conn.execute(
+                    "SELECT value FROM meta WHERE name = 'library'"
+                ).fetchone()
+                owner = row[0] if row else None
+            library = f"{self.library_type}:{self.library_id}"
+            if current != SCHEMA_VERSION or (owner and owner != library):
+                # Stale schema or a different library: start over
+                for table in (
+                    "meta",
+                    "items",
+                    "item_tags",
+                    "item_creators",
+                    "item_collections",
+                    "collections",
+                    "searches",
+                    "search_docs",
+                    "search_index",
+                ):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('library', ?)",
+                (library,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    @property
+    def library_version(self) -> int:
+        """The library version the mirror is current with (0 if never synced)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE name = 'library_version'"
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def is_stale(self, max_age: float) -> bool:
+        """Whether the last sync in this process is older than ``max_age`` seconds."""
+        if self.last_sync is None:
+            return True
+        return time.monotonic() - self.last_sync > max_age
+
+    def invalidate(self) -> None:
+        """Force the next ensure_synced() call to sync, e.g. after a write."""
+        self.last_sync = None
+        self.last_fulltext_sync = None
+
+    def ensure_synced(
+        self,
+        zot: "zotero.Zotero",
+        max_age: float,
+        validator: Optional[LibraryVersionValidator] = None,
+    ) -> Optional[SyncResult]:
+        """
+        Sync the mirror if it has not been synced within ``max_age`` seconds.
+
+        Args:
+            zot: A Zotero client for the mirrored library.
+            max_age: Maximum age of the last sync, in seconds.
+            validator: Version validator of the library. When it reports the
+                version the mirror already has, the mirror is marked fresh
+                without the four requests of an empty sync.
+
+        Returns:
+            The SyncResult if a sync was performed, None otherwise.
+        """
+        if not self.is_stale(max_age):
+            return None
+        with self._sync_lock:
+            # Another caller may have synced while we waited for the lock
+            if not self.is_stale(max_age):
+                return None
+            with background_requests():
+                version = self.library_version
+                if validator is not None and version:
+                    if validator.validate(zot) == version:
+                        self.last_sync = time.monotonic()
+                        return None
+                return self._sync(zot)
+
+    def sync(self, zot: "zotero.Zotero") -> SyncResult:
+        """
+        Pull every change made since the last sync.
+
+        Args:
+            zot: A Zotero client for the mirrored library.
+
+        Returns:
+            A SyncResult describing what changed.
+        """
+        with self._sync_lock, background_requests():
+            return self._sync(zot)
+
+    def _sync(self, zot: "zotero.Zotero") -> SyncResult:
+        started = time.monotonic()
+        for attempt in range(MAX_SYNC_RESTARTS + 1):
+            try:
+                result = self._sync_once(zot)
+                break
+            except httpx.HTTPStatusError as e:
+                # The library changed since the version this sync pinned
+                if e.response.status_code != 412 or attempt == MAX_SYNC_RESTARTS:
+                    raise
+        result.duration = time.monotonic() - started
+        return result
+
+    def _sync_once(self, zot: "zotero.Zotero") -> SyncResult:
+        since = self.library_version
+        result = SyncResult(library_version=since, previous_version=since)
+
+        collections = fetch_all_pages(
+            zot,
+            "/collections",
+            since=since,
+            page_size=SYNC_PAGE_SIZE,
+            pin_version=True,
+        )
+        # The first response pins the version we are syncing up to
+        new_version = self._response_version(zot, since)
+        pinned = {"If-Unmodified-Since-Version": str(new_version)}
+
+        searches = fetch_all_pages(zot, "/searches", since=since, headers=pinned)
+        items = fetch_all_pages(
+            zot,
+            "/items",
+            since=since,
+            includeTrashed=1,
+            page_size=SYNC_PAGE_SIZE,
+            headers=pinned,
+        )
+        deleted: Dict[str, List[str]] = {}
+        if since:
+            response = zot.client.get(
+                f"{zot.endpoint}/{zot.library_type}/{zot.library_id}/deleted",
+                params={"since": since},
+                headers=pinned,
+            )
+            response.raise_for_status()
+            deleted = response.json()
+
+        with self._lock, self._conn:
+            for collection in collections:
+                self._store_collection(collection)
+            for search in searches:
+                self._store_search(search)
+            for item in items:
+                self._store_item(item)
+            result.objects_deleted = self._apply_deletions(deleted)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('library_version', ?)",
+                (str(new_version),),
+            )
+
+        result.library_version = new_version
+        result.items_updated = len(items)
+        result.collections_updated = len(collections)
+        result.searches_updated = len(searches)
+        self.last_sync = time.monotonic()
+        return result
+
+    @staticmethod
+    def _response_version(zot: "zotero.Zotero", default: int) -> int:
+        request = getattr(zot, "request", None)
+        if request is None:
+            return default
+        return int(request.headers.get("Last-Modified-Version", default))
+
+    def _store_item(self, item: Dict[str, Any]) -> None:
+        data = item.get("data", {})
+        key = item.get("key") or data.get("key")
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO items (
+                key, version, item_type, parent_item, date_added, date_modified,
+                date, deleted, title_text, all_text, json
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key,
+                item.get("version", data.get("version", 0)),
+                data.get("itemType"),
+                data.get("parentItem") or None,
+                data.get("dateAdded"),
+                data.get("dateModified"),
+                _sortable_date(data, item.get("meta", {})),
+                1 if data.get("deleted") else 0,
+                _title_text(data),
+                _all_text(data),
+                json.dumps(item),
+            ),
+        )
+        self._conn.execute("DELETE FROM item_tags WHERE item_key = ?", (key,))
+        self._conn.executemany(
+            "INSERT INTO item_tags (item_key, tag, type) VALUES (?, ?, ?)",
+            [(key, t["tag"], t.get("type", 0)) for t in data.get("tags", [])],
+        )
+        self._conn.execute("DELETE FROM item_collections WHERE item_key = ?", (key,))
+        self._conn.executemany(
+            "INSERT INTO item_collections (item_key, collection_key) VALUES (?, ?)",
+            [(key, c) for c in data.get("collections", [])],
+        )
+        self._conn.execute("DELETE FROM item_creators WHERE item_key = ?", (key,))
+        self._conn.executemany(
+            "INSERT INTO item_creators"
+            " (item_key, position, creator_type, name, last_name) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    key,
+                    position,
+                    creator.get("creatorType"),
+                    creator.get("name")
+                    or " ".join(
+                        p
+                        for p in (creator.get("firstName"), creator.get("lastName"))
+                        if p
+                    ),
+                    creator.get("lastName") or creator.get("name"),
+                )
+                for position, creator in enumerate(data.get("creators", []))
+            ],
+        )
+
+        item_type = data.get("itemType")
+        if item_type == "note":
+            self._index_document(key, "note", "", _html_text(data.get("note", "")))
+        elif item_type not in _CHILD_ITEM_TYPES:
+            self._index_document(
+                key, "metadata", data.get("title", ""), data.get("abstractNote", "")
+            )
+
+    def _index_document(
+        self, key: str, source: str, title: str, body: str, version: int = 0
+    ) -> None:
+        row = self._conn.execute(
+            "SELECT id FROM search_docs WHERE item_key = ? AND source = ?",
+            (key, source),
+        ).fetchone()
+        if row is None:
+            doc_id = self._conn.execute(
+                "INSERT INTO search_docs (item_key, source, version) VALUES (?, ?, ?)",
+                (key, source, version),
+            ).lastrowid
+        else:
+            doc_id = row[0]
+            self._conn.execute(
+                "UPDATE search_docs SET version = ? WHERE id = ?", (version, doc_id)
+            )
+            self._conn.execute("DELETE FROM search_index WHERE rowid = ?", (doc_id,))
+        self._conn.execute(
+            "INSERT INTO search_index (rowid, title, body) VALUES (?, ?, ?)",
+            (doc_id, title, body),
+        )
+
+    def _unindex_item(self, key: str) -> None:
+        for row in self._conn.execute(
+            "SELECT id FROM search_docs WHERE item_key = ?", (key,)
+        ).fetchall():
+            self._conn.execute("DELETE FROM search_index WHERE rowid = ?", (row[0],))
+        self._conn.execute("DELETE FROM search_docs WHERE item_key = ?", (key,))
+
+    def _store_collection(self, collection: Dict[str, Any]) -> None:
+        data = collection.get("data", {})
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO collections (key, version, parent_collection, name, json)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                collection["key"],
+                collection.get("version", data.get("version", 0)),
+                data.get("parentCollection") or None,
+                data.get("name"),
+                json.dumps(collection),
+            ),
+        )
+
+    def _store_search(self, search: Dict[str, Any]) -> None:
+        data = search.get("data", {})
+        self._conn.execute(
+            "INSERT OR REPLACE INTO searches (key, version, name, json) VALUES (?, ?, ?, ?)",
+            (
+                search["key"],
+                search.get("version", data.get("version", 0)),
+                data.get("name"),
+                json.dumps(search),
+            ),
+        )
+
+    def _apply_deletions(self, deleted: Dict[str, List[str]]) -> int:
+        count = 0
+        for key in deleted.get("items", []):
+            self._conn.execute("DELETE FROM items WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM item_tags WHERE item_key = ?", (key,))
+            self._conn.execute("DELETE FROM item_creators WHERE item_key = ?", (key,))
+            self._conn.execute(
+                "DELETE FROM item_collections WHERE item_key = ?", (key,)
+            )
+            self._unindex_item(key)
+            count += 1
+        for key in deleted.get("collections", []):
+            self._conn.execute("DELETE FROM collections WHERE key = ?", (key,))
+            self._conn.execute(
+                "DELETE FROM item_collections WHERE collection_key = ?", (key,)
+            )
+            count += 1
+        for key in deleted.get("searches", []):
+            self._conn.execute("DELETE FROM searches WHERE key = ?", (key,))
+            count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # Full-text sync
+    # ------------------------------------------------------------------
+
+    @property
+    def fulltext_version(self) -> int:
+        """The library version attachment full text is indexed up to."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE name = 'fulltext_version'"
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def ensure_fulltext_synced(
+        self, zot: "zotero.Zotero", max_age: float, max_items: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Index new attachment full text if it was not synced within ``max_age``.
+
+        Never waits for another indexing run: while one is in progress, the
+        index is used as it is.
+
+        Args:
+            zot: A Zotero client for the mirrored library.
+            max_age: Maximum age of the last complete full-text sync, in
+                seconds.
+            max_items: Maximum number of attachments to fetch (None for all);
+                fulltext_pending tells how many are left.
+
+        Returns:
+            The number of attachments indexed, or None if no sync was due or
+            another run is in progress.
+        """
+        if not self._fulltext_is_stale(max_age):
+            return None
+        if not self._fulltext_lock.acquire(blocking=False):
+            return None
+        try:
+            if not self._fulltext_is_stale(max_age):
+                return None
+            return self._sync_fulltext(zot, max_items)
+        finally:
+            self._fulltext_lock.release()
+
+    def sync_fulltext(
+        self, zot: "zotero.Zotero", max_items: Optional[int] = None
+    ) -> int:
+        """
+        Index the content of every attachment whose full text changed.
+
+        The Web API only lists changed attachments in bulk, so each one costs a
+        request; ``max_items`` bounds a single run and the next run continues
+        where it stopped.
+
+        Args:
+            zot: A Zotero client for the mirrored library.
+            max_items: Maximum number of attachments to fetch (None for all).
+
+        Returns:
+            The number of attachments indexed.
+        """
+        with self._fulltext_lock, background_requests():
+            return self._sync_fulltext(zot, max_items)
+
+    @property
+    def fulltext_indexing(self) -> bool:
+        """Whether background full-text indexing is running."""
+        with self._indexer_lock:
+            return self._indexer is not None and self._indexer.is_alive()
+
+    def start_fulltext_indexing(
+        self,
+        lease: Callable[[], ContextManager["zotero.Zotero"]],
+        batch_size: int = FULLTEXT_BATCH_SIZE,
+    ) -> bool:
+        """
+        Index the remaining attachment full text in a daemon thread.
+
+        Args:
+            lease: Returns a context manager that leases a Zotero client for
+                the library; a client is leased per batch, not for the whole
+                run.
+            batch_size: Attachments fetched per batch.
+
+        Returns:
+            Whether a thread was started (False if one is already running).
+        """
+        with self._indexer_lock:
+            if self._indexer is not None and self._indexer.is_alive():
+                return False
+            self._indexer = threading.Thread(
+                target=self._index_remaining,
+                args=(lease, batch_size),
+                name="zotero-fulltext-index",
+                daemon=True,
+            )
+            self._indexer.start()
+            return True
+
+    def _index_remaining(
+        self, lease: Callable[[], ContextManager["zotero.Zotero"]], batch_size: int
+    ) -> None:
+        while self.fulltext_pending != 0:
+            try:
+                with lease() as zot:
+                    self.sync_fulltext(zot, max_items=batch_size)
+            except Exception:
+                # The next search resumes where this run stopped
+                return
+
+    def _fulltext_is_stale(self, max_age: float) -> bool:
+        if self.last_fulltext_sync is None:
+            return True
+        return time.monotonic() - self.last_fulltext_sync > max_age
+
+    def _sync_fulltext(
+        self, zot: "zotero.Zotero", max_items: Optional[int] = None
+    ) -> int:
+        since = self.fulltext_version
+        # new_fulltext() drops the response, and with it Last-Modified-Version
+        response = zot._retrieve_data(
+            f"/{zot.library_type}/{zot.library_id}/fulltext", params={"since": since}
+        )
+        new_version = self._response_version(zot, since)
+        # Oldest first, so the high-water mark only moves past finished versions
+        pending = sorted(response.json().items(), key=lambda kv: (kv[1], kv[0]))
+
+        # Attachments indexed by an earlier, capped run are not fetched again,
+        # even where the high-water mark could not move past their version
+        with self._lock:
+            indexed_versions = dict(
+                self._conn.execute(
+                    "SELECT item_key, version FROM search_docs"
+                    " WHERE source = 'fulltext'"
+                ).fetchall()
+            )
+
+        from pyzotero import zotero_errors
+
+        indexed = fetched = remaining = 0
+        for i, (key, version) in enumerate(pending):
+            if indexed_versions.get(key, -1) < version:
+                if max_items is not None and fetched >= max_items:
+                    remaining = sum(
+                        1 for k, v in pending[i:] if indexed_versions.get(k, -1) < v
+                    )
+                    break
+                fetched += 1
+                try:
+                    content = zot.fulltext_item(key).get("content", "")
+                except zotero_errors.ResourceNotFoundError:
+                    content = ""
+            else:
+                content = None
+
+            with self._lock, self._conn:
+                # Empty documents are kept too, so they are not fetched again
+                if content is not None:
+                    self._index_document(key, "fulltext", "", content, version)
+                    indexed += bool(content)
+                if i + 1 == len(pending):
+                    done_version = new_version
+                elif pending[i + 1][1] != version:
+                    done_version = version
+                else:
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value)"
+                    " VALUES ('fulltext_version', ?)",
+                    (str(done_version),),
+                )
+
+        if not pending:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value)"
+                    " VALUES ('fulltext_version', ?)",
+                    (str(new_version),),
+                )
+        self.fulltext_pending = remaining
+        if not remaining:
+            self.last_fulltext_sync = time.monotonic()
+        return indexed
+
+    # ------------------------------------------------------------------
+    # Queries - results have the same shape as the Web API responses
+    # ------------------------------------------------------------------
+
+    def _fetch_json(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(sql, tuple(params)).fetchall()
+        return [json.loads(row["json"]) for row in rows]
+
+    @staticmethod
+    def _item_type_clause(item_type: Optional[str]) -> Tuple[str, List[Any]]:
+        if not item_type:
+            return "", []
+        if item_type.startswith("-"):
+            return " AND items.item_type IS NOT ?", [item_type[1:]]
+        alternatives = _split_alternatives(item_type)
+        placeholders = ", ".join("?" for _ in alternatives)
+        return f" AND items.item_type IN ({placeholders})", alternatives
+
+    @staticmethod
+    def _tag_clause(tags: Optional[List[str]]) -> Tuple[str, List[Any]]:
+        sql, params = "", []
+        for condition in tags or []:
+            condition = condition.strip()
+            if not condition:
+                continue
+            if condition.startswith("-"):
+                sql += (
+                    " AND NOT EXISTS (SELECT 1 FROM item_tags t"
+                    " WHERE t.item_key = items.key AND t.tag = ?)"
+                )
+                params.append(condition[1:])
+            else:
+                alternatives = _split_alternatives(condition)
+                placeholders = ", ".join("?" for _ in alternatives)
+                sql += (
+                    " AND EXISTS (SELECT 1 FROM item_tags t"
+                    f" WHERE t.item_key = items.key AND t.tag IN ({placeholders}))"
+                )
+                params.extend(alternatives)
+        return sql, params
+
+    @staticmethod
+    def _limit_clause(limit: Optional[int]) -> Tuple[str, List[Any]]:
+        if not limit or limit < 0:
+            return "", []
+        return " LIMIT ?", [limit]
+
+    def item(self, item_key: str) -> Optional[Dict[str, Any]]:
+        """Return a single item by key, or None if it is not mirrored."""
+        results = self._fetch_json(
+            "SELECT json FROM items WHERE key = ?", (item_key.upper(),)
+        )
+        return results[0] if results else None
+
+    def items_by_keys(self, item_keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the mirrored items among ``item_keys``, keyed by item key."""
+        keys = list({k.upper() for k in item_keys})
+        found: Dict[str, Dict[str, Any]] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            for item in self._fetch_json(
+                f"SELECT json FROM items WHERE key IN ({placeholders})", chunk
+            ):
+                found[item["key"]] = item
+        return found
+
+    def search_items(
+        self,
+        query: str = "",
+        qmode: str = "titleCreatorYear",
+        item_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search mirrored items with the same semantics as the Web API ``q`` parameter.
+
+        Args:
+            query: Quick search string; every word must match.
+            qmode: 'titleCreatorYear' or 'everything'.
+            item_type: Item type filter ('book', '-attachment', 'book || note').
+            tags: Tag conditions, ANDed; each supports '||' and '-' prefixes.
+            limit: Maximum number of results.
+
+        Returns:
+            Matching items, most recently modified first.
+        """
+        column = "all_text" if qmode == "everything" else "title_text"
+        sql = "SELECT json FROM items WHERE items.deleted = 0"
+        params: List[Any] = []
+        for word in query.lower().split():
+            sql += f" AND instr(items.{column}, ?) > 0"
+            params.append(word)
+        type_sql, type_params = self._item_type_clause(item_type)
+        tag_sql, tag_params = self._tag_clause(tags)
+        limit_sql, limit_params = self._limit_clause(limit)
+        sql += type_sql + tag_sql + " ORDER BY items.date_modified DESC" + limit_sql
+        return self._fetch_json(sql, params + type_params + tag_params + limit_params)
+
+    def query_items(
+        self,
+        where: str,
+        params: Iterable[Any] = (),
+        order_by: str = "items.date_modified DESC",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the non-trashed items matching a compiled predicate.
+
+        Args:
+            where: SQL predicate over the ``items`` table, e.g. from
+                local_search.compile_conditions(); values must be bound.
+            params: Parameters of the predicate.
+            order_by: ORDER BY expression over ``items``.
+            limit: Maximum number of results.
+
+        Returns:
+            Matching items.
+        """
+        limit_sql, limit_params = self._limit_clause(limit)
+        return self._fetch_json(
+            f"SELECT json FROM items WHERE items.deleted = 0 AND ({where})"
+            f" ORDER BY {order_by}" + limit_sql,
+            list(params) + limit_params,
+        )
+
+    def recent_items(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the most recently added items."""
+        limit_sql, limit_params = self._limit_clause(limit)
+        return self._fetch_json(
+            "SELECT json FROM items WHERE deleted = 0 ORDER BY date_added DESC"
+            + limit_sql,
+            limit_params,
+        )
+
+    def children(self, item_key: str) -> List[Dict[str, Any]]:
+        """Return the child items (attachments, notes, annotations) of an item."""
+        return self._fetch_json(
+            "SELECT json FROM items WHERE parent_item = ? AND deleted = 0"
+            " ORDER BY date_added",
+            (item_key.upper(),),
+        )
+
+    def notes(
+        self, parent_key: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Return notes, optionally restricted to one parent item."""
+        sql = "SELECT json FROM items WHERE item_type = 'note' AND deleted = 0"
+        params: List[Any] = []
+        if parent_key:
+            sql += " AND parent_item = ?"
+            params.append(parent_key.upper())
+        limit_sql, limit_params = self._limit_clause(limit)
+        sql += " ORDER BY date_modified DESC" + limit_sql
+        return self._fetch_json(sql, params + limit_params)
+
+    def collection(self, collection_key: str) -> Optional[Dict[str, Any]]:
+        """Return a single collection by key, or None if it is not mirrored."""
+        results = self._fetch_json(
+            "SELECT json FROM collections WHERE key = ?", (collection_key.upper(),)
+        )
+        return results[0] if results else None
+
+    def collections(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return all collections."""
+        limit_sql, limit_params = self._limit_clause(limit)
+        return self._fetch_json(
+            "SELECT json FROM collections ORDER BY name" + limit_sql, limit_params
+        )
+
+    def collection_items(
+        self, collection_key: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the items filed in a collection."""
+        limit_sql, limit_params = self._limit_clause(limit)
+        return self._fetch_json(
+            "SELECT items.json FROM items"
+            " JOIN item_collections c ON c.item_key = items.key"
+            " WHERE c.collection_key = ? AND items.deleted = 0"
+            " ORDER BY items.date_modified DESC" + limit_sql,
+            [collection_key.upper()] + limit_params,
+        )
+
+    def tags(self, limit: Optional[int] = None) -> List[str]:
+        """Return every distinct tag used by a non-trashed item."""
+        limit_sql, limit_params = self._limit_clause(limit)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT t.tag FROM item_tags t"
+                " JOIN items ON items.key = t.item_key"
+                " WHERE items.deleted = 0 ORDER BY t.tag" + limit_sql,
+                limit_params,
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def searches(self) -> List[Dict[str, Any]]:
+        """Return all saved searches."""
+        return self._fetch_json("SELECT json FROM searches ORDER BY name")
+
+    def search_fulltext(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """
+        Rank items by BM25 over titles, abstracts, notes and attachment text.
+
+        Notes and attachments count towards their parent item, which is ranked
+        by its best-matching document.
+
+        Args:
+            query: Free-text query; every word must match (with stemming).
+            limit: Maximum number of items to return.
+
+        Returns:
+            Matching top-level items, best match first.
+        """
+        expression = _match_expression(query)
+        if not expression:
+            return []
+
+        hits: Dict[str, SearchHit] = {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT d.item_key, d.source,
+                       COALESCE(items.parent_item, d.item_key) AS top_key,
+                       bm25(search_index, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score,
+                       snippet(search_index, -1, '**', '**', '...', 24) AS snippet
+                FROM search_index
+                JOIN search_docs d ON d.id = search_index.rowid
+                LEFT JOIN items ON items.key = d.item_key
+                WHERE search_index MATCH ? AND COALESCE(items.deleted, 0) = 0
+                ORDER BY score
+                """,
+                (expression,),
+            )
+            for row in rows:
+                if row["top_key"] in hits:
+                    continue
+                hits[row["top_key"]] = SearchHit(
+                    item_key=row["top_key"],
+                    # bm25() is lower-is-better; report higher-is-better
+                    score=-row["score"],
+                    matched_key=row["item_key"],
+                    source=row["source"],
+                    snippet=row["snippet"],
+                )
+                if len(hits) >= limit:
+                    break
+        return list(hits.values())
+
+
+def default_cache_dir() -> str:
+    """Directory for local caches (ZOTERO_CACHE_DIR)."""
+    return os.getenv("ZOTERO_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "zotero-web-mcp"
+    )
+
+
+def default_mirror_path(library_id: str, library_type: str = "user") -> str:
+    """Default location of the mirror database for a library."""
+    return os.path.join(
+        default_cache_dir(), f"mirror-{library_type}-{library_id}.sqlite3"
+    )
@@ -8,7 +8,9 @@ import platform
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
+
+from zotero_web_mcp.metrics import get_metrics
 
 # Constants
 PDFANNOTS_VERSION = "1.0.15"
@@ -74,6 +76,56 @@ def extract_annotations_from_pdf(
     image_format: str = "jpg",
     image_dpi: int = 120,
     image_quality: int = 90,
+    text_only: bool = False,
+    backend: str = "auto",
+) -> List[Dict[str, Any]]:
+    """
+    Extract annotations directly from a PDF file
+
+    Two backends return the same record shape: an in-process one built on pypdf
+    and the pdfannots2json binary, which also renders image annotations. With
+    backend="auto" the in-process backend is used whenever images are not
+    needed (or pdfannots2json is not installed yet), and pdfannots2json remains
+    the fallback if pypdf is missing or cannot read the file.
+
+    Args:
+        pdf_path: Path to the PDF file
+        output_dir: Directory to save extracted images (if None, uses a temp dir)
+        image_format: Format for extracted images (jpg, png)
+        image_dpi: DPI for extracted images
+        image_quality: Quality for extracted images (1-100)
+        text_only: Do not render image annotations; their records are still
+            returned, just without an image file
+        backend: "auto", "pypdf" or "pdfannots2json"
+
+    Returns:
+        List of annotation objects
+    """
+    use_pypdf = backend == "pypdf" or (
+        backend == "auto"
+        and is_pypdf_available()
+        and (text_only or not is_pdfannots_installed())
+    )
+    if use_pypdf:
+        try:
+            with get_metrics().time_operation("pypdf_annotations"):
+                return extract_annotations_with_pypdf(pdf_path)
+        except Exception as e:
+            if backend == "pypdf":
+                raise
+            print(f"Error extracting annotations with pypdf, falling back: {e}")
+
+    return extract_annotations_with_pdfannots(
+        pdf_path, output_dir, image_format, image_dpi, image_quality
+    )
+
+
+def extract_annotations_with_pdfannots(
+    pdf_path: Union[str, Path],
+    output_dir: Optional[str] = None,
+    image_format: str = "jpg",
+    image_dpi: int = 120,
+    image_quality: int = 90,
 ) -> List[Dict[str, Any]]:
     """
     Extract annotations directly from a PDF file using pdfannots2json
@@ -119,7 +171,8 @@ def extract_annotations_from_pdf(
 
     try:
         # Run the command and capture JSON output
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        with get_metrics().time_operation("pdfannots2json"):
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         annotations = json.loads(result.stdout)
         print(f"Extracted {len(annotations)} annotations from PDF")
         return annotations
@@ -130,3 +183,169 @@ def extract_annotations_from_pdf(
     except json.JSONDecodeError:
         print("Error parsing JSON output from pdfannots2json")
         return []
+
+
+# ---------------------------------------------------------------------------
+# In-process backend (pypdf)
+# ---------------------------------------------------------------------------
+
+# PDF annotation subtypes and the pdfannots2json type they map to
+_ANNOTATION_TYPES = {
+    "/Highlight": "highlight",
+    "/Underline": "underline",
+    "/Squiggly": "underline",
+    "/StrikeOut": "strike",
+    "/Text": "text",
+    "/FreeText": "text",
+    "/Square": "image",
+    "/Ink": "ink",
+}
+
+# Types that carry no text of their own
+IMAGE_TYPES = ("image", "ink")
+
+# Average glyph width as a fraction of the font size, used to estimate where
+# in a text run a highlight starts and ends
+_GLYPH_WIDTH = 0.5
+
+
+def is_pypdf_available() -> bool:
+    """Check if the pypdf package is installed"""
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _color_hex(color: Any) -> str:
+    """Convert a PDF /C color array (gray, RGB or CMYK) to #rrggbb"""
+    values = [float(v) for v in color or []]
+    if len(values) == 1:
+        values = values * 3
+    elif len(values) == 4:
+        c, m, y, k = values
+        values = [(1 - c) * (1 - k), (1 - m) * (1 - k), (1 - y) * (1 - k)]
+    elif len(values) != 3:
+        return ""
+    return "#" + "".join(f"{round(max(0.0, min(1.0, v)) * 255):02x}" for v in values)
+
+
+def _annotation_boxes(annot: Dict[str, Any]) -> List[Tuple[float, float, float, float]]:
+    """Bounding boxes (x0, y0, x1, y1) of the regions an annotation marks"""
+    quads = [float(v) for v in annot.get("/QuadPoints") or []]
+    boxes = []
+    for i in range(0, len(quads) - 7, 8):
+        xs, ys = quads[i : i + 8 : 2], quads[i + 1 : i + 8 : 2]
+        boxes.append((min(xs), min(ys), max(xs), max(ys)))
+    if not boxes and annot.get("/Rect"):
+        x0, y0, x1, y1 = (float(v) for v in annot["/Rect"])
+        boxes.append((min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)))
+    return boxes
+
+
+def _text_runs(page: Any) -> List[Tuple[str, float, float, float]]:
+    """Text runs of a page as (text, x, baseline y, font height) in page space"""
+    runs = []
+
+    def visit(text, cm, tm, font_dict, font_size):
+        if not text.strip():
+            return
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        scale = abs(tm[3] * cm[3]) or abs(tm[0] * cm[0]) or 1.0
+        runs.append((text, x, y, (font_size or 1.0) * scale))
+
+    page.extract_text(visitor_text=visit)
+    return runs
+
+
+def _marked_text(
+    runs: List[Tuple[str, float, float, float]],
+    boxes: List[Tuple[float, float, float, float]],
+) -> str:
+    """Text under the given boxes, widened to whole words"""
+    parts = []
+    for x0, y0, x1, y1 in boxes:
+        for text, x, y, height in runs:
+            # Compare the middle of the glyphs with the box, with some slack
+            middle = y + height * 0.35
+            slack = max(1.0, (y1 - y0) * 0.2)
+            if not y0 - slack <= middle <= y1 + slack:
+                continue
+            width = len(text) * height * _GLYPH_WIDTH
+            start, end = max(x, x0), min(x + width, x1)
+            if end <= start:
+                continue
+            i = int((start - x) / width * len(text))
+            j = int(round((end - x) / width * len(text)))
+            while i > 0 and not text[i - 1].isspace():
+                i -= 1
+            while j < len(text) and not text[j].isspace():
+                j += 1
+            parts.append(text[i:j])
+    return " ".join(" ".join(parts).split())
+
+
+def extract_annotations_with_pypdf(
+    pdf_path: Union[str, Path],
+) -> List[Dict[str, Any]]:
+    """
+    Extract annotations from a PDF file in-process using pypdf
+
+    Highlighted text is recovered from the page text under each annotation's
+    quad points. Image annotations are returned without a rendered image.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        List of annotation objects in the pdfannots2json format
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(pdf_path))
+    try:
+        labels = reader.page_labels
+    except Exception:
+        labels = []
+
+    annotations = []
+    for page_index, page in enumerate(reader.pages):
+        if "/Annots" not in page:
+            continue
+        runs = None
+        for n, ref in enumerate(page["/Annots"]):
+            annot = ref.get_object()
+            anno_type = _ANNOTATION_TYPES.get(annot.get("/Subtype"))
+            if anno_type is None:
+                continue
+
+            boxes = _annotation_boxes(annot)
+            annotated_text = ""
+            if anno_type in ("highlight", "underline", "strike"):
+                # Only parse the page text if something on it needs it
+                if runs is None:
+                    runs = _text_runs(page)
+                annotated_text = _marked_text(runs, boxes)
+
+            x0, y0 = boxes[0][:2] if boxes else (0.0, 0.0)
+            annotations.append(
+                {
+                    "id": str(annot.get("/NM") or f"{page_index + 1}-{n}"),
+                    "type": anno_type,
+                    "page": page_index + 1,
+                    "pageLabel": (
+                        labels[page_index]
+                        if page_index < len(labels)
+                        else str(page_index + 1)
+                    ),
+                    "annotatedText": annotated_text,
+                    "comment": str(annot.get("/Contents") or ""),
+                    "color": _color_hex(annot.get("/C")),
+                    "date": str(annot.get("/M") or ""),
+                    "x": x0,
+                    "y": y0,
+                }
+            )
+    return annotations
@@ -0,0 +1,270 @@
+"""
+Opt-in profiling of tool calls with cProfile and tracemalloc.
+
+A slow call reported by a user, such as zotero_get_item_fulltext on one
+particular PDF, is hard to reproduce elsewhere. With profiling enabled
+(ZOTERO_PROFILE_DIR or ``serve --profile-dir``), a sample of the tool calls
+is profiled where it runs and written to the directory:
+
+- ``<time>-<tool>-<n>.prof``: cProfile statistics of the event loop thread
+  and of the worker thread that ran the tool body, merged; open them with
+  ``python -m pstats`` or snakeviz.
+- ``<time>-<tool>-<n>.memory.json``: with memory profiling on, the peak of
+  the memory traced by tracemalloc during the call and the allocation sites
+  that grew the most.
+
+cProfile only sees the threads it is enabled in, so tool bodies enable it in
+their worker thread through profile_thread(). Conversions in the worker
+processes of the conversion engine show up as waiting time; set
+ZOTERO_CONVERSION_WORKERS=0 to profile them inline. tracemalloc traces the
+whole process, so calls that overlap share their peak.
+
+Sampling (ZOTERO_PROFILE_SAMPLE_RATE) and a minimum duration for keeping the
+files (ZOTERO_PROFILE_MIN_MS) keep the overhead low enough to leave profiling
+on in production.
+"""
+
+import contextvars
+import cProfile
+import itertools
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Allocation sites listed in a memory report
+TOP_ALLOCATIONS = 15
+
+# Frames stored per traced allocation
+TRACEMALLOC_FRAMES = 10
+
+# Profiling session of the current tool call, if it was sampled
+_session: contextvars.ContextVar[Optional["_Session"]] = contextvars.ContextVar(
+    "zotero_profiling_session", default=None
+)
+
+# Whether the current thread is being profiled (one profiler per thread)
+_thread_state = threading.local()
+
+
+class _Session:
+    """Profiles of one sampled tool call, collected from the threads it ran in."""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self.profiles.append(profile)
+
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """
+    Profile the current thread for the sampled tool call, if any.
+
+    Nested uses, and threads already profiled for another call, are left as
+    they are.
+    """
+    session = _session.get()
+    if session is None or getattr(_thread_state, "active", False):
+        yield
+        return
+    profile = cProfile.Profile()
+    _thread_state.active = True
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        _thread_state.active = False
+        session.add(profile)
+
+
+class ToolProfiler:
+    """Profiles a sample of the tool calls and writes the reports to a directory."""
+
+    def __init__(
+        self,
+        directory: str,
+        sample_rate: float = 1.0,
+        memory: bool = False,
+        min_duration: float = 0.0,
+    ):
+        """
+        Create a profiler.
+
+        Args:
+            directory: Directory the reports are written to (created if
+                missing).
+            sample_rate: Share of the tool calls that are profiled, from 0 to 1.
+            memory: Also trace memory allocations with tracemalloc.
+            min_duration: Seconds a profiled call must take for its reports
+                to be written.
+        """
+        self.directory = directory
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.memory = memory
+        self.min_duration = min_duration
+        self.written = 0
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        # Calls tracing memory; tracemalloc runs while there is at least one
+        self._tracing = 0
+
+    def sampled(self) -> bool:
+        """Whether to profile the next call."""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _start_tracing(self) -> Optional[tracemalloc.Snapshot]:
+        with self._lock:
+            if self._tracing == 0:
+                if tracemalloc.is_tracing():
+                    # Started by someone else; leave it alone
+                    return None
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            else:
+                # Overlapping calls share the peak; it starts from here
+                tracemalloc.reset_peak()
+            self._tracing += 1
+        return tracemalloc.take_snapshot()
+
+    def _stop_tracing(self) -> None:
+        with self._lock:
+            self._tracing -= 1
+            if self._tracing == 0:
+                tracemalloc.stop()
+
+    @contextmanager
+    def profile_call(
+        self, tool: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> Iterator[None]:
+        """
+        Profile a tool call in the ``with`` block and write its reports.
+
+        The calling thread is profiled; worker threads join in through
+        profile_thread().
+
+        Args:
+            tool: Tool name.
+            arguments: Arguments of the call, included in the memory report.
+        """
+        session = _Session(tool)
+        token = _session.set(session)
+        before = self._start_tracing() if self.memory else None
+        concurrent = self._tracing > 1
+        started = time.perf_counter()
+        try:
+            with profile_thread():
+                yield
+        finally:
+            duration = time.perf_counter() - started
+            memory = None
+            if before is not None:
+                memory = self._memory_report(before, concurrent)
+                self._stop_tracing()
+            _session.reset(token)
+            if duration >= self.min_duration:
+                try:
+                    self._write(session, duration, arguments, memory)
+                except OSError:
+                    pass
+
+    def _memory_report(
+        self, before: tracemalloc.Snapshot, concurrent: bool
+    ) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        growth = after.compare_to(before, "lineno")
+        return {
+            "peak_bytes": peak,
+            "current_bytes": current,
+            # The peak includes the allocations of overlapping calls
+            "concurrent_calls": concurrent,
+            "top_allocations": [
+                {
+                    "location": str(stat.traceback[0]),
+                    "size_diff_bytes": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in growth[:TOP_ALLOCATIONS]
+            ],
+        }
+
+    def _write(
+        self,
+        session: _Session,
+        duration: float,
+        arguments: Optional[Dict[str, Any]],
+        memory: Optional[Dict[str, Any]],
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        name = re.sub(r"[^\w.-]", "_", session.tool)
+        base = os.path.join(
+            self.directory,
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{name}-{next(self._sequence)}",
+        )
+        if session.profiles:
+            stats = pstats.Stats(session.profiles[0])
+            for profile in session.profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(f"{base}.prof")
+        if memory is not None:
+            report = {
+                "tool": session.tool,
+                "arguments": arguments or {},
+                "duration_seconds": duration,
+                **memory,
+            }
+            with open(f"{base}.memory.json", "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, default=str)
+        with self._lock:
+            self.written += 1
+
+
+_profiler: Optional[ToolProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_profiler() -> Optional[ToolProfiler]:
+    """
+    Get the tool call profiler, if profiling is enabled.
+
+    Profiling is enabled by ZOTERO_PROFILE_DIR, the directory the reports go
+    to. ZOTERO_PROFILE_SAMPLE_RATE sets the share of calls profiled (default:
+    1), ZOTERO_PROFILE_MEMORY=1 adds tracemalloc reports, and
+    ZOTERO_PROFILE_MIN_MS only keeps the reports of slower calls (default: 0).
+
+    Returns:
+        The shared ToolProfiler instance, or None if profiling is disabled.
+    """
+    global _profiler
+
+    directory = os.getenv("ZOTERO_PROFILE_DIR")
+    if not directory:
+        return None
+    with _profiler_lock:
+        if _profiler is None or _profiler.directory != directory:
+            _profiler = ToolProfiler(
+                directory,
+                sample_rate=_env_number("ZOTERO_PROFILE_SAMPLE_RATE", 1.0),
+                memory=os.getenv("ZOTERO_PROFILE_MEMORY", "").lower()
+                in ("1", "true", "yes"),
+                min_duration=_env_number("ZOTERO_PROFILE_MIN_MS", 0.0) / 1000,
+            )
+        return _profiler
@@ -0,0 +1,369 @@
+"""
+Rate limiting and backoff for Web API requests.
+
+Every request made through the pooled clients and the async client passes a
+shared token bucket, so a burst of tool calls is smoothed out instead of
+hammering the API into 429s. The bucket also honors the server's flow control: a ``Backoff`` header pauses
+all requests for the given number of seconds, and a 429/503 with
+``Retry-After`` pauses them until the server is ready again. Idempotent
+requests that fail with a retryable status or a transport error are retried
+with jittered exponential backoff, so callers only see an error once the
+retries are exhausted.
+
+Requests carry a priority: tool calls are interactive by default, while bulk
+work such as mirror syncs runs inside ``background_requests()`` and only gets
+a token when no interactive request is waiting for one.
+"""
+
+import contextvars
+import email.utils
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import anyio
+import httpx
+
+# Request priorities; lower values are served first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Default sustained request rate (requests per second) and burst size
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+
+# Default number of retries for idempotent requests
+DEFAULT_MAX_RETRIES = 4
+
+# Jittered exponential backoff: base delay and upper bound, in seconds
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+# Responses worth retrying; 429 and 503 also pause every other request
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "zotero_request_priority", default=INTERACTIVE
+)
+
+
+@contextmanager
+def background_requests() -> Iterator[None]:
+    """Send the requests made inside the ``with`` block at background priority."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` or ``Backoff`` header value.
+
+    Args:
+        value: Delay in seconds, or an HTTP date.
+
+    Returns:
+        Seconds to wait (never negative), or None if the value is missing or
+        malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay before retry number ``attempt``."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+
+
+@dataclass
+class RateLimiterStats:
+    """Counters describing how much the rate limiter slowed requests down."""
+
+    requests: int = 0
+    retries: int = 0
+    pauses: int = 0
+    # Total time requests spent waiting for a token or a server pause
+    wait_time: float = 0.0
+
+
+class RateLimiter:
+    """Token bucket shared by every client of the process, with priorities."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """
+        Create a rate limiter.
+
+        Args:
+            rate: Sustained requests per second (0 or less for no limit;
+                server pauses are honored either way).
+            burst: Requests that may be sent at once after an idle period.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._condition = threading.Condition()
+        self._stats = RateLimiterStats()
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _take(self, priority: int) -> float:
+        """Take a token if allowed now; otherwise return seconds to wait."""
+        now = time.monotonic()
+        self._refill(now)
+        delay = self._paused_until - now
+        # Background requests yield to every waiting interactive one
+        yielding = priority == BACKGROUND and self._waiting[INTERACTIVE]
+        if delay <= 0 and not yielding:
+            if self.rate <= 0:
+                return 0.0
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            delay = (1 - self._tokens) / self.rate
+        return delay if delay > 0 else 0.05
+
+    def _record_wait(self, started: float) -> float:
+        waited = time.monotonic() - started
+        self._stats.requests += 1
+        self._stats.wait_time += waited
+        return waited
+
+    def acquire(self, priority: Optional[int] = None) -> float:
+        """
+        Block until a request may be sent.
+
+        Args:
+            priority: INTERACTIVE or BACKGROUND (default: the priority of the
+                current context).
+
+        Returns:
+            Seconds spent waiting.
+        """
+        if priority is None:
+            priority = _priority.get()
+        started = time.monotonic()
+
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while delay := self._take(priority):
+                    self._condition.wait(timeout=delay)
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+            return self._record_wait(started)
+
+    async def acquire_async(self, priority: Optional[int] = None) -> float:
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            priority: INTERACTIVE or BACKGROUND (default: the priority of the
+                current context).
+
+        Returns:
+            Seconds spent waiting.
+        """
+        if priority is None:
+            priority = _priority.get()
+        started = time.monotonic()
+
+        with self._condition:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._condition:
+                    delay = self._take(priority)
+                if not delay:
+                    break
+                await anyio.sleep(delay)
+        finally:
+            with self._condition:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+        with self._condition:
+            return self._record_wait(started)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request back for ``seconds``, e.g. on a Backoff header."""
+        with self._condition:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                self._stats.pauses += 1
+
+    def record_retry(self) -> None:
+        with self._condition:
+            self._stats.retries += 1
+
+    def stats(self) -> RateLimiterStats:
+        """A snapshot of the limiter counters."""
+        with self._condition:
+            return RateLimiterStats(**vars(self._stats))
+
+
+class _FlowControl:
+    """Backoff and retry decisions shared by the sync and async transports."""
+
+    def __init__(self, limiter: RateLimiter, max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        Args:
+            limiter: Rate limiter shared by all clients of the process.
+            max_retries: Retries for idempotent requests on retryable statuses
+                and transport errors.
+        """
+        self.limiter = limiter
+        self.max_retries = max(0, max_retries)
+
+    def _error_delay(self, request: httpx.Request, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying after a transport error, or None."""
+        if request.method not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+            return None
+        self.limiter.record_retry()
+        return retry_delay(attempt)
+
+    def _response_delay(
+        self, request: httpx.Request, response: httpx.Response, attempt: int
+    ) -> Optional[float]:
+        """
+        Apply the response's flow-control headers.
+
+        Returns:
+            Seconds to wait before retrying, or None to return the response.
+        """
+        backoff = parse_retry_after(response.headers.get("Backoff"))
+        if backoff:
+            self.limiter.pause(backoff)
+
+        status = response.status_code
+        retry_after = None
+        if status in THROTTLE_STATUSES:
+            # The server is overloaded: slow everyone down, not just us
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is None:
+                retry_after = retry_delay(attempt)
+            self.limiter.pause(retry_after)
+
+        if (
+            status not in RETRY_STATUSES
+            or request.method not in IDEMPOTENT_METHODS
+            or attempt >= self.max_retries
+        ):
+            return None
+        self.limiter.record_retry()
+        # Throttled retries wait for the pause when acquiring a token
+        return 0.0 if retry_after is not None else retry_delay(attempt)
+
+
+class RateLimitedTransport(_FlowControl, httpx.BaseTransport):
+    """httpx transport that sends every request through a RateLimiter."""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        limiter: RateLimiter,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        """
+        Wrap a transport.
+
+        Args:
+            transport: The transport that actually sends requests.
+            limiter: Rate limiter shared by all clients of the process.
+            max_retries: Retries for idempotent requests on retryable statuses
+                and transport errors.
+        """
+        super().__init__(limiter, max_retries)
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError:
+                delay = self._error_delay(request, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._response_delay(request, response, attempt)
+                if delay is None:
+                    return response
+                response.close()
+
+            attempt += 1
+            if delay:
+                time.sleep(delay)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRateLimitedTransport(_FlowControl, httpx.AsyncBaseTransport):
+    """Async counterpart of RateLimitedTransport, sharing the same limiter."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        limiter: RateLimiter,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        """
+        Wrap a transport.
+
+        Args:
+            transport: The async transport that actually sends requests.
+            limiter: Rate limiter shared by all clients of the process.
+            max_retries: Retries for idempotent requests on retryable statuses
+                and transport errors.
+        """
+        super().__init__(limiter, max_retries)
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                delay = self._error_delay(request, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._response_delay(request, response, attempt)
+                if delay is None:
+                    return response
+                await response.aclose()
+
+            attempt += 1
+            if delay:
+                await anyio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,334 @@
+"""
+In-memory cache of tool results, keyed by arguments and library version.
+
+Agents call listing tools such as zotero_get_collections over and over, and
+every call used to refetch the same objects and rebuild the same markdown.
+Results are cached under the tool name, the normalized arguments and the
+library version they were computed at, so a hit needs no request beyond the
+LibraryVersionValidator probe that is due at most once per TTL window.
+
+When the library version moves, entries whose dependencies did not change
+(e.g. the collection list after only items were edited) are carried over to
+the new version; everything else no longer matches the version and is only
+served by peek(), for stale-while-revalidate. Each tool sets its own TTL, and
+the cache is bounded by entry count and total size with LRU eviction.
+
+The entries can be saved to disk and loaded again, so a restarted server
+(Claude Desktop restarts stdio servers often) starts with the results of the
+previous process, to be confirmed by a single version probe.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from zotero_web_mcp.conversion_cache import CacheStats
+from zotero_web_mcp.library_version import LibraryChanges
+
+# Default bounds of the cache
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Kinds of library objects a cached result can depend on
+ITEMS = "items"
+COLLECTIONS = "collections"
+
+_Key = Tuple[str, str]
+
+
+@dataclass
+class CachedResult:
+    """A cached result served regardless of its version, with its age."""
+
+    value: str
+    version: int
+    # Seconds since the result was last known to be current
+    age: float
+    # Past its TTL
+    expired: bool
+
+
+@dataclass
+class _Entry:
+    value: str
+    version: int
+    stored: float
+    ttl: float
+    depends_on: FrozenSet[str]
+    # When the result was last confirmed to match the library version
+    validated: float = 0.0
+
+    @property
+    def expires(self) -> float:
+        return self.stored + self.ttl
+
+    @property
+    def size(self) -> int:
+        return len(self.value)
+
+
+class ToolResultCache:
+    """Bounded LRU cache of tool results, valid for one library version."""
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached results.
+            max_bytes: Maximum total length of the cached results.
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @staticmethod
+    def make_key(tool: str, arguments: Dict[str, Any]) -> _Key:
+        """
+        Build the cache key of a call.
+
+        Args:
+            tool: Tool name.
+            arguments: Every argument of the call, defaults included, so that
+                equivalent calls share a key.
+        """
+        return tool, json.dumps(arguments, sort_keys=True, default=str)
+
+    def get(self, key: _Key, version: int, record: bool = True) -> Optional[str]:
+        """
+        Look up a result.
+
+        Args:
+            key: Key from make_key().
+            version: The current library version.
+            record: Count the lookup in the stats; background refreshes of a
+                result already counted by record_peek() are not.
+
+        Returns:
+            The cached result, or None if it is missing, expired or was
+            computed at another library version.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            # Outdated entries stay for peek() until replaced or evicted
+            if (
+                entry is None
+                or entry.version != version
+                or entry.expires < time.monotonic()
+            ):
+                self._stats.misses += int(record)
+                return None
+            entry.validated = time.monotonic()
+            self._entries.move_to_end(key)
+            self._stats.hits += int(record)
+            return entry.value
+
+    def peek(self, key: _Key, max_age: float) -> Optional[CachedResult]:
+        """
+        Look up a result that may be stale, for stale-while-revalidate.
+
+        Whether the result is current is only known to the caller, so the
+        lookup is not counted; report the outcome with record_peek().
+
+        Args:
+            key: Key from make_key().
+            max_age: Maximum age of the result in seconds, whatever its
+                version and TTL.
+
+        Returns:
+            The cached result, or None if there is none young enough.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            now = time.monotonic()
+            age = now - entry.validated
+            if age > max_age:
+                return None
+            self._entries.move_to_end(key)
+            return CachedResult(entry.value, entry.version, age, entry.expires < now)
+
+    def record_peek(self, stale: bool) -> None:
+        """
+        Count a result served by peek().
+
+        Args:
+            stale: Whether the result was outdated and is being refreshed;
+                such results count as stale hits, not hits.
+        """
+        with self._lock:
+            if stale:
+                self._stats.stale_hits += 1
+            else:
+                self._stats.hits += 1
+
+    def put(
+        self,
+        key: _Key,
+        value: str,
+        version: int,
+        ttl: float,
+        depends_on: Iterable[str] = (ITEMS, COLLECTIONS),
+    ) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Key from make_key().
+            value: The tool result.
+            version: The library version the result was computed at.
+            ttl: Seconds the result may be served.
+            depends_on: Kinds of objects (ITEMS, COLLECTIONS) whose changes
+                invalidate the result.
+        """
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+        now = time.monotonic()
+        entry = _Entry(value, version, now, ttl, frozenset(depends_on), now)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def _remove(self, key: _Key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def invalidate(self, tool: Optional[str] = None) -> None:
+        """
+        Drop cached results, e.g. after a write.
+
+        Args:
+            tool: Only drop the results of this tool (None for all).
+        """
+        with self._lock:
+            for key in [k for k in self._entries if tool is None or k[0] == tool]:
+                self._remove(key)
+
+    def apply_changes(self, changes: LibraryChanges) -> None:
+        """
+        Carry unaffected results over to a new library version.
+
+        Meant as a LibraryVersionValidator listener. Affected results stay
+        until they are replaced or evicted, so they can still be served by
+        peek() while a fresh result is computed.
+
+        Args:
+            changes: The objects that changed between the two versions.
+        """
+        changed = set()
+        if changes.everything or changes.item_keys:
+            changed.add(ITEMS)
+        if changes.everything or changes.collection_keys:
+            changed.add(COLLECTIONS)
+        now = time.monotonic()
+        with self._lock:
+            for entry in self._entries.values():
+                if (
+                    entry.version == changes.previous_version
+                    and not entry.depends_on & changed
+                ):
+                    entry.version = changes.library_version
+                    entry.validated = now
+
+    def save(self, path: str, library_version: Optional[int]) -> None:
+        """
+        Write the entries to a JSON file, replacing it atomically.
+
+        Args:
+            path: File to write.
+            library_version: The library version the entries were last
+                validated against, restored by load().
+        """
+        now, wall = time.monotonic(), time.time()
+        with self._lock:
+            entries = [
+                {
+                    "tool": key[0],
+                    "arguments": key[1],
+                    "value": entry.value,
+                    "version": entry.version,
+                    "stored": wall - (now - entry.stored),
+                    "validated": wall - (now - entry.validated),
+                    "ttl": entry.ttl,
+                    "depends_on": sorted(entry.depends_on),
+                }
+                for key, entry in self._entries.items()
+            ]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"library_version": library_version, "entries": entries}, f)
+        os.replace(temp_path, path)
+
+    def load(self, path: str) -> Optional[int]:
+        """
+        Add the entries saved by save(), keeping entries already cached.
+
+        Args:
+            path: File to read; a missing or unreadable file is ignored.
+
+        Returns:
+            The library version saved with the entries, if any.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            now, wall = time.monotonic(), time.time()
+            entries = [
+                (
+                    (e["tool"], e["arguments"]),
+                    _Entry(
+                        e["value"],
+                        e["version"],
+                        now - (wall - e["stored"]),
+                        e["ttl"],
+                        frozenset(e["depends_on"]),
+                        now - (wall - e["validated"]),
+                    ),
+                )
+                for e in saved["entries"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        with self._lock:
+            # Most recently used first, each inserted as the least recently
+            # used entry, so the saved order is kept and the newest fit
+            for key, entry in reversed(entries):
+                if (
+                    key in self._entries
+                    or len(self._entries) >= self.max_entries
+                    or self._size + entry.size > self.max_bytes
+                ):
+                    continue
+                self._entries[key] = entry
+                self._entries.move_to_end(key, last=False)
+                self._size += entry.size
+        return saved.get("library_version")
+
+    def stats(self) -> CacheStats:
+        """A snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                stale_hits=self._stats.stale_hits,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                size=self._size,
+            )
@@ -2,20 +2,68 @@
 Zotero MCP server implementation.
 """
 
-from typing import Any, Dict, List, Literal, Optional, Union
+import asyncio
+import contextvars
+import functools
+import inspect
+import itertools
+import json
 import os
-import uuid
 import tempfile
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import anyio
 from fastmcp import Context, FastMCP
-
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from starlette.requests import Request
+from starlette.responses import Response
+
+from zotero_web_mcp.annotations import (
+    Annotation,
+    extract_pdf_annotations,
+    fetch_library_annotations,
+    format_annotation,
+    format_annotations,
+    search_annotations,
+)
 from zotero_web_mcp.client import (
+    WRITE_BATCH_SIZE,
+    ParentResolver,
     convert_to_markdown,
     format_item_metadata,
     generate_bibtex,
+    get_async_client,
     get_attachment_details,
-    get_zotero_client,
+    get_conversion_cache,
+    get_library_mirror,
+    get_library_validator,
+    get_mirror_sync_interval,
+    get_result_cache,
+    get_stale_budget,
+    iter_pages,
+    write_items,
+    zotero_client,
 )
+from zotero_web_mcp.client_pool import count_upstream_requests
+from zotero_web_mcp.local_search import SearchCondition, SearchConditionError
+from zotero_web_mcp.local_search import advanced_search as run_advanced_search
+from zotero_web_mcp.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics
+from zotero_web_mcp.mirror import LibraryMirror
+from zotero_web_mcp.pagination import fetch_all_pages
+from zotero_web_mcp.profiling import get_profiler, profile_thread
+from zotero_web_mcp.result_cache import COLLECTIONS, ITEMS, CachedResult
 from zotero_web_mcp.utils import format_creators
 
 # Create an MCP server with appropriate dependencies
@@ -24,11 +72,410 @@ mcp = FastMCP(
     dependencies=["pyzotero", "mcp[cli]", "python-dotenv", "markitdown", "fastmcp"],
 )
 
+# Times an item whose write conflicted is re-fetched and written again
+MAX_WRITE_RETRIES = 3
+
+# Attachments a full-text search indexes itself before answering; the rest
+# are indexed in the background
+FULLTEXT_SEARCH_BATCH = 20
+
+
+def _result_text(result: Any) -> str:
+    """
+    The text of the first content block of a tool result.
+
+    fastmcp 2.9 passes tool results through middleware as a list of content
+    blocks; later releases wrap them in a ToolResult with a content list.
+    """
+    content = getattr(result, "content", result)
+    if not content:
+        return ""
+    return getattr(content[0], "text", "") or ""
+
+
+class ToolMetricsMiddleware(Middleware):
+    """
+    Records the latency and the Web API traffic of every tool call.
+
+    Tools report failures as "Error ..." results rather than exceptions, so
+    such results count as errors too.
+    """
+
+    async def on_call_tool(
+        self, context: MiddlewareContext, call_next: Callable[..., Awaitable[Any]]
+    ) -> Any:
+        started = time.perf_counter()
+        failed = True
+        with count_upstream_requests() as counter:
+            try:
+                result = await call_next(context)
+                failed = _result_text(result).startswith("Error")
+                return result
+            finally:
+                get_metrics().observe_tool_call(
+                    context.message.name,
+                    time.perf_counter() - started,
+                    failed=failed,
+                    requests=counter.requests,
+                    coalesced=counter.coalesced,
+                    response_bytes=counter.bytes,
+                )
+
+
+class ToolProfilingMiddleware(Middleware):
+    """Profiles a sample of the tool calls when profiling is enabled."""
+
+    async def on_call_tool(
+        self, context: MiddlewareContext, call_next: Callable[..., Awaitable[Any]]
+    ) -> Any:
+        profiler = get_profiler()
+        if profiler is None or not profiler.sampled():
+            return await call_next(context)
+        with profiler.profile_call(context.message.name, context.message.arguments):
+            return await call_next(context)
+
+
+mcp.add_middleware(ToolMetricsMiddleware())
+mcp.add_middleware(ToolProfilingMiddleware())
+
+
+@mcp.resource(
+    "zotero://metrics",
+    name="zotero_metrics",
+    description="Server metrics: tool latencies, Web API requests and bytes per tool call, cache hit ratios and conversion timings.",
+    mime_type="application/json",
+)
+def metrics_resource() -> str:
+    """The process metrics as JSON."""
+    return json.dumps(get_metrics().summary(), indent=2)
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> Response:
+    """The process metrics in the Prometheus text format, on the HTTP transports."""
+    return Response(
+        get_metrics().render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+
+def get_synced_mirror(
+    zot, ctx: Context, even_if_disabled: bool = False
+) -> Optional[LibraryMirror]:
+    """
+    Get the local library mirror, syncing it first if it is due.
+
+    Args:
+        zot: Zotero client used for the incremental sync
+        ctx: MCP context
+        even_if_disabled: Use the mirror even if ZOTERO_LOCAL_MIRROR is not
+            set; syncs stay gated by ZOTERO_MIRROR_SYNC_INTERVAL either way
+
+    Returns:
+        The mirror, or None if it is disabled or could not be synced
+    """
+    mirror = get_library_mirror(even_if_disabled=even_if_disabled)
+    if mirror is None:
+        return None
+
+    try:
+        result = mirror.ensure_synced(
+            zot, get_mirror_sync_interval(), validator=get_library_validator()
+        )
+        if result and result.changed:
+            ctx.info(
+                f"Synced local mirror to library version {result.library_version} "
+                f"({result.items_updated} items updated, "
+                f"{result.objects_deleted} objects deleted)"
+            )
+    except Exception as e:
+        ctx.warning(f"Local mirror sync failed, falling back to the Web API: {str(e)}")
+        return None
+
+    return mirror
+
+
+class ThreadContext:
+    """
+    Context for tool bodies running in a worker thread.
+
+    Context notifications are coroutines that must run on the event loop; this
+    proxy sends them there and waits, so synchronous tool code can keep
+    calling ctx.info() and friends. Notifications are best-effort and never
+    fail the tool.
+    """
+
+    _NOTIFICATIONS = ("debug", "info", "warning", "error", "log", "report_progress")
+
+    def __init__(self, ctx: Context):
+        self._ctx = ctx
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._ctx, name)
+        if name not in self._NOTIFICATIONS:
+            return attr
+
+        def send(*args: Any, **kwargs: Any) -> None:
+            try:
+                anyio.from_thread.run(functools.partial(attr, *args, **kwargs))
+            except Exception:
+                pass
+
+        return send
+
+
+def run_in_worker_thread(fn: Callable[..., str]) -> Callable[..., Any]:
+    """
+    Turn a blocking tool into an async one that runs in a worker thread.
+
+    pyzotero, SQLite and file conversions block; running them off the event
+    loop lets the HTTP transports serve concurrent tool calls in parallel.
+    """
+
+    def run(*args: Any, **kwargs: Any) -> str:
+        # Sampled calls are profiled in the thread that does the work
+        with profile_thread():
+            return fn(*args, **kwargs)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, ctx: Context, **kwargs: Any) -> str:
+        return await anyio.to_thread.run_sync(
+            functools.partial(run, *args, ctx=ThreadContext(ctx), **kwargs)
+        )
+
+    return wrapper
+
+
+class _ErrorTrackingContext:
+    """
+    Context proxy that remembers whether the tool reported an error.
+
+    Without a context, e.g. for a background refresh that outlives the
+    request, notifications are dropped.
+    """
+
+    def __init__(self, ctx: Optional[Context]):
+        self._ctx = ctx
+        self.failed = False
+
+    async def error(self, *args: Any, **kwargs: Any) -> None:
+        self.failed = True
+        if self._ctx is not None:
+            await self._ctx.error(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if self._ctx is not None:
+            return getattr(self._ctx, name)
+
+        async def drop(*args: Any, **kwargs: Any) -> None:
+            pass
+
+        return drop
+
+
+async def current_library_version() -> int:
+    """
+    The library version, probed in a worker thread if the last probe is too old.
+
+    Returns:
+        The current library version.
+
+    Raises:
+        Exception: If the version probe failed.
+    """
+    validator = get_library_validator()
+    if not validator.is_due():
+        return validator.version
+
+    def probe() -> int:
+        with zotero_client() as zot:
+            return validator.validate(zot)
+
+    return await anyio.to_thread.run_sync(probe)
+
+
+# Background refreshes of stale results, by cache key; holding the tasks also
+# keeps them from being garbage collected
+_refreshes: Dict[Any, "asyncio.Task[None]"] = {}
+
+
+def _staleness_note(cached: CachedResult) -> str:
+    return (
+        f"\n\n_Cached result from library version {cached.version}, "
+        f"{cached.age:.0f}s old; a refresh is running in the background._"
+    )
+
+
+def cached_tool(
+    name: str, ttl: float, depends_on: Iterable[str] = (ITEMS, COLLECTIONS)
+) -> Callable[[Callable[..., Awaitable[str]]], Callable[..., Awaitable[str]]]:
+    """
+    Serve repeated calls of an async tool from the tool result cache.
+
+    Results are keyed by the tool, its arguments (defaults included) and the
+    library version; results of calls that reported an error are not cached.
+    With a staleness budget (see get_stale_budget()), a cached result that
+    may be out of date is returned at once, with a note on its version and
+    age, while a fresh one is computed in the background.
+
+    Args:
+        name: Tool name, for cache keys and staleness budgets.
+        ttl: Seconds a result may be served.
+        depends_on: Kinds of objects (ITEMS, COLLECTIONS) whose changes
+            invalidate a result.
+    """
+
+    def decorator(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, ctx: Context, **kwargs: Any) -> str:
+            try:
+                cache = get_result_cache()
+            except Exception:
+                cache = None
+            if cache is None:
+                return await fn(*args, ctx=ctx, **kwargs)
+
+            bound = signature.bind(*args, ctx=ctx, **kwargs)
+            bound.apply_defaults()
+            bound.arguments.pop("ctx")
+            key = cache.make_key(name, bound.arguments)
+
+            async def compute(context: Optional[Context]) -> str:
+                try:
+                    version = await current_library_version()
+                except Exception:
+                    # Without a known version nothing can be cached safely
+                    return await fn(*args, ctx=_ErrorTrackingContext(context), **kwargs)
+                # A background refresh was already counted as a stale hit
+                result = cache.get(key, version, record=context is not None)
+                if result is None:
+                    tracked = _ErrorTrackingContext(context)
+                    result = await fn(*args, ctx=tracked, **kwargs)
+                    if not tracked.failed:
+                        cache.put(key, result, version, ttl, depends_on)
+                return result
+
+            async def refresh() -> None:
+                # Runs in a fresh context, so its requests are charged here
+                # rather than to the call that served the stale result
+                started = time.perf_counter()
+                failed = True
+                with count_upstream_requests() as counter:
+                    try:
+                        failed = (await compute(None)).startswith("Error")
+                    except Exception:
+                        pass
+                    finally:
+                        _refreshes.pop(key, None)
+                        get_metrics().observe_tool_call(
+                            f"{name}:refresh",
+                            time.perf_counter() - started,
+                            failed=failed,
+                            requests=counter.requests,
+                            coalesced=counter.coalesced,
+                            response_bytes=counter.bytes,
+                        )
+
+            budget = get_stale_budget(name)
+            cached = cache.peek(key, budget) if budget > 0 else None
+            if cached is not None:
+                validator = get_library_validator()
+                if (
+                    not cached.expired
+                    and not validator.is_due()
+                    and cached.version == validator.version
+                ):
+                    cache.record_peek(stale=False)
+                    return cached.value
+                cache.record_peek(stale=True)
+                if key not in _refreshes:
+                    # Leave the caller's request counters and lease behind
+                    _refreshes[key] = contextvars.Context().run(
+                        asyncio.create_task, refresh()
+                    )
+                return cached.value + _staleness_note(cached)
+
+            return await compute(ctx)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_library_caches() -> None:
+    """Make the next reads see a write made by a tool."""
+    get_library_validator().invalidate()
+    if mirror := get_library_mirror():
+        mirror.invalidate()
+    if cache := get_result_cache():
+        cache.invalidate()
+
+
+async def get_synced_mirror_async(
+    ctx: Context, even_if_disabled: bool = False
+) -> Optional[LibraryMirror]:
+    """
+    Async variant of get_synced_mirror() that syncs in a worker thread.
+
+    Args:
+        ctx: MCP context
+        even_if_disabled: Use the mirror even if ZOTERO_LOCAL_MIRROR is not
+            set; syncs stay gated by ZOTERO_MIRROR_SYNC_INTERVAL either way
+
+    Returns:
+        The mirror, or None if it is disabled or could not be synced
+    """
+    mirror = get_library_mirror(even_if_disabled=even_if_disabled)
+    if mirror is None or not mirror.is_stale(get_mirror_sync_interval()):
+        return mirror
+
+    def sync() -> Optional[LibraryMirror]:
+        with zotero_client() as zot:
+            return get_synced_mirror(zot, ThreadContext(ctx), even_if_disabled)
+
+    return await anyio.to_thread.run_sync(sync)
+
+
+def gather_from_thread(*calls: Callable[[], Awaitable[Any]]) -> List[Any]:
+    """
+    Run independent async requests concurrently, from a worker thread.
+
+    Args:
+        *calls: Functions returning the awaitables to run; they are called on
+            the event loop.
+
+    Returns:
+        The results in order; a failed call yields its exception instead.
+    """
+
+    async def gather() -> List[Any]:
+        return await asyncio.gather(*(call() for call in calls), return_exceptions=True)
+
+    return anyio.from_thread.run(gather)
+
+
+def resolve_parents(parents: ParentResolver, keys: Iterable[str]) -> None:
+    """
+    Resolve parent items from a worker thread, fetching all batches at once.
+
+    Args:
+        parents: The resolver to fill
+        keys: Parent item keys
+    """
+    keys = list(keys)
+
+    async def resolve() -> None:
+        await parents.resolve_async(keys, get_async_client())
+
+    anyio.from_thread.run(resolve)
+
 
 @mcp.tool(
     name="zotero_search_items",
     description="Search for items in your Zotero library, given a query string.",
 )
+@run_in_worker_thread
 def search_items(
     query: str,
     qmode: Literal["titleCreatorYear", "everything"] = "titleCreatorYear",
@@ -63,55 +510,60 @@ def search_items(
             tag = []
 
         ctx.info(f"Searching Zotero for '{query}'{tag_condition_str}")
-        zot = get_zotero_client()
+        with zotero_client() as zot:
 
-        # Search using the query parameters
-        zot.add_parameters(
-            q=query, qmode=qmode, itemType=item_type, limit=limit, tag=tag
-        )
-        results = zot.items()
+            # Search using the query parameters
+            if mirror := get_synced_mirror(zot, ctx):
+                results = mirror.search_items(
+                    query, qmode=qmode, item_type=item_type, tags=tag, limit=limit
+                )
+            else:
+                zot.add_parameters(
+                    q=query, qmode=qmode, itemType=item_type, limit=limit, tag=tag
+                )
+                results = zot.items()
 
-        if not results:
-            return f"No items found matching query: '{query}'{tag_condition_str}"
+            if not results:
+                return f"No items found matching query: '{query}'{tag_condition_str}"
 
-        # Format results as markdown
-        output = [f"# Search Results for '{query}'", f"{tag_condition_str}", ""]
+            # Format results as markdown
+            output = [f"# Search Results for '{query}'", f"{tag_condition_str}", ""]
 
-        for i, item in enumerate(results, 1):
-            data = item.get("data", {})
-            title = data.get("title", "Untitled")
-            item_type = data.get("itemType", "unknown")
-            date = data.get("date", "No date")
-            key = item.get("key", "")
-
-            # Format creators
-            creators = data.get("creators", [])
-            creators_str = format_creators(creators)
-
-            # Build the formatted entry
-            output.append(f"## {i}. {title}")
-            output.append(f"**Type:** {item_type}")
-            output.append(f"**Item Key:** {key}")
-            output.append(f"**Date:** {date}")
-            output.append(f"**Authors:** {creators_str}")
-
-            # Add abstract snippet if present
-            if abstract := data.get("abstractNote"):
-                # Limit abstract length for search results
-                abstract_snippet = (
-                    abstract[:200] + "..." if len(abstract) > 200 else abstract
-                )
-                output.append(f"**Abstract:** {abstract_snippet}")
+            for i, item in enumerate(results, 1):
+                data = item.get("data", {})
+                title = data.get("title", "Untitled")
+                item_type = data.get("itemType", "unknown")
+                date = data.get("date", "No date")
+                key = item.get("key", "")
+
+                # Format creators
+                creators = data.get("creators", [])
+                creators_str = format_creators(creators)
+
+                # Build the formatted entry
+                output.append(f"## {i}. {title}")
+                output.append(f"**Type:** {item_type}")
+                output.append(f"**Item Key:** {key}")
+                output.append(f"**Date:** {date}")
+                output.append(f"**Authors:** {creators_str}")
+
+                # Add abstract snippet if present
+                if abstract := data.get("abstractNote"):
+                    # Limit abstract length for search results
+                    abstract_snippet = (
+                        abstract[:200] + "..." if len(abstract) > 200 else abstract
+                    )
+                    output.append(f"**Abstract:** {abstract_snippet}")
 
-            # Add tags if present
-            if tags := data.get("tags"):
-                tag_list = [f"`{tag['tag']}`" for tag in tags]
-                if tag_list:
-                    output.append(f"**Tags:** {' '.join(tag_list)}")
+                # Add tags if present
+                if tags := data.get("tags"):
+                    tag_list = [f"`{tag['tag']}`" for tag in tags]
+                    if tag_list:
+                        output.append(f"**Tags:** {' '.join(tag_list)}")
 
-            output.append("")  # Empty line between items
+                output.append("")  # Empty line between items
 
-        return "\n".join(output)
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error searching Zotero: {str(e)}")
@@ -123,6 +575,7 @@ def search_items(
     description="Search for items in your Zotero library by tag. "
     "Conditions are ANDed, each term supports disjunction`||` and exclusion`-`.",
 )
+@run_in_worker_thread
 def search_by_tag(
     tag: List[str],
     item_type: str = "-attachment",
@@ -156,53 +609,58 @@ def search_by_tag(
             return "Error: Tag cannot be empty"
 
         ctx.info(f"Searching Zotero for tag '{tag}'")
-        zot = get_zotero_client()
+        with zotero_client() as zot:
 
-        # Search using the query parameters
-        zot.add_parameters(q="", tag=tag, itemType=item_type, limit=limit)
-        results = zot.items()
+            # Search using the query parameters
+            if mirror := get_synced_mirror(zot, ctx):
+                results = mirror.search_items(
+                    item_type=item_type, tags=tag, limit=limit
+                )
+            else:
+                zot.add_parameters(q="", tag=tag, itemType=item_type, limit=limit)
+                results = zot.items()
 
-        if not results:
-            return f"No items found with tag: '{tag}'"
+            if not results:
+                return f"No items found with tag: '{tag}'"
 
-        # Format results as markdown
-        output = [f"# Search Results for Tag: '{tag}'", ""]
+            # Format results as markdown
+            output = [f"# Search Results for Tag: '{tag}'", ""]
 
-        for i, item in enumerate(results, 1):
-            data = item.get("data", {})
-            title = data.get("title", "Untitled")
-            item_type = data.get("itemType", "unknown")
-            date = data.get("date", "No date")
-            key = item.get("key", "")
-
-            # Format creators
-            creators = data.get("creators", [])
-            creators_str = format_creators(creators)
-
-            # Build the formatted entry
-            output.append(f"## {i}. {title}")
-            output.append(f"**Type:** {item_type}")
-            output.append(f"**Item Key:** {key}")
-            output.append(f"**Date:** {date}")
-            output.append(f"**Authors:** {creators_str}")
-
-            # Add abstract snippet if present
-            if abstract := data.get("abstractNote"):
-                # Limit abstract length for search results
-                abstract_snippet = (
-                    abstract[:200] + "..." if len(abstract) > 200 else abstract
-                )
-                output.append(f"**Abstract:** {abstract_snippet}")
+            for i, item in enumerate(results, 1):
+                data = item.get("data", {})
+                title = data.get("title", "Untitled")
+                item_type = data.get("itemType", "unknown")
+                date = data.get("date", "No date")
+                key = item.get("key", "")
+
+                # Format creators
+                creators = data.get("creators", [])
+                creators_str = format_creators(creators)
+
+                # Build the formatted entry
+                output.append(f"## {i}. {title}")
+                output.append(f"**Type:** {item_type}")
+                output.append(f"**Item Key:** {key}")
+                output.append(f"**Date:** {date}")
+                output.append(f"**Authors:** {creators_str}")
+
+                # Add abstract snippet if present
+                if abstract := data.get("abstractNote"):
+                    # Limit abstract length for search results
+                    abstract_snippet = (
+                        abstract[:200] + "..." if len(abstract) > 200 else abstract
+                    )
+                    output.append(f"**Abstract:** {abstract_snippet}")
 
-            # Add tags if present
-            if tags := data.get("tags"):
-                tag_list = [f"`{tag['tag']}`" for tag in tags]
-                if tag_list:
-                    output.append(f"**Tags:** {' '.join(tag_list)}")
+                # Add tags if present
+                if tags := data.get("tags"):
+                    tag_list = [f"`{tag['tag']}`" for tag in tags]
+                    if tag_list:
+                        output.append(f"**Tags:** {' '.join(tag_list)}")
 
-            output.append("")  # Empty line between items
+                output.append("")  # Empty line between items
 
-        return "\n".join(output)
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error searching Zotero: {str(e)}")
@@ -213,7 +671,7 @@ def search_by_tag(
     name="zotero_get_item_metadata",
     description="Get detailed metadata for a specific Zotero item by its key.",
 )
-def get_item_metadata(
+async def get_item_metadata(
     item_key: str,
     include_abstract: bool = True,
     format: Literal["markdown", "bibtex"] = "markdown",
@@ -233,20 +691,23 @@ def get_item_metadata(
         Formatted item metadata (markdown or BibTeX)
     """
     try:
-        ctx.info(f"Fetching metadata for item {item_key} in {format} format")
-        zot = get_zotero_client()
+        await ctx.info(f"Fetching metadata for item {item_key} in {format} format")
 
-        item = zot.item(item_key)
+        mirror = await get_synced_mirror_async(ctx)
+        item = mirror.item(item_key) if mirror else None
+        if item is None:
+            item = await get_async_client().item(item_key)
         if not item:
             return f"No item found with key: {item_key}"
 
         if format == "bibtex":
-            return generate_bibtex(item)
+            # Better BibTeX is asked over blocking HTTP, so keep it off the loop
+            return await anyio.to_thread.run_sync(generate_bibtex, item)
         else:
             return format_item_metadata(item, include_abstract)
 
     except Exception as e:
-        ctx.error(f"Error fetching item metadata: {str(e)}")
+        await ctx.error(f"Error fetching item metadata: {str(e)}")
         return f"Error fetching item metadata: {str(e)}"
 
 
@@ -254,10 +715,18 @@ def get_item_metadata(
     name="zotero_get_item_fulltext",
     description="Get the full text content of a Zotero item by its key.",
 )
+@run_in_worker_thread
 def get_item_fulltext(item_key: str, *, ctx: Context) -> str:
     """
     Get the full text content of a Zotero item.
 
+    Downloads and conversions block a worker thread rather than the event loop,
+    so concurrent requests on the HTTP transports are served in parallel.
+
+    A converted attachment is cached. While the library version is unchanged,
+    reading the item again is answered from the cache before the item or its
+    attachments are fetched, at the cost of at most one version probe.
+
     Args:
         item_key: Zotero item key/ID
         ctx: MCP context
@@ -267,63 +736,119 @@ def get_item_fulltext(item_key: str, *, ctx: Context) -> str:
     """
     try:
         ctx.info(f"Fetching full text for item {item_key}")
-        zot = get_zotero_client()
-
-        # First get the item metadata
-        item = zot.item(item_key)
-        if not item:
-            return f"No item found with key: {item_key}"
-
-        # Get item metadata in markdown format
-        metadata = format_item_metadata(item, include_abstract=True)
-
-        # Try to get attachment details
-        attachment = get_attachment_details(zot, item)
-        if not attachment:
-            return f"{metadata}\n\n---\n\nNo suitable attachment found for this item."
-
-        ctx.info(f"Found attachment: {attachment.key} ({attachment.content_type})")
-
-        # Try fetching full text from Zotero's full text index first
-        try:
-            full_text_data = zot.fulltext_item(attachment.key)
-            if (
-                full_text_data
-                and "content" in full_text_data
-                and full_text_data["content"]
-            ):
-                ctx.info("Successfully retrieved full text from Zotero's index")
+        with zotero_client() as zot:
+
+            # A previous conversion, in an unchanged library, needs no request
+            # beyond the version probe
+            cache = get_conversion_cache()
+            library = f"{zot.library_type}/{zot.library_id}"
+            library_version = None
+            if cache is not None:
+                try:
+                    library_version = get_library_validator().validate(zot)
+                except Exception as probe_error:
+                    ctx.info(f"Couldn't probe the library version: {probe_error}")
+                if library_version is not None:
+                    cached_item = cache.get_item(library, item_key, library_version)
+                    if cached_item is not None:
+                        ctx.info(f"Using cached conversion for item {item_key}")
+                        metadata, cached_text = cached_item
+                        return f"{metadata}\n\n---\n\n## Full Text\n\n{cached_text}"
+
+            # First get the item metadata
+            item = zot.item(item_key)
+            if not item:
+                return f"No item found with key: {item_key}"
+
+            # Get item metadata in markdown format
+            metadata = format_item_metadata(item, include_abstract=True)
+
+            # Try to get attachment details
+            attachment = get_attachment_details(zot, item)
+            if not attachment:
                 return (
-                    f"{metadata}\n\n---\n\n## Full Text\n\n{full_text_data['content']}"
+                    f"{metadata}\n\n---\n\nNo suitable attachment found for this item."
                 )
-        except Exception as fulltext_error:
-            ctx.info(f"Couldn't retrieve indexed full text: {str(fulltext_error)}")
 
-        # If we couldn't get indexed full text, try to download and convert the file
-        try:
-            ctx.info(f"Attempting to download and convert attachment {attachment.key}")
-
-            # Download the file to a temporary location
-            import tempfile
-            import os
+            ctx.info(f"Found attachment: {attachment.key} ({attachment.content_type})")
+
+            def remember() -> None:
+                if cache is not None and library_version is not None:
+                    cache.put_item(
+                        library,
+                        item_key,
+                        library_version,
+                        attachment.key,
+                        metadata,
+                        md5=attachment.md5,
+                        version=attachment.version,
+                    )
 
-            with tempfile.TemporaryDirectory() as tmpdir:
-                file_path = os.path.join(
-                    tmpdir, attachment.filename or f"{attachment.key}.pdf"
+            # A previous conversion of the same file needs no download at all
+            if cache is not None:
+                cached_text = cache.get(
+                    attachment.key, md5=attachment.md5, version=attachment.version
                 )
-                zot.dump(
-                    attachment.key, filename=os.path.basename(file_path), path=tmpdir
+                if cached_text is not None:
+                    stats = cache.stats()
+                    ctx.info(
+                        f"Using cached conversion of {attachment.key} "
+                        f"({stats.hits} hits, {stats.misses} misses)"
+                    )
+                    remember()
+                    return f"{metadata}\n\n---\n\n## Full Text\n\n{cached_text}"
+
+            # Try fetching full text from Zotero's full text index first
+            try:
+                full_text_data = zot.fulltext_item(attachment.key)
+                if (
+                    full_text_data
+                    and "content" in full_text_data
+                    and full_text_data["content"]
+                ):
+                    ctx.info("Successfully retrieved full text from Zotero's index")
+                    return f"{metadata}\n\n---\n\n## Full Text\n\n{full_text_data['content']}"
+            except Exception as fulltext_error:
+                ctx.info(f"Couldn't retrieve indexed full text: {str(fulltext_error)}")
+
+            # If we couldn't get indexed full text, try to download and convert the file
+            try:
+                ctx.info(
+                    f"Attempting to download and convert attachment {attachment.key}"
                 )
 
-                if os.path.exists(file_path):
-                    ctx.info(f"Downloaded file to {file_path}, converting to markdown")
-                    converted_text = convert_to_markdown(file_path)
-                    return f"{metadata}\n\n---\n\n## Full Text\n\n{converted_text}"
-                else:
-                    return f"{metadata}\n\n---\n\nFile download failed."
-        except Exception as download_error:
-            ctx.error(f"Error downloading/converting file: {str(download_error)}")
-            return f"{metadata}\n\n---\n\nError accessing attachment: {str(download_error)}"
+                # Download the file to a temporary location
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    file_path = os.path.join(
+                        tmpdir, attachment.filename or f"{attachment.key}.pdf"
+                    )
+                    zot.dump(
+                        attachment.key,
+                        filename=os.path.basename(file_path),
+                        path=tmpdir,
+                    )
+
+                    if os.path.exists(file_path):
+                        ctx.info(
+                            f"Downloaded file to {file_path}, converting to markdown"
+                        )
+                        converted_text = convert_to_markdown(file_path)
+                        if cache is not None and not converted_text.startswith(
+                            "Error converting file to markdown"
+                        ):
+                            cache.put(
+                                attachment.key,
+                                converted_text,
+                                md5=attachment.md5,
+                                version=attachment.version,
+                            )
+                            remember()
+                        return f"{metadata}\n\n---\n\n## Full Text\n\n{converted_text}"
+                    else:
+                        return f"{metadata}\n\n---\n\nFile download failed."
+            except Exception as download_error:
+                ctx.error(f"Error downloading/converting file: {str(download_error)}")
+                return f"{metadata}\n\n---\n\nError accessing attachment: {str(download_error)}"
 
     except Exception as e:
         ctx.error(f"Error fetching item full text: {str(e)}")
@@ -331,84 +856,191 @@ def get_item_fulltext(item_key: str, *, ctx: Context) -> str:
 
 
 @mcp.tool(
-    name="zotero_get_collections",
-    description="List all collections in your Zotero library.",
+    name="zotero_search_fulltext",
+    description="Search the full text of your Zotero library (attachment content, abstracts and notes) with a local ranked index.",
 )
-def get_collections(limit: Optional[int] = None, *, ctx: Context) -> str:
+@run_in_worker_thread
+def search_fulltext(query: str, limit: int = 10, *, ctx: Context) -> str:
     """
-    List all collections in your Zotero library.
+    Search attachment content, abstracts and notes with a local BM25 index.
+
+    The index lives in the local mirror database and is brought up to date
+    incrementally before each search. Indexing takes one request per changed
+    attachment, so a search indexes at most FULLTEXT_SEARCH_BATCH attachments
+    itself and leaves the rest to a background thread; until that finishes,
+    results come from the partial index and say so.
 
     Args:
-        limit: Maximum number of collections to return
+        query: Search query string; every word must match
+        limit: Maximum number of items to return
         ctx: MCP context
 
     Returns:
-        Markdown-formatted list of collections
+        Markdown-formatted ranked results with matching snippets
     """
     try:
-        ctx.info("Fetching collections")
-        zot = get_zotero_client()
+        if not query.strip():
+            return "Error: Search query cannot be empty"
 
-        collections = zot.collections(limit=limit)
+        ctx.info(f"Searching Zotero full text for '{query}'")
+        with zotero_client() as zot:
 
-        # Always return the header, even if empty
-        output = ["# Zotero Collections", ""]
+            mirror = get_synced_mirror(zot, ctx, even_if_disabled=True)
+            if mirror is None:
+                return "Error: The local full-text index could not be synced"
 
-        if not collections:
-            output.append("No collections found in your Zotero library.")
-            return "\n".join(output)
+            # Index a small batch now and leave the rest to a background
+            # thread, which leases a client per batch
+            if not mirror.fulltext_indexing:
+                indexed = mirror.ensure_fulltext_synced(
+                    zot, get_mirror_sync_interval(), max_items=FULLTEXT_SEARCH_BATCH
+                )
+                if indexed:
+                    ctx.info(f"Indexed full text of {indexed} attachments")
+                if mirror.fulltext_pending:
+                    mirror.start_fulltext_indexing(zotero_client)
+
+            # Only attachments already indexed can match
+            incomplete_note = ""
+            if mirror.fulltext_pending:
+                incomplete_note = (
+                    f"_The full-text index is incomplete: {mirror.fulltext_pending} "
+                    "attachments are still being indexed in the background, so "
+                    "matches in them are missing._"
+                )
 
-        # Create a mapping of collection IDs to their data
-        collection_map = {c["key"]: c for c in collections}
+            hits = mirror.search_fulltext(query, limit=limit or 10)
+            if not hits:
+                message = f"No full-text matches found for: '{query}'"
+                return f"{message}\n\n{incomplete_note}" if incomplete_note else message
 
-        # Create a mapping of parent to child collections
-        # Only add entries for collections that actually exist
-        hierarchy = {}
-        for coll in collections:
-            parent_key = coll["data"].get("parentCollection")
-            # Handle various representations of "no parent"
-            if parent_key in ["", None] or not parent_key:
-                parent_key = None  # Normalize to None
+            items = mirror.items_by_keys(hit.item_key for hit in hits)
 
-            if parent_key not in hierarchy:
-                hierarchy[parent_key] = []
-            hierarchy[parent_key].append(coll["key"])
+            # Format results as markdown
+            output = [f"# Full-Text Search Results for '{query}'", ""]
+            if incomplete_note:
+                output.extend([incomplete_note, ""])
 
-        # Function to recursively format collections
-        def format_collection(key, level=0):
-            if key not in collection_map:
-                return []
+            for i, hit in enumerate(hits, 1):
+                data = items.get(hit.item_key, {}).get("data", {})
+                title = data.get("title", "Untitled")
+                item_type = data.get("itemType", "unknown")
+                date = data.get("date", "No date")
 
-            coll = collection_map[key]
-            name = coll["data"].get("name", "Unnamed Collection")
+                output.append(f"## {i}. {title}")
+                output.append(f"**Type:** {item_type}")
+                output.append(f"**Item Key:** {hit.item_key}")
+                output.append(f"**Date:** {date}")
+                output.append(
+                    f"**Authors:** {format_creators(data.get('creators', []))}"
+                )
+                output.append(f"**Score:** {hit.score:.2f}")
 
-            # Create indentation for hierarchy
-            indent = "  " * level
-            lines = [f"{indent}- **{name}** (Key: {key})"]
+                # Where the match was found
+                if hit.source == "fulltext":
+                    output.append(f"**Matched In:** full text of {hit.matched_key}")
+                elif hit.source == "note":
+                    output.append(f"**Matched In:** note {hit.matched_key}")
+                else:
+                    output.append("**Matched In:** title/abstract")
+
+                output.append(f"**Snippet:** {' '.join(hit.snippet.split())}")
+                output.append("")  # Empty line between items
 
-            # Add children if they exist
-            child_keys = hierarchy.get(key, [])
-            for child_key in sorted(child_keys):  # Sort for consistent output
-                lines.extend(format_collection(child_key, level + 1))
+            return "\n".join(output)
 
-            return lines
+    except Exception as e:
+        ctx.error(f"Error searching full text: {str(e)}")
+        return f"Error searching full text: {str(e)}"
 
-        # Start with top-level collections (those with None as parent)
-        top_level_keys = hierarchy.get(None, [])
 
-        if not top_level_keys:
-            # If no clear hierarchy, just list all collections
-            output.append("Collections (flat list):")
-            for coll in sorted(collections, key=lambda x: x["data"].get("name", "")):
+@mcp.tool(
+    name="zotero_get_collections",
+    description="List all collections in your Zotero library.",
+)
+@cached_tool("zotero_get_collections", ttl=600, depends_on=(COLLECTIONS,))
+@run_in_worker_thread
+def get_collections(limit: Optional[int] = None, *, ctx: Context) -> str:
+    """
+    List all collections in your Zotero library.
+
+    Args:
+        limit: Maximum number of collections to return
+        ctx: MCP context
+
+    Returns:
+        Markdown-formatted list of collections
+    """
+    try:
+        ctx.info("Fetching collections")
+        with zotero_client() as zot:
+
+            if mirror := get_synced_mirror(zot, ctx):
+                collections = mirror.collections(limit=limit)
+            else:
+                # Every page at once, reassembled in order
+                collections = fetch_all_pages(zot, "/collections", limit=limit)
+
+            # Always return the header, even if empty
+            output = ["# Zotero Collections", ""]
+
+            if not collections:
+                output.append("No collections found in your Zotero library.")
+                return "\n".join(output)
+
+            # Create a mapping of collection IDs to their data
+            collection_map = {c["key"]: c for c in collections}
+
+            # Create a mapping of parent to child collections
+            # Only add entries for collections that actually exist
+            hierarchy = {}
+            for coll in collections:
+                parent_key = coll["data"].get("parentCollection")
+                # Handle various representations of "no parent"
+                if parent_key in ["", None] or not parent_key:
+                    parent_key = None  # Normalize to None
+
+                if parent_key not in hierarchy:
+                    hierarchy[parent_key] = []
+                hierarchy[parent_key].append(coll["key"])
+
+            # Function to recursively format collections
+            def format_collection(key, level=0):
+                if key not in collection_map:
+                    return []
+
+                coll = collection_map[key]
                 name = coll["data"].get("name", "Unnamed Collection")
-                key = coll["key"]
-                output.append(f"- **{name}** (Key: {key})")
-        else:
-            # Display hierarchical structure
-            for key in sorted(top_level_keys):
-                output.extend(format_collection(key))
 
-        return "\n".join(output)
+                # Create indentation for hierarchy
+                indent = "  " * level
+                lines = [f"{indent}- **{name}** (Key: {key})"]
+
+                # Add children if they exist
+                child_keys = hierarchy.get(key, [])
+                for child_key in sorted(child_keys):  # Sort for consistent output
+                    lines.extend(format_collection(child_key, level + 1))
+
+                return lines
+
+            # Start with top-level collections (those with None as parent)
+            top_level_keys = hierarchy.get(None, [])
+
+            if not top_level_keys:
+                # If no clear hierarchy, just list all collections
+                output.append("Collections (flat list):")
+                for coll in sorted(
+                    collections, key=lambda x: x["data"].get("name", "")
+                ):
+                    name = coll["data"].get("name", "Unnamed Collection")
+                    key = coll["key"]
+                    output.append(f"- **{name}** (Key: {key})")
+            else:
+                # Display hierarchical structure
+                for key in sorted(top_level_keys):
+                    output.extend(format_collection(key))
+
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error fetching collections: {str(e)}")
@@ -420,6 +1052,7 @@ def get_collections(limit: Optional[int] = None, *, ctx: Context) -> str:
     name="zotero_get_collection_items",
     description="Get all items in a specific Zotero collection.",
 )
+@run_in_worker_thread
 def get_collection_items(
     collection_key: str, limit: Optional[int] = 50, *, ctx: Context
 ) -> str:
@@ -436,44 +1069,51 @@ def get_collection_items(
     """
     try:
         ctx.info(f"Fetching items for collection {collection_key}")
-        zot = get_zotero_client()
-
-        # First get the collection details
-        try:
-            collection = zot.collection(collection_key)
-            collection_name = collection["data"].get("name", "Unnamed Collection")
-        except Exception:
-            collection_name = f"Collection {collection_key}"
-
-        # Then get the items
-        items = zot.collection_items(collection_key, limit=limit)
-        if not items:
-            return f"No items found in collection: {collection_name} (Key: {collection_key})"
-
-        # Format items as markdown
-        output = [f"# Items in Collection: {collection_name}", ""]
-
-        for i, item in enumerate(items, 1):
-            data = item.get("data", {})
-            title = data.get("title", "Untitled")
-            item_type = data.get("itemType", "unknown")
-            date = data.get("date", "No date")
-            key = item.get("key", "")
+        with zotero_client() as zot:
 
-            # Format creators
-            creators = data.get("creators", [])
-            creators_str = format_creators(creators)
+            mirror = get_synced_mirror(zot, ctx)
 
-            # Build the formatted entry
-            output.append(f"## {i}. {title}")
-            output.append(f"**Type:** {item_type}")
-            output.append(f"**Item Key:** {key}")
-            output.append(f"**Date:** {date}")
-            output.append(f"**Authors:** {creators_str}")
+            # First get the collection details
+            try:
+                collection = mirror.collection(collection_key) if mirror else None
+                if collection is None:
+                    collection = zot.collection(collection_key)
+                collection_name = collection["data"].get("name", "Unnamed Collection")
+            except Exception:
+                collection_name = f"Collection {collection_key}"
 
-            output.append("")  # Empty line between items
+            # Then get the items
+            if mirror:
+                items = mirror.collection_items(collection_key, limit=limit)
+            else:
+                items = zot.collection_items(collection_key, limit=limit)
+            if not items:
+                return f"No items found in collection: {collection_name} (Key: {collection_key})"
 
-        return "\n".join(output)
+            # Format items as markdown
+            output = [f"# Items in Collection: {collection_name}", ""]
+
+            for i, item in enumerate(items, 1):
+                data = item.get("data", {})
+                title = data.get("title", "Untitled")
+                item_type = data.get("itemType", "unknown")
+                date = data.get("date", "No date")
+                key = item.get("key", "")
+
+                # Format creators
+                creators = data.get("creators", [])
+                creators_str = format_creators(creators)
+
+                # Build the formatted entry
+                output.append(f"## {i}. {title}")
+                output.append(f"**Type:** {item_type}")
+                output.append(f"**Item Key:** {key}")
+                output.append(f"**Date:** {date}")
+                output.append(f"**Authors:** {creators_str}")
+
+                output.append("")  # Empty line between items
+
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error fetching collection items: {str(e)}")
@@ -484,7 +1124,7 @@ def get_collection_items(
     name="zotero_get_item_children",
     description="Get all child items (attachments, notes) for a specific Zotero item.",
 )
-def get_item_children(item_key: str, *, ctx: Context) -> str:
+async def get_item_children(item_key: str, *, ctx: Context) -> str:
     """
     Get all child items (attachments, notes) for a specific Zotero item.
 
@@ -496,18 +1136,29 @@ def get_item_children(item_key: str, *, ctx: Context) -> str:
         Markdown-formatted list of child items
     """
     try:
-        ctx.info(f"Fetching children for item {item_key}")
-        zot = get_zotero_client()
+        await ctx.info(f"Fetching children for item {item_key}")
+
+        mirror = await get_synced_mirror_async(ctx)
+        parent = mirror.item(item_key) if mirror else None
+        if parent is not None:
+            children = mirror.children(item_key)
+        else:
+            # The parent and its children are independent requests
+            client = get_async_client()
+            parent, children = await asyncio.gather(
+                client.item(item_key),
+                client.children(item_key),
+                return_exceptions=True,
+            )
+            if isinstance(children, BaseException):
+                raise children
 
-        # First get the parent item details
-        try:
-            parent = zot.item(item_key)
+        # A missing parent only costs the title
+        if isinstance(parent, dict):
             parent_title = parent["data"].get("title", "Untitled Item")
-        except Exception:
+        else:
             parent_title = f"Item {item_key}"
 
-        # Then get the children
-        children = zot.children(item_key)
         if not children:
             return f"No child items found for: {parent_title} (Key: {item_key})"
 
@@ -586,13 +1237,15 @@ def get_item_children(item_key: str, *, ctx: Context) -> str:
         return "\n".join(output)
 
     except Exception as e:
-        ctx.error(f"Error fetching item children: {str(e)}")
+        await ctx.error(f"Error fetching item children: {str(e)}")
         return f"Error fetching item children: {str(e)}"
 
 
 @mcp.tool(
     name="zotero_get_tags", description="Get all tags used in your Zotero library."
 )
+@cached_tool("zotero_get_tags", ttl=600, depends_on=(ITEMS,))
+@run_in_worker_thread
 def get_tags(limit: Optional[int] = None, *, ctx: Context) -> str:
     """
     Get all tags used in your Zotero library.
@@ -606,30 +1259,35 @@ def get_tags(limit: Optional[int] = None, *, ctx: Context) -> str:
     """
     try:
         ctx.info("Fetching tags")
-        zot = get_zotero_client()
+        with zotero_client() as zot:
 
-        tags = zot.tags(limit=limit)
-        if not tags:
-            return "No tags found in your Zotero library."
+            if mirror := get_synced_mirror(zot, ctx):
+                tags = mirror.tags(limit=limit)
+            else:
+                tags = [
+                    tag["tag"] for tag in fetch_all_pages(zot, "/tags", limit=limit)
+                ]
+            if not tags:
+                return "No tags found in your Zotero library."
 
-        # Format tags as markdown
-        output = ["# Zotero Tags", ""]
+            # Format tags as markdown
+            output = ["# Zotero Tags", ""]
 
-        # Sort tags alphabetically
-        sorted_tags = sorted(tags)
+            # Sort tags alphabetically
+            sorted_tags = sorted(tags)
 
-        # Group tags alphabetically
-        current_letter = None
-        for tag in sorted_tags:
-            first_letter = tag[0].upper() if tag else "#"
+            # Group tags alphabetically
+            current_letter = None
+            for tag in sorted_tags:
+                first_letter = tag[0].upper() if tag else "#"
 
-            if first_letter != current_letter:
-                current_letter = first_letter
-                output.append(f"## {current_letter}")
+                if first_letter != current_letter:
+                    current_letter = first_letter
+                    output.append(f"## {current_letter}")
 
-            output.append(f"- `{tag}`")
+                output.append(f"- `{tag}`")
 
-        return "\n".join(output)
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error fetching tags: {str(e)}")
@@ -640,6 +1298,8 @@ def get_tags(limit: Optional[int] = None, *, ctx: Context) -> str:
     name="zotero_get_recent",
     description="Get recently added items to your Zotero library.",
 )
+@cached_tool("zotero_get_recent", ttl=300, depends_on=(ITEMS,))
+@run_in_worker_thread
 def get_recent(limit: int = 10, *, ctx: Context) -> str:
     """
     Get recently added items to your Zotero library.
@@ -653,71 +1313,165 @@ def get_recent(limit: int = 10, *, ctx: Context) -> str:
     """
     try:
         ctx.info(f"Fetching {limit} recent items")
-        zot = get_zotero_client()
+        with zotero_client() as zot:
 
-        # Ensure limit is a reasonable number
-        if limit <= 0:
-            limit = 10
-        elif limit > 100:
-            limit = 100
+            # Ensure limit is a reasonable number
+            if limit <= 0:
+                limit = 10
+            elif limit > 100:
+                limit = 100
 
-        # Get recent items
-        items = zot.items(limit=limit, sort="dateAdded", direction="desc")
-        if not items:
-            return "No items found in your Zotero library."
+            # Get recent items
+            if mirror := get_synced_mirror(zot, ctx):
+                items = mirror.recent_items(limit=limit)
+            else:
+                items = zot.items(limit=limit, sort="dateAdded", direction="desc")
+            if not items:
+                return "No items found in your Zotero library."
 
-        # Format items as markdown
-        output = [f"# {limit} Most Recently Added Items", ""]
+            # Format items as markdown
+            output = [f"# {limit} Most Recently Added Items", ""]
 
-        for i, item in enumerate(items, 1):
-            data = item.get("data", {})
-            title = data.get("title", "Untitled")
-            item_type = data.get("itemType", "unknown")
-            date = data.get("date", "No date")
-            key = item.get("key", "")
-            date_added = data.get("dateAdded", "Unknown")
+            for i, item in enumerate(items, 1):
+                data = item.get("data", {})
+                title = data.get("title", "Untitled")
+                item_type = data.get("itemType", "unknown")
+                date = data.get("date", "No date")
+                key = item.get("key", "")
+                date_added = data.get("dateAdded", "Unknown")
 
-            # Format creators
-            creators = data.get("creators", [])
-            creators_str = format_creators(creators)
+                # Format creators
+                creators = data.get("creators", [])
+                creators_str = format_creators(creators)
 
-            # Build the formatted entry
-            output.append(f"## {i}. {title}")
-            output.append(f"**Type:** {item_type}")
-            output.append(f"**Item Key:** {key}")
-            output.append(f"**Date:** {date}")
-            output.append(f"**Added:** {date_added}")
-            output.append(f"**Authors:** {creators_str}")
+                # Build the formatted entry
+                output.append(f"## {i}. {title}")
+                output.append(f"**Type:** {item_type}")
+                output.append(f"**Item Key:** {key}")
+                output.append(f"**Date:** {date}")
+                output.append(f"**Added:** {date_added}")
+                output.append(f"**Authors:** {creators_str}")
 
-            output.append("")  # Empty line between items
+                output.append("")  # Empty line between items
 
-        return "\n".join(output)
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error fetching recent items: {str(e)}")
         return f"Error fetching recent items: {str(e)}"
 
 
+def _retag(
+    data: Dict[str, Any], add_tags: List[str], remove_tags: List[str]
+) -> Optional[Tuple[List[Dict[str, Any]], List[str], List[str]]]:
+    """
+    Apply tag changes to an item's data without modifying it.
+
+    Returns:
+        The new tag list with the tags actually added and removed, or None if
+        the item needs no update
+    """
+    current_tags = data.get("tags", [])
+    current_tag_values = {t["tag"] for t in current_tags}
+
+    new_tags = [t for t in current_tags if t["tag"] not in remove_tags]
+    removed = [t["tag"] for t in current_tags if t["tag"] in remove_tags]
+    added = []
+    for tag in add_tags:
+        if tag and tag not in current_tag_values and tag not in added:
+            new_tags.append({"tag": tag})
+            added.append(tag)
+
+    if not added and not removed:
+        return None
+    return new_tags, added, removed
+
+
+def _write_tag_batch(
+    zot,
+    items: List[Dict[str, Any]],
+    add_tags: List[str],
+    remove_tags: List[str],
+    added_tag_counts: Dict[str, int],
+    removed_tag_counts: Dict[str, int],
+) -> Tuple[int, List[str]]:
+    """
+    Write tag changes for up to WRITE_BATCH_SIZE items in one request.
+
+    Every object is sent with the version it was read at, so items changed by
+    someone else in the meantime are rejected with 412; only those are
+    re-fetched, re-tagged and written again.
+
+    Returns:
+        The number of items updated and a list of per-item errors
+    """
+    updated = 0
+    errors = []
+    pending = items
+    for attempt in range(MAX_WRITE_RETRIES + 1):
+        changes = []
+        for item in pending:
+            if result := _retag(item["data"], add_tags, remove_tags):
+                changes.append((item, *result))
+        if not changes:
+            break
+
+        response = write_items(
+            zot,
+            [
+                {"key": item["key"], "version": item["version"], "tags": new_tags}
+                for item, new_tags, _, _ in changes
+            ],
+        )
+
+        for index in response.get("success", {}):
+            _, _, added, removed = changes[int(index)]
+            for tag in added:
+                added_tag_counts[tag] += 1
+            for tag in removed:
+                removed_tag_counts[tag] += 1
+            updated += 1
+
+        conflicts = []
+        for index, failure in response.get("failed", {}).items():
+            key = changes[int(index)][0]["key"]
+            if failure.get("code") == 412 and attempt < MAX_WRITE_RETRIES:
+                conflicts.append(key)
+            else:
+                errors.append(f"{key}: {failure.get('message', 'unknown error')}")
+        if not conflicts:
+            break
+
+        # Someone else changed these items; start over from their current state
+        pending = zot.items(itemKey=",".join(conflicts), limit=len(conflicts))
+
+    return updated, errors
+
+
 @mcp.tool(
     name="zotero_batch_update_tags",
     description="Batch update tags across multiple items matching a search query.",
 )
+@run_in_worker_thread
 def batch_update_tags(
     query: str,
     add_tags: Optional[List[str]] = None,
     remove_tags: Optional[List[str]] = None,
-    limit: int = 50,
+    limit: Optional[int] = None,
     *,
     ctx: Context,
 ) -> str:
     """
     Batch update tags across multiple items matching a search query.
 
+    Items are written 50 at a time and progress is reported as batches
+    complete, so whole-library updates are practical.
+
     Args:
         query: Search query to find items to update
         add_tags: List of tags to add to matched items
         remove_tags: List of tags to remove from matched items
-        limit: Maximum number of items to process
+        limit: Maximum number of items to process (default: all matches)
         ctx: MCP context
 
     Returns:
@@ -730,82 +1484,87 @@ def batch_update_tags(
         if not add_tags and not remove_tags:
             return "Error: You must specify either tags to add or tags to remove"
 
-        ctx.info(f"Batch updating tags for items matching '{query}'")
-        zot = get_zotero_client()
-
-        # Search for items matching the query
-        zot.add_parameters(q=query, limit=limit)
-        items = zot.items()
+        add_tags = add_tags or []
+        remove_tags = remove_tags or []
 
-        if not items:
-            return f"No items found matching query: '{query}'"
+        ctx.info(f"Batch updating tags for items matching '{query}'")
+        with zotero_client() as zot:
 
-        # Initialize counters
-        updated_count = 0
-        skipped_count = 0
-        added_tag_counts = {tag: 0 for tag in (add_tags or [])}
-        removed_tag_counts = {tag: 0 for tag in (remove_tags or [])}
+            # Search for items matching the query
+            if mirror := get_synced_mirror(zot, ctx):
+                matches = mirror.search_items(query, limit=limit)
+                items, total = iter(matches), len(matches)
+            else:
+                items = iter_pages(zot.items, limit=limit, q=query)
+                total = None
+
+            # Initialize counters
+            processed_count = 0
+            updated_count = 0
+            skipped_count = 0
+            errors = []
+            added_tag_counts = {tag: 0 for tag in add_tags}
+            removed_tag_counts = {tag: 0 for tag in remove_tags}
+
+            # Process the matches one multi-object write at a time
+            while batch := list(itertools.islice(items, WRITE_BATCH_SIZE)):
+                if total is None and zot.request is not None:
+                    total_results = int(zot.request.headers.get("Total-Results", 0))
+                    total = min(total_results, limit) if limit else total_results
+                processed_count += len(batch)
+
+                # Skip attachments if they were included in the results
+                candidates = [
+                    item
+                    for item in batch
+                    if item["data"].get("itemType") != "attachment"
+                ]
+                updated, batch_errors = _write_tag_batch(
+                    zot,
+                    candidates,
+                    add_tags,
+                    remove_tags,
+                    added_tag_counts,
+                    removed_tag_counts,
+                )
+                updated_count += updated
+                errors.extend(batch_errors)
+                skipped_count += len(batch) - updated - len(batch_errors)
 
-        # Process each item
-        for item in items:
-            # Skip attachments if they were included in the results
-            if item["data"].get("itemType") == "attachment":
-                skipped_count += 1
-                continue
+                ctx.report_progress(processed_count, total)
 
-            # Get current tags
-            current_tags = item["data"].get("tags", [])
-            current_tag_values = {t["tag"] for t in current_tags}
+            if not processed_count:
+                return f"No items found matching query: '{query}'"
 
-            # Track if this item needs to be updated
-            needs_update = False
+            # Later reads must pick up our own writes
+            if updated_count:
+                invalidate_library_caches()
 
-            # Process tags to remove
-            if remove_tags:
-                new_tags = []
-                for tag_obj in current_tags:
-                    tag = tag_obj["tag"]
-                    if tag in remove_tags:
-                        removed_tag_counts[tag] += 1
-                        needs_update = True
-                    else:
-                        new_tags.append(tag_obj)
-                current_tags = new_tags
+            # Format the response
+            response = ["# Batch Tag Update Results", ""]
+            response.append(f"Query: '{query}'")
+            response.append(f"Items processed: {processed_count}")
+            response.append(f"Items updated: {updated_count}")
+            response.append(f"Items skipped: {skipped_count}")
+            if errors:
+                response.append(f"Items failed: {len(errors)}")
 
-            # Process tags to add
             if add_tags:
-                for tag in add_tags:
-                    if tag and tag not in current_tag_values:
-                        current_tags.append({"tag": tag})
-                        added_tag_counts[tag] += 1
-                        needs_update = True
-
-            # Update the item if needed
-            if needs_update:
-                item["data"]["tags"] = current_tags
-                zot.update_item(item)
-                updated_count += 1
-            else:
-                skipped_count += 1
+                response.append("\n## Tags Added")
+                for tag, count in added_tag_counts.items():
+                    response.append(f"- `{tag}`: {count} items")
 
-        # Format the response
-        response = ["# Batch Tag Update Results", ""]
-        response.append(f"Query: '{query}'")
-        response.append(f"Items processed: {len(items)}")
-        response.append(f"Items updated: {updated_count}")
-        response.append(f"Items skipped: {skipped_count}")
-
-        if add_tags:
-            response.append("\n## Tags Added")
-            for tag, count in added_tag_counts.items():
-                response.append(f"- `{tag}`: {count} items")
+            if remove_tags:
+                response.append("\n## Tags Removed")
+                for tag, count in removed_tag_counts.items():
+                    response.append(f"- `{tag}`: {count} items")
 
-        if remove_tags:
-            response.append("\n## Tags Removed")
-            for tag, count in removed_tag_counts.items():
-                response.append(f"- `{tag}`: {count} items")
+            if errors:
+                response.append("\n## Errors")
+                for error in errors:
+                    response.append(f"- {error}")
 
-        return "\n".join(response)
+            return "\n".join(response)
 
     except Exception as e:
         ctx.error(f"Error in batch tag update: {str(e)}")
@@ -816,6 +1575,7 @@ def batch_update_tags(
     name="zotero_advanced_search",
     description="Perform an advanced search with multiple criteria.",
 )
+@run_in_worker_thread
 def advanced_search(
     conditions: List[Dict[str, str]],
     join_mode: Literal["all", "any"] = "all",
@@ -828,10 +1588,15 @@ def advanced_search(
     """
     Perform an advanced search with multiple criteria.
 
+    Conditions are evaluated against the local mirror of the library, which is
+    synced incrementally first, so a search never writes to the library.
+
     Args:
         conditions: List of search condition dictionaries, each containing:
-                   - field: The field to search (title, creator, date, tag, etc.)
-                   - operation: The operation to perform (is, isNot, contains, etc.)
+                   - field: The field to search (title, creator, date, tag,
+                     itemType, collection, dateAdded, fulltextContent, etc.)
+                   - operation: The operation to perform (is, isNot, contains,
+                     doesNotContain, beginsWith, isBefore, isAfter, isInTheLast, etc.)
                    - value: The value to search for
         join_mode: Whether all conditions must match ("all") or any condition can match ("any")
         sort_by: Field to sort by (dateAdded, dateModified, title, creator, etc.)
@@ -846,21 +1611,6 @@ def advanced_search(
         if not conditions:
             return "Error: No search conditions provided"
 
-        ctx.info(f"Performing advanced search with {len(conditions)} conditions")
-        zot = get_zotero_client()
-
-        # Prepare search parameters
-        params = {}
-
-        # Add sorting parameters if specified
-        if sort_by:
-            params["sort"] = sort_by
-            params["direction"] = sort_direction
-
-        # Add limit parameter
-        params["limit"] = limit
-
-        # Build search conditions
         search_conditions = []
         for i, condition in enumerate(conditions):
             if (
@@ -869,106 +1619,90 @@ def advanced_search(
                 or "value" not in condition
             ):
                 return f"Error: Condition {i+1} is missing required fields (field, operation, value)"
+            search_conditions.append(SearchCondition.from_dict(condition))
 
-            # Map common field names to Zotero API fields if needed
-            field = condition["field"]
-            operation = condition["operation"]
-            value = condition["value"]
-
-            # Handle special fields
-            if field == "author" or field == "creator":
-                field = "creator"
-            elif field == "year":
-                field = "date"
-                # Convert year to partial date format for matching
-                value = str(value)
-
-            search_conditions.append(
-                {"condition": field, "operator": operation, "value": value}
-            )
-
-        # Add join mode condition
-        search_conditions.append(
-            {"condition": "joinMode", "operator": join_mode, "value": ""}
-        )
-
-        # Create a saved search
-        search_name = f"temp_search_{uuid.uuid4().hex[:8]}"
-        saved_search = zot.saved_search(search_name, search_conditions)
+        ctx.info(f"Performing advanced search with {len(conditions)} conditions")
+        with zotero_client() as zot:
 
-        # Extract the search key from the result
-        if not saved_search.get("success"):
-            return f"Error creating saved search: {saved_search.get('failed', 'Unknown error')}"
+            # Evaluated locally: no temporary saved search, no library writes
+            mirror = get_synced_mirror(zot, ctx, even_if_disabled=True)
+            if mirror is None:
+                return "Error: The local library mirror could not be synced"
 
-        search_key = next(iter(saved_search.get("success", {}).values()), None)
+            if any(c.field == "fulltextContent" for c in search_conditions):
+                indexed = mirror.ensure_fulltext_synced(zot, get_mirror_sync_interval())
+                if indexed:
+                    ctx.info(f"Indexed full text of {indexed} attachments")
 
-        # Execute the saved search
-        try:
-            results = zot.collection_items(search_key)
-        finally:
-            # Clean up the temporary saved search
             try:
-                zot.delete_saved_search([search_key])
-            except Exception as cleanup_error:
-                ctx.warn(f"Error cleaning up saved search: {str(cleanup_error)}")
+                results = run_advanced_search(
+                    mirror,
+                    search_conditions,
+                    join_mode=join_mode,
+                    sort_by=sort_by or "",
+                    sort_direction=sort_direction,
+                    limit=limit,
+                )
+            except SearchConditionError as e:
+                return f"Error: {str(e)}"
 
-        # Format the results
-        if not results:
-            return "No items found matching the search criteria."
+            # Format the results
+            if not results:
+                return "No items found matching the search criteria."
 
-        output = ["# Advanced Search Results", ""]
-        output.append(f"Found {len(results)} items matching the search criteria:")
-        output.append("")
+            output = ["# Advanced Search Results", ""]
+            output.append(f"Found {len(results)} items matching the search criteria:")
+            output.append("")
 
-        # Add search criteria summary
-        output.append("## Search Criteria")
-        output.append(f"Join mode: {join_mode.upper()}")
+            # Add search criteria summary
+            output.append("## Search Criteria")
+            output.append(f"Join mode: {join_mode.upper()}")
 
-        for i, condition in enumerate(conditions, 1):
-            output.append(
-                f"{i}. {condition['field']} {condition['operation']} \"{condition['value']}\""
-            )
+            for i, condition in enumerate(conditions, 1):
+                output.append(
+                    f"{i}. {condition['field']} {condition['operation']} \"{condition['value']}\""
+                )
 
-        output.append("")
+            output.append("")
 
-        # Format results
-        output.append("## Results")
+            # Format results
+            output.append("## Results")
 
-        for i, item in enumerate(results, 1):
-            data = item.get("data", {})
-            title = data.get("title", "Untitled")
-            item_type = data.get("itemType", "unknown")
-            date = data.get("date", "No date")
-            key = item.get("key", "")
-
-            # Format creators
-            creators = data.get("creators", [])
-            creators_str = format_creators(creators)
-
-            # Build the formatted entry
-            output.append(f"### {i}. {title}")
-            output.append(f"**Type:** {item_type}")
-            output.append(f"**Item Key:** {key}")
-            output.append(f"**Date:** {date}")
-            output.append(f"**Authors:** {creators_str}")
-
-            # Add abstract snippet if present
-            if abstract := data.get("abstractNote"):
-                # Limit abstract length for search results
-                abstract_snippet = (
-                    abstract[:150] + "..." if len(abstract) > 150 else abstract
-                )
-                output.append(f"**Abstract:** {abstract_snippet}")
+            for i, item in enumerate(results, 1):
+                data = item.get("data", {})
+                title = data.get("title", "Untitled")
+                item_type = data.get("itemType", "unknown")
+                date = data.get("date", "No date")
+                key = item.get("key", "")
+
+                # Format creators
+                creators = data.get("creators", [])
+                creators_str = format_creators(creators)
+
+                # Build the formatted entry
+                output.append(f"### {i}. {title}")
+                output.append(f"**Type:** {item_type}")
+                output.append(f"**Item Key:** {key}")
+                output.append(f"**Date:** {date}")
+                output.append(f"**Authors:** {creators_str}")
+
+                # Add abstract snippet if present
+                if abstract := data.get("abstractNote"):
+                    # Limit abstract length for search results
+                    abstract_snippet = (
+                        abstract[:150] + "..." if len(abstract) > 150 else abstract
+                    )
+                    output.append(f"**Abstract:** {abstract_snippet}")
 
-            # Add tags if present
-            if tags := data.get("tags"):
-                tag_list = [f"`{tag['tag']}`" for tag in tags]
-                if tag_list:
-                    output.append(f"**Tags:** {' '.join(tag_list)}")
+                # Add tags if present
+                if tags := data.get("tags"):
+                    tag_list = [f"`{tag['tag']}`" for tag in tags]
+                    if tag_list:
+                        output.append(f"**Tags:** {' '.join(tag_list)}")
 
-            output.append("")  # Empty line between items
+                output.append("")  # Empty line between items
 
-        return "\n".join(output)
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error in advanced search: {str(e)}")
@@ -979,10 +1713,12 @@ def advanced_search(
     name="zotero_get_annotations",
     description="Get all annotations for a specific item or across your entire Zotero library.",
 )
+@run_in_worker_thread
 def get_annotations(
     item_key: Optional[str] = None,
     use_pdf_extraction: bool = False,
     limit: Optional[int] = None,
+    start: int = 0,
     *,
     ctx: Context,
 ) -> str:
@@ -992,7 +1728,9 @@ def get_annotations(
     Args:
         item_key: Optional Zotero item key/ID to filter annotations by parent item
         use_pdf_extraction: Whether to attempt direct PDF extraction as a fallback
-        limit: Maximum number of annotations to return
+        limit: Maximum number of annotations to return (library-wide default: 50)
+        start: Offset of the first library-wide annotation, to continue a
+            previous call
         ctx: MCP context
 
     Returns:
@@ -1000,211 +1738,112 @@ def get_annotations(
     """
     try:
         # Initialize Zotero client
-        zot = get_zotero_client()
-
-        # Prepare annotations list
-        annotations = []
-        parent_title = "Untitled Item"
-
-        # If an item key is provided, use specialized retrieval
-        if item_key:
-            # First, verify the item exists and get its details
-            try:
-                parent = zot.item(item_key)
+        with zotero_client() as zot, count_upstream_requests() as upstream:
+
+            # Prepare annotations list
+            annotations: List[Annotation] = []
+            parent_title = "Untitled Item"
+            total_results = None
+
+            # If an item key is provided, use specialized retrieval
+            if item_key:
+                # The item and its children are independent requests
+                parent, children = gather_from_thread(
+                    lambda: get_async_client().item(item_key),
+                    lambda: get_async_client().children(item_key),
+                )
+                if not isinstance(parent, dict):
+                    return f"Error: No item found with key: {item_key}"
                 parent_title = parent["data"].get("title", "Untitled Item")
                 ctx.info(f"Fetching annotations for item: {parent_title}")
-            except Exception:
-                return f"Error: No item found with key: {item_key}"
 
-            # Initialize annotation sources
-            zotero_api_annotations = []
-            pdf_annotations = []
+                # Initialize annotation sources
+                zotero_api_annotations = []
+                pdf_annotations = []
 
-            # Fallback to Zotero API annotations
-            try:
-                # Get child annotations via Zotero API
-                children = zot.children(item_key)
-                zotero_api_annotations = [
-                    item
-                    for item in children
-                    if item.get("data", {}).get("itemType") == "annotation"
-                ]
-                ctx.info(
-                    f"Retrieved {len(zotero_api_annotations)} annotations via Zotero API"
-                )
-            except Exception as api_error:
-                ctx.warn(f"Error retrieving Zotero API annotations: {api_error}")
-
-            # PDF Extraction fallback
-            if use_pdf_extraction and not zotero_api_annotations:
-                try:
-                    from zotero_web_mcp.pdfannots_helper import (
-                        extract_annotations_from_pdf,
-                        ensure_pdfannots_installed,
+                # Child annotations via the Zotero API
+                if isinstance(children, BaseException):
+                    ctx.warning(f"Error retrieving Zotero API annotations: {children}")
+                    children = []
+                else:
+                    zotero_api_annotations = [
+                        Annotation.from_item(item)
+                        for item in children
+                        if item.get("data", {}).get("itemType") == "annotation"
+                    ]
+                    ctx.info(
+                        f"Retrieved {len(zotero_api_annotations)} annotations via Zotero API"
                     )
-                    import tempfile
-                    import uuid
 
-                    # Ensure PDF annotation tool is installed
-                    if ensure_pdfannots_installed():
-                        # Get PDF attachments
-                        children = zot.children(item_key)
+                # PDF Extraction fallback
+                if use_pdf_extraction and not zotero_api_annotations:
+                    try:
                         pdf_attachments = [
                             item
                             for item in children
                             if item.get("data", {}).get("contentType")
                             == "application/pdf"
                         ]
-
-                        # Extract annotations from PDFs
-                        for attachment in pdf_attachments:
-                            with tempfile.TemporaryDirectory() as tmpdir:
-                                att_key = attachment.get("key", "")
-                                file_path = os.path.join(tmpdir, f"{att_key}.pdf")
-                                zot.dump(att_key, file_path)
-
-                                if os.path.exists(file_path):
-                                    extracted = extract_annotations_from_pdf(
-                                        file_path, tmpdir
-                                    )
-
-                                    for ext in extracted:
-                                        # Skip empty annotations
-                                        if not ext.get("annotatedText") and not ext.get(
-                                            "comment"
-                                        ):
-                                            continue
-
-                                        # Create Zotero-like annotation object
-                                        pdf_anno = {
-                                            "key": f"pdf_{att_key}_{ext.get('id', uuid.uuid4().hex[:8])}",
-                                            "data": {
-                                                "itemType": "annotation",
-                                                "annotationType": ext.get(
-                                                    "type", "highlight"
-                                                ),
-                                                "annotationText": ext.get(
-                                                    "annotatedText", ""
-                                                ),
-                                                "annotationComment": ext.get(
-                                                    "comment", ""
-                                                ),
-                                                "annotationColor": ext.get("color", ""),
-                                                "parentItem": item_key,
-                                                "tags": [],
-                                                "_pdf_page": ext.get("page", 0),
-                                                "_from_pdf_extraction": True,
-                                                "_attachment_title": attachment.get(
-                                                    "data", {}
-                                                ).get("title", "PDF"),
-                                            },
-                                        }
-
-                                        # Handle image annotations
-                                        if ext.get("type") == "image" and ext.get(
-                                            "imageRelativePath"
-                                        ):
-                                            pdf_anno["data"]["_image_path"] = (
-                                                os.path.join(
-                                                    tmpdir, ext.get("imageRelativePath")
-                                                )
-                                            )
-
-                                        pdf_annotations.append(pdf_anno)
-
+                        pdf_annotations = extract_pdf_annotations(
+                            zot, pdf_attachments, item_key
+                        )
                         ctx.info(
                             f"Retrieved {len(pdf_annotations)} annotations via PDF extraction"
                         )
-                except Exception as pdf_error:
-                    ctx.warn(f"Error during PDF annotation extraction: {pdf_error}")
-
-            # Combine annotations from all sources
-            annotations = zotero_api_annotations + pdf_annotations
-
-        else:
-            # Retrieve all annotations in the library
-            zot.add_parameters(itemType="annotation", limit=limit or 50)
-            annotations = zot.everything(zot.items())
-
-        # Handle no annotations found
-        if not annotations:
-            return f"No annotations found{f' for item: {parent_title}' if item_key else ''}."
-
-        # Generate markdown output
-        output = [f"# Annotations{f' for: {parent_title}' if item_key else ''}", ""]
-
-        for i, anno in enumerate(annotations, 1):
-            data = anno.get("data", {})
-
-            # Annotation details
-            anno_type = data.get("annotationType", "Unknown type")
-            anno_text = data.get("annotationText", "")
-            anno_comment = data.get("annotationComment", "")
-            anno_color = data.get("annotationColor", "")
-            anno_key = anno.get("key", "")
-
-            # Parent item context for library-wide retrieval
-            parent_info = ""
-            if not item_key and (parent_key := data.get("parentItem")):
-                try:
-                    parent = zot.item(parent_key)
-                    parent_title = parent["data"].get("title", "Untitled")
-                    parent_info = f' (from "{parent_title}")'
-                except Exception:
-                    parent_info = f" (parent key: {parent_key})"
-
-            # Annotation source details
-            source_info = ""
-            if data.get("_from_better_bibtex", False):
-                source_info = " (extracted via Better BibTeX)"
-            elif data.get("_from_pdf_extraction", False):
-                source_info = " (extracted directly from PDF)"
-
-            # Attachment context
-            attachment_info = ""
-            if "_attachment_title" in data and data["_attachment_title"]:
-                attachment_info = f" in {data['_attachment_title']}"
-
-            # Build markdown annotation entry
-            output.append(
-                f"## Annotation {i}{parent_info}{attachment_info}{source_info}"
-            )
-            output.append(f"**Type:** {anno_type}")
-            output.append(f"**Key:** {anno_key}")
+                    except Exception as pdf_error:
+                        ctx.warning(
+                            f"Error during PDF annotation extraction: {pdf_error}"
+                        )
 
-            # Color information
-            if anno_color:
-                output.append(f"**Color:** {anno_color}")
-                if "_color_category" in data and data["_color_category"]:
-                    output.append(f"**Color Category:** {data['_color_category']}")
+                # Combine annotations from all sources
+                annotations = zotero_api_annotations + pdf_annotations
+                if limit:
+                    annotations = annotations[:limit]
 
-            # Page information
-            if "_pdf_page" in data:
-                label = data.get("_pageLabel", str(data["_pdf_page"]))
-                output.append(f"**Page:** {data['_pdf_page']} (Label: {label})")
+            else:
+                # Page through the library's annotations until we have enough
+                annotations = fetch_library_annotations(
+                    zot, limit=limit or 50, start=start
+                )
+                if zot.request is not None:
+                    total_results = zot.request.headers.get("Total-Results")
 
-            # Annotation content
-            if anno_text:
-                output.append(f"**Text:** {anno_text}")
+            # Handle no annotations found
+            if not annotations:
+                return f"No annotations found{f' for item: {parent_title}' if item_key else ''}."
 
-            if anno_comment:
-                output.append(f"**Comment:** {anno_comment}")
+            # Resolve all parent items up front, in batches
+            parents = None
+            if not item_key:
+                parents = ParentResolver(zot, get_synced_mirror(zot, ctx))
+                try:
+                    resolve_parents(parents, (anno.parent_key for anno in annotations))
+                except Exception as parent_error:
+                    ctx.warning(f"Error resolving parent items: {parent_error}")
+
+            # Generate markdown output
+            output = [
+                format_annotations(
+                    annotations,
+                    f"# Annotations{f' for: {parent_title}' if item_key else ''}",
+                    parents,
+                )
+            ]
 
-            # Image annotation
-            if "_image_path" in data and os.path.exists(data["_image_path"]):
+            # Tell the caller where to continue
+            if total_results is not None:
+                end = start + len(annotations)
                 output.append(
-                    f"**Image:** This annotation includes an image (not displayed in this interface)"
+                    f"_Showing annotations {start + 1}-{end} of {total_results}._"
                 )
+                if end < int(total_results):
+                    output.append(f"_Call again with start={end} to get more._")
 
-            # Tags
-            if tags := data.get("tags"):
-                tag_list = [f"`{tag['tag']}`" for tag in tags]
-                if tag_list:
-                    output.append(f"**Tags:** {' '.join(tag_list)}")
-
-            output.append("")  # Empty line between annotations
-
-        return "\n".join(output)
+            ctx.info(
+                f"Retrieved {len(annotations)} annotations "
+                f"with {upstream.requests} upstream requests"
+            )
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error fetching annotations: {str(e)}")
@@ -1215,6 +1854,7 @@ def get_annotations(
     name="zotero_get_notes",
     description="Retrieve notes from your Zotero library, with options to filter by parent item.",
 )
+@run_in_worker_thread
 def get_notes(
     item_key: Optional[str] = None, limit: Optional[int] = 20, *, ctx: Context
 ) -> str:
@@ -1231,61 +1871,74 @@ def get_notes(
     """
     try:
         ctx.info(f"Fetching notes{f' for item {item_key}' if item_key else ''}")
-        zot = get_zotero_client()
+        with zotero_client() as zot, count_upstream_requests() as upstream:
 
-        # Prepare search parameters
-        params = {"itemType": "note"}
-        if item_key:
-            params["parentItem"] = item_key
+            # Prepare search parameters
+            params = {"itemType": "note"}
+            if item_key:
+                params["parentItem"] = item_key
 
-        # Get notes
-        notes = zot.items(**params) if not limit else zot.items(limit=limit, **params)
+            # Get notes
+            mirror = get_synced_mirror(zot, ctx)
+            if mirror:
+                notes = mirror.notes(item_key, limit=limit)
+            else:
+                notes = (
+                    zot.items(**params)
+                    if not limit
+                    else zot.items(limit=limit, **params)
+                )
 
-        if not notes:
-            return f"No notes found{f' for item {item_key}' if item_key else ''}."
+            if not notes:
+                return f"No notes found{f' for item {item_key}' if item_key else ''}."
 
-        # Generate markdown output
-        output = [f"# Notes{f' for Item: {item_key}' if item_key else ''}", ""]
+            # Resolve all parent items up front, in batches
+            parents = ParentResolver(zot, mirror)
+            try:
+                resolve_parents(
+                    parents, (note.get("data", {}).get("parentItem") for note in notes)
+                )
+            except Exception as parent_error:
+                ctx.warning(f"Error resolving parent items: {parent_error}")
 
-        for i, note in enumerate(notes, 1):
-            data = note.get("data", {})
-            note_key = note.get("key", "")
+            # Generate markdown output
+            output = [f"# Notes{f' for Item: {item_key}' if item_key else ''}", ""]
 
-            # Parent item context
-            parent_info = ""
-            if parent_key := data.get("parentItem"):
-                try:
-                    parent = zot.item(parent_key)
-                    parent_title = parent["data"].get("title", "Untitled")
-                    parent_info = f' (from "{parent_title}")'
-                except Exception:
-                    parent_info = f" (parent key: {parent_key})"
+            for i, note in enumerate(notes, 1):
+                data = note.get("data", {})
+                note_key = note.get("key", "")
+
+                # Parent item context
+                parent_info = parents.parent_info(data.get("parentItem"))
 
-            # Prepare note text
-            note_text = data.get("note", "")
+                # Prepare note text
+                note_text = data.get("note", "")
 
-            # Clean up HTML formatting
-            note_text = note_text.replace("<p>", "").replace("</p>", "\n\n")
-            note_text = note_text.replace("<br/>", "\n").replace("<br>", "\n")
+                # Clean up HTML formatting
+                note_text = note_text.replace("<p>", "").replace("</p>", "\n\n")
+                note_text = note_text.replace("<br/>", "\n").replace("<br>", "\n")
 
-            # Limit note length for display
-            if len(note_text) > 500:
-                note_text = note_text[:500] + "..."
+                # Limit note length for display
+                if len(note_text) > 500:
+                    note_text = note_text[:500] + "..."
 
-            # Build markdown entry
-            output.append(f"## Note {i}{parent_info}")
-            output.append(f"**Key:** {note_key}")
+                # Build markdown entry
+                output.append(f"## Note {i}{parent_info}")
+                output.append(f"**Key:** {note_key}")
 
-            # Tags
-            if tags := data.get("tags"):
-                tag_list = [f"`{tag['tag']}`" for tag in tags]
-                if tag_list:
-                    output.append(f"**Tags:** {' '.join(tag_list)}")
+                # Tags
+                if tags := data.get("tags"):
+                    tag_list = [f"`{tag['tag']}`" for tag in tags]
+                    if tag_list:
+                        output.append(f"**Tags:** {' '.join(tag_list)}")
 
-            output.append(f"**Content:**\n{note_text}")
-            output.append("")  # Empty line between notes
+                output.append(f"**Content:**\n{note_text}")
+                output.append("")  # Empty line between notes
 
-        return "\n".join(output)
+            ctx.info(
+                f"Retrieved {len(notes)} notes with {upstream.requests} upstream requests"
+            )
+            return "\n".join(output)
 
     except Exception as e:
         ctx.error(f"Error fetching notes: {str(e)}")
@@ -1296,6 +1949,7 @@ def get_notes(
     name="zotero_search_notes",
     description="Search for notes across your Zotero library.",
 )
+@run_in_worker_thread
 def search_notes(query: str, limit: Optional[int] = 20, *, ctx: Context) -> str:
     """
     Search for notes in your Zotero library.
@@ -1313,126 +1967,115 @@ def search_notes(query: str, limit: Optional[int] = 20, *, ctx: Context) -> str:
             return "Error: Search query cannot be empty"
 
         ctx.info(f"Searching Zotero notes for '{query}'")
-        zot = get_zotero_client()
+        with zotero_client() as zot:
 
-        # Search for notes and annotations
-        results = []
+            # Search for notes and annotations
+            mirror = get_synced_mirror(zot, ctx)
 
-        # First search notes
-        zot.add_parameters(q=query, itemType="note", limit=limit or 20)
-        notes = zot.items()
+            # First search notes
+            zot.add_parameters(q=query, itemType="note", limit=limit or 20)
+            notes = zot.items()
 
-        # Then search annotations (reusing the get_annotations function)
-        annotation_results = get_annotations(
-            item_key=None,  # Search all annotations
-            use_pdf_extraction=True,
-            limit=limit or 20,
-            ctx=ctx,
-        )
+            # Then search annotation records by their text, comment and tags
+            annotations = search_annotations(
+                zot, query, limit=limit or 20, mirror=mirror
+            )
 
-        # Parse the annotation results to extract annotation items
-        # This is a bit hacky and depends on the exact formatting of get_annotations
-        # You might want to modify get_annotations to return a more structured result
-        annotation_lines = annotation_results.split("\n")
-        current_annotation = None
-        annotations = []
-
-        for line in annotation_lines:
-            if line.startswith("## "):
-                if current_annotation:
-                    annotations.append(current_annotation)
-                current_annotation = {"lines": [line], "type": "annotation"}
-            elif current_annotation is not None:
-                current_annotation["lines"].append(line)
-
-        if current_annotation:
-            annotations.append(current_annotation)
-
-        # Format results
-        output = [f"# Search Results for '{query}'", ""]
-
-        # Filter and highlight notes
-        query_lower = query.lower()
-        note_results = []
-
-        for note in notes:
-            data = note.get("data", {})
-            note_text = data.get("note", "").lower()
-
-            if query_lower in note_text:
-                # Prepare full note details
-                note_result = {"type": "note", "key": note.get("key", ""), "data": data}
-                note_results.append(note_result)
-
-        # Combine and sort results
-        all_results = note_results + annotations
-
-        for i, result in enumerate(all_results, 1):
-            if result["type"] == "note":
-                # Note formatting
-                data = result["data"]
-                key = result["key"]
+            # Format results
+            output = [f"# Search Results for '{query}'", ""]
 
-                # Parent item context
-                parent_info = ""
-                if parent_key := data.get("parentItem"):
-                    try:
-                        parent = zot.item(parent_key)
-                        parent_title = parent["data"].get("title", "Untitled")
-                        parent_info = f' (from "{parent_title}")'
-                    except Exception:
-                        parent_info = f" (parent key: {parent_key})"
+            # Filter and highlight notes
+            query_lower = query.lower()
+            note_results = []
 
-                # Note text with query highlight
-                note_text = data.get("note", "")
-                note_text = note_text.replace("<p>", "").replace("</p>", "\n\n")
-                note_text = note_text.replace("<br/>", "\n").replace("<br>", "\n")
-
-                # Highlight query in note text
-                try:
-                    # Find first occurrence of query and extract context
-                    text_lower = note_text.lower()
-                    pos = text_lower.find(query_lower)
-                    if pos >= 0:
-                        # Extract context around the query
-                        start = max(0, pos - 100)
-                        end = min(len(note_text), pos + 200)
-                        context = note_text[start:end]
-
-                        # Highlight the query in the context
-                        highlighted = context.replace(
-                            context[
-                                context.lower()
-                                .find(query_lower) : context.lower()
-                                .find(query_lower)
-                                + len(query)
-                            ],
-                            f"**{context[context.lower().find(query_lower):context.lower().find(query_lower)+len(query)]}**",
+            for note in notes:
+                data = note.get("data", {})
+                note_text = data.get("note", "").lower()
+
+                if query_lower in note_text:
+                    # Prepare full note details
+                    note_result = {
+                        "type": "note",
+                        "key": note.get("key", ""),
+                        "data": data,
+                    }
+                    note_results.append(note_result)
+
+            # Combine and sort results
+            all_results = note_results + annotations
+
+            # Resolve the parents of all matching notes and annotations in batches
+            parents = ParentResolver(zot, mirror)
+            try:
+                resolve_parents(
+                    parents,
+                    [note["data"].get("parentItem") for note in note_results]
+                    + [anno.parent_key for anno in annotations],
+                )
+            except Exception as parent_error:
+                ctx.warning(f"Error resolving parent items: {parent_error}")
+
+            for i, result in enumerate(all_results, 1):
+                if isinstance(result, Annotation):
+                    output.extend(
+                        format_annotation(
+                            result, i, parents.parent_info(result.parent_key)
                         )
+                    )
 
-                        note_text = highlighted + "..."
-                except Exception:
-                    # Fallback to first 500 characters if highlighting fails
-                    note_text = note_text[:500] + "..."
+                elif result["type"] == "note":
+                    # Note formatting
+                    data = result["data"]
+                    key = result["key"]
 
-                output.append(f"## Note {i}{parent_info}")
-                output.append(f"**Key:** {key}")
+                    # Parent item context
+                    parent_info = parents.parent_info(data.get("parentItem"))
 
-                # Tags
-                if tags := data.get("tags"):
-                    tag_list = [f"`{tag['tag']}`" for tag in tags]
-                    if tag_list:
-                        output.append(f"**Tags:** {' '.join(tag_list)}")
+                    # Note text with query highlight
+                    note_text = data.get("note", "")
+                    note_text = note_text.replace("<p>", "").replace("</p>", "\n\n")
+                    note_text = note_text.replace("<br/>", "\n").replace("<br>", "\n")
 
-                output.append(f"**Content:**\n{note_text}")
-                output.append("")
+                    # Highlight query in note text
+                    try:
+                        # Find first occurrence of query and extract context
+                        text_lower = note_text.lower()
+                        pos = text_lower.find(query_lower)
+                        if pos >= 0:
+                            # Extract context around the query
+                            start = max(0, pos - 100)
+                            end = min(len(note_text), pos + 200)
+                            context = note_text[start:end]
+
+                            # Highlight the query in the context
+                            highlighted = context.replace(
+                                context[
+                                    context.lower()
+                                    .find(query_lower) : context.lower()
+                                    .find(query_lower)
+                                    + len(query)
+                                ],
+                                f"**{context[context.lower().find(query_lower):context.lower().find(query_lower)+len(query)]}**",
+                            )
+
+                            note_text = highlighted + "..."
+                    except Exception:
+                        # Fallback to first 500 characters if highlighting fails
+                        note_text = note_text[:500] + "..."
 
-            elif result["type"] == "annotation":
-                # Add the entire annotation block
-                output.extend(result["lines"])
-                output.append("")
+                    output.append(f"## Note {i}{parent_info}")
+                    output.append(f"**Key:** {key}")
+
+                    # Tags
+                    if tags := data.get("tags"):
+                        tag_list = [f"`{tag['tag']}`" for tag in tags]
+                        if tag_list:
+                            output.append(f"**Tags:** {' '.join(tag_list)}")
 
-        return "\n".join(output) if output else f"No results found for '{query}'"
+                    output.append(f"**Content:**\n{note_text}")
+                    output.append("")
+
+            return "\n".join(output) if output else f"No results found for '{query}'"
 
     except Exception as e:
         ctx.error(f"Error searching notes: {str(e)}")
@@ -1440,6 +2083,7 @@ def search_notes(query: str, limit: Optional[int] = 20, *, ctx: Context) -> str:
 
 
 @mcp.tool(name="zotero_create_note", description="Create a new note for a Zotero item.")
+@run_in_worker_thread
 def create_note(
     item_key: str,
     note_title: str,
@@ -1463,50 +2107,52 @@ def create_note(
     """
     try:
         ctx.info(f"Creating note for item {item_key}")
-        zot = get_zotero_client()
+        with zotero_client() as zot:
 
-        # First verify the parent item exists
-        try:
-            parent = zot.item(item_key)
-            parent_title = parent["data"].get("title", "Untitled Item")
-        except Exception:
-            return f"Error: No item found with key: {item_key}"
+            # First verify the parent item exists
+            try:
+                parent = zot.item(item_key)
+                parent_title = parent["data"].get("title", "Untitled Item")
+            except Exception:
+                return f"Error: No item found with key: {item_key}"
 
-        # Format the note content with proper HTML
-        # If the note_text already has HTML, use it directly
-        if "<p>" in note_text or "<div>" in note_text:
-            html_content = note_text
-        else:
-            # Convert plain text to HTML paragraphs - avoiding f-strings with replacements
-            paragraphs = note_text.split("\n\n")
-            html_parts = []
-            for p in paragraphs:
-                # Replace newlines with <br/> tags
-                p_with_br = p.replace("\n", "<br/>")
-                html_parts.append("<p>" + p_with_br + "</p>")
-            html_content = "".join(html_parts)
-
-        # Prepare the note data
-        note_data = {
-            "itemType": "note",
-            "parentItem": item_key,
-            "note": html_content,
-            "tags": [{"tag": tag} for tag in (tags or [])],
-        }
-
-        # Create the note
-        result = zot.create_items([note_data])
-
-        # Check if creation was successful
-        if "success" in result and result["success"]:
-            successful = result["success"]
-            if len(successful) > 0:
-                note_key = next(iter(successful.keys()))
-                return f'Successfully created note for "{parent_title}"\n\nNote key: {note_key}'
+            # Format the note content with proper HTML
+            # If the note_text already has HTML, use it directly
+            if "<p>" in note_text or "<div>" in note_text:
+                html_content = note_text
             else:
-                return f"Note creation response was successful but no key was returned: {result}"
-        else:
-            return f"Failed to create note: {result.get('failed', 'Unknown error')}"
+                # Convert plain text to HTML paragraphs - avoiding f-strings with replacements
+                paragraphs = note_text.split("\n\n")
+                html_parts = []
+                for p in paragraphs:
+                    # Replace newlines with <br/> tags
+                    p_with_br = p.replace("\n", "<br/>")
+                    html_parts.append("<p>" + p_with_br + "</p>")
+                html_content = "".join(html_parts)
+
+            # Prepare the note data
+            note_data = {
+                "itemType": "note",
+                "parentItem": item_key,
+                "note": html_content,
+                "tags": [{"tag": tag} for tag in (tags or [])],
+            }
+
+            # Create the note
+            result = zot.create_items([note_data])
+
+            # Check if creation was successful
+            if "success" in result and result["success"]:
+                invalidate_library_caches()
+
+                successful = result["success"]
+                if len(successful) > 0:
+                    note_key = next(iter(successful.keys()))
+                    return f'Successfully created note for "{parent_title}"\n\nNote key: {note_key}'
+                else:
+                    return f"Note creation response was successful but no key was returned: {result}"
+            else:
+                return f"Failed to create note: {result.get('failed', 'Unknown error')}"
 
     except Exception as e:
         ctx.error(f"Error creating note: {str(e)}")
@@ -0,0 +1,220 @@
+"""
+Coalescing of identical concurrent Web API requests.
+
+Parallel tool calls from several agents often ask for the same item, the same
+children or the same collection list at the same moment. The single-flight
+transports let only the first of a group of identical GET requests go to the
+API; requests that arrive while it is in flight wait for it and get a copy of
+its response, so the group costs one rate-limit token and one round trip.
+
+Requests are identical when their URL (including the query string) and their
+headers match, so different credentials never share a response. Callers get
+separate response objects built from the same body and parse them on their
+own, so one caller cannot modify the data another one received. File
+downloads are streamed to disk and are never coalesced.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import anyio
+import httpx
+
+# Response extension set on responses that were shared with an in-flight request
+COALESCED = "zotero_coalesced"
+
+# Paths whose responses are streamed rather than read into memory
+_STREAMED_SUFFIXES = ("/file", "/file/view")
+
+_Key = Tuple[str, Tuple[Tuple[bytes, bytes], ...]]
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters of requests sent upstream versus answered by a shared request."""
+
+    issued: int = 0
+    coalesced: int = 0
+
+
+class _Flight:
+    """A request in flight and, once finished, its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[Tuple[int, httpx.Headers, bytes]] = None
+        self.error: Optional[BaseException] = None
+
+    def response_for(self, request: httpx.Request) -> httpx.Response:
+        """A fresh copy of the shared response (or error) for one caller."""
+        if self.error is not None:
+            raise self.error
+        status, headers, content = self.response
+        return httpx.Response(
+            status,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions={COALESCED: True},
+        )
+
+
+class SingleFlight:
+    """Registry of in-flight requests, with counters shared by all transports."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[_Key, _Flight] = {}
+        self._stats = SingleFlightStats()
+
+    @staticmethod
+    def key(request: httpx.Request) -> Optional[_Key]:
+        """The coalescing key of a request, or None if it must be sent alone."""
+        if request.method != "GET" or request.url.path.endswith(_STREAMED_SUFFIXES):
+            return None
+        return str(request.url), tuple(sorted(request.headers.raw))
+
+    def join(self, key: _Key) -> Tuple[_Flight, bool]:
+        """
+        Join the flight for ``key``, starting it if none is in progress.
+
+        Returns:
+            The flight and whether the caller leads it (and must send the
+            request and call finish()).
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self._stats.issued += 1
+            return flight, True
+
+    def count_issued(self) -> None:
+        """Count a request that was sent without coalescing."""
+        with self._lock:
+            self._stats.issued += 1
+
+    def finish(self, key: _Key, flight: _Flight) -> None:
+        """Remove a finished flight and wake the requests waiting for it."""
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.done.set()
+
+    def stats(self) -> SingleFlightStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return SingleFlightStats(**vars(self._stats))
+
+
+def _copy_response(
+    request: httpx.Request, response: httpx.Response, content: bytes
+) -> httpx.Response:
+    """Rebuild a response whose stream was consumed, from its raw body."""
+    # A stream rather than content, so the body is read (and counted) as usual
+    return httpx.Response(
+        response.status_code,
+        headers=response.headers,
+        stream=httpx.ByteStream(content),
+        request=request,
+        extensions=response.extensions,
+    )
+
+
+class SingleFlightTransport(httpx.BaseTransport):
+    """httpx transport that sends identical concurrent GETs upstream once."""
+
+    def __init__(self, transport: httpx.BaseTransport, flights: SingleFlight):
+        """
+        Wrap a transport.
+
+        Args:
+            transport: The transport that actually sends requests.
+            flights: Registry of in-flight requests, shared between transports
+                to coalesce across clients.
+        """
+        self._transport = transport
+        self.flights = flights
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = self.flights.key(request)
+        if key is None:
+            self.flights.count_issued()
+            return self._transport.handle_request(request)
+
+        flight, leader = self.flights.join(key)
+        if not leader:
+            flight.done.wait()
+            return flight.response_for(request)
+
+        try:
+            response = self._transport.handle_request(request)
+            try:
+                # The raw (still encoded) body, so every copy decodes it alike
+                content = b"".join(response.iter_raw())
+            finally:
+                response.close()
+            flight.response = (response.status_code, response.headers, content)
+            return _copy_response(request, response, content)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self.flights.finish(key, flight)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncSingleFlightTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of SingleFlightTransport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, flights: SingleFlight):
+        """
+        Wrap a transport.
+
+        Args:
+            transport: The async transport that actually sends requests.
+            flights: Registry of in-flight requests. Async requests only wait
+                for flights started on the same event loop.
+        """
+        self._transport = transport
+        self.flights = flights
+        # Flights of this transport; a thread Event cannot be awaited
+        self._events: Dict[_Key, anyio.Event] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = self.flights.key(request)
+        if key is None:
+            self.flights.count_issued()
+            return await self._transport.handle_async_request(request)
+
+        # Keys are namespaced per transport, since its connections are bound
+        # to one event loop
+        key = (f"{id(self)}:{key[0]}", key[1])
+        flight, leader = self.flights.join(key)
+        if not leader:
+            await self._events[key].wait()
+            return flight.response_for(request)
+
+        event = self._events[key] = anyio.Event()
+        try:
+            response = await self._transport.handle_async_request(request)
+            try:
+                content = b"".join([chunk async for chunk in response.aiter_raw()])
+            finally:
+                await response.aclose()
+            flight.response = (response.status_code, response.headers, content)
+            return _copy_response(request, response, content)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self.flights.finish(key, flight)
+            del self._events[key]
+            event.set()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,104 @@
+"""
+Background warm-up of the caches when the server starts.
+
+Claude Desktop restarts stdio servers often, and the first tool calls of every
+session used to pay for cold caches. ``serve`` starts a warm-up thread right
+before the transport: it probes the library version (which also confirms the
+results restored from disk) and computes the results of the listing tools,
+at background priority so it yields to the first real tool calls. The warmed
+results, and the results cached when the process exits, are saved to disk
+for the next process.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from zotero_web_mcp import server
+from zotero_web_mcp.client import save_result_cache
+from zotero_web_mcp.rate_limit import background_requests
+
+# What can be warmed up, in the order it is done
+WARM_UP_TARGETS = ("version", "collections", "tags", "recent")
+
+
+class _QuietContext:
+    """Stand-in MCP context for tool calls made without a client."""
+
+    async def _drop(self, *args, **kwargs) -> None:
+        pass
+
+    debug = info = warning = error = log = report_progress = _drop
+
+
+async def _warm_up_target(target: str) -> None:
+    if target == "version":
+        await server.current_library_version()
+    elif target == "collections":
+        await server.get_collections.fn(ctx=_QuietContext())
+    elif target == "tags":
+        await server.get_tags.fn(ctx=_QuietContext())
+    elif target == "recent":
+        await server.get_recent.fn(ctx=_QuietContext())
+    else:
+        raise ValueError(f"Unknown warm-up target '{target}'")
+
+
+def warm_up(targets: Iterable[str] = WARM_UP_TARGETS) -> Dict[str, Optional[float]]:
+    """
+    Fill the caches for the given targets, in the calling thread.
+
+    Args:
+        targets: Names from WARM_UP_TARGETS.
+
+    Returns:
+        Seconds each target took, or None for targets that failed.
+    """
+
+    async def run() -> Dict[str, Optional[float]]:
+        timings: Dict[str, Optional[float]] = {}
+        for target in targets:
+            started = time.perf_counter()
+            try:
+                await _warm_up_target(target)
+            except Exception:
+                timings[target] = None
+            else:
+                timings[target] = time.perf_counter() - started
+        return timings
+
+    with background_requests():
+        timings = asyncio.run(run())
+    _save_quietly()
+    return timings
+
+
+def _save_quietly() -> None:
+    try:
+        save_result_cache()
+    except Exception:
+        pass
+
+
+def save_results_at_exit() -> None:
+    """Save the tool result cache when the process exits, for the next start."""
+    atexit.register(_save_quietly)
+
+
+def start_warm_up(targets: Iterable[str] = WARM_UP_TARGETS) -> threading.Thread:
+    """
+    Warm up the caches in a daemon thread.
+
+    Args:
+        targets: Names from WARM_UP_TARGETS.
+
+    Returns:
+        The started thread.
+    """
+    thread = threading.Thread(
+        target=warm_up, args=(tuple(targets),), name="zotero-warm-up", daemon=True
+    )
+    thread.start()
+    return thread
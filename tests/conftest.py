@@ -0,0 +1,63 @@
+"""Shared fixtures: the fake Zotero Web API from the benchmarks, and clients for it."""
+
+from typing import Iterator
+
+import pytest
+from fake_zotero import LIBRARY_ID, FakeZoteroServer, SyntheticLibrary, make_library
+from pyzotero import zotero
+
+from zotero_web_mcp import client
+from zotero_web_mcp.mirror import LibraryMirror
+
+
+@pytest.fixture
+def library() -> SyntheticLibrary:
+    """A small synthetic library; tests may change it."""
+    return make_library(200)
+
+
+@pytest.fixture
+def fake_api(library: SyntheticLibrary) -> Iterator[FakeZoteroServer]:
+    """The fake Web API serving ``library``."""
+    with FakeZoteroServer(library) as server:
+        yield server
+
+
+@pytest.fixture
+def zot(fake_api: FakeZoteroServer) -> Iterator[zotero.Zotero]:
+    """A pyzotero client for the fake Web API."""
+    zot = zotero.Zotero(LIBRARY_ID, "user", "test-key")
+    zot.endpoint = fake_api.url
+    yield zot
+    zot.client.close()
+
+
+@pytest.fixture
+def mirror(tmp_path) -> Iterator[LibraryMirror]:
+    """An empty library mirror."""
+    mirror = LibraryMirror(str(tmp_path / "mirror.sqlite3"), LIBRARY_ID)
+    yield mirror
+    mirror.close()
+
+
+@pytest.fixture
+def zotero_env(fake_api: FakeZoteroServer, tmp_path, monkeypatch) -> FakeZoteroServer:
+    """Configure the server's shared clients and caches for the fake Web API."""
+    monkeypatch.setenv("ZOTERO_API_BASE_URL", fake_api.url)
+    monkeypatch.setenv("ZOTERO_LIBRARY_ID", LIBRARY_ID)
+    monkeypatch.setenv("ZOTERO_LIBRARY_TYPE", "user")
+    monkeypatch.setenv("ZOTERO_API_KEY", "test-key")
+    monkeypatch.setenv("ZOTERO_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("ZOTERO_RATE_LIMIT", "0")
+    for name in ("_pools", "_mirrors", "_validators", "_result_caches"):
+        monkeypatch.setattr(client, name, {})
+    monkeypatch.setattr(client, "_rate_limiter", None)
+    return fake_api
+
+
+@pytest.fixture
+def synced_mirror(mirror: LibraryMirror, zot: zotero.Zotero) -> LibraryMirror:
+    """A mirror of the fake library, full text included."""
+    mirror.sync(zot)
+    mirror.sync_fulltext(zot)
+    return mirror
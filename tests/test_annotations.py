@@ -0,0 +1,109 @@
+"""Tests for annotation records and for searching without a local mirror."""
+
+from typing import Any, Dict, List, Sequence
+
+import httpx
+
+from zotero_web_mcp.annotations import Annotation, search_annotations
+
+
+def annotation(key: str, text: str = "", tags: Sequence[str] = ()) -> Dict[str, Any]:
+    return {
+        "key": key,
+        "data": {
+            "key": key,
+            "itemType": "annotation",
+            "annotationText": text,
+            "tags": [{"tag": tag} for tag in tags],
+        },
+    }
+
+
+class StubZotero:
+    """The parts of pyzotero's Zotero used by search_annotations."""
+
+    endpoint = "https://api.test"
+    library_type = "users"
+    library_id = "1"
+
+    def __init__(self, annotations: List[Dict[str, Any]]):
+        self.annotations = annotations
+        self.requests: List[Dict[str, str]] = []
+        self.client = httpx.Client(transport=httpx.MockTransport(self._handle))
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/users/1/tags"
+        self.requests.append({"path": "/tags", **request.url.params})
+        query = request.url.params.get("q", "").lower()
+        tags = sorted({t["tag"] for a in self.annotations for t in a["data"]["tags"]})
+        matching = [{"tag": tag} for tag in tags if query in tag.lower()]
+        return httpx.Response(
+            200, json=matching, headers={"Total-Results": str(len(matching))}
+        )
+
+    def items(self, **params: Any) -> List[Dict[str, Any]]:
+        self.requests.append({"path": "/items", **params})
+        assert params["itemType"] == "annotation"
+        results = self.annotations
+        if "q" in params:
+            results = [
+                a
+                for a in results
+                if params["q"].lower() in a["data"]["annotationText"].lower()
+            ]
+        if "tag" in params:
+            wanted = set(params["tag"].split(" || "))
+            results = [
+                a for a in results if wanted & {t["tag"] for t in a["data"]["tags"]}
+            ]
+        start = params.get("start", 0)
+        return results[start : start + params.get("limit", 25)]
+
+
+def test_search_filters_on_the_server():
+    zot = StubZotero(
+        [annotation(f"A{i:04d}", text="unrelated") for i in range(500)]
+        + [annotation("MATCH001", text="A needle in a haystack")]
+    )
+    matches = search_annotations(zot, "Needle")
+    assert [a.key for a in matches] == ["MATCH001"]
+    # One quick search and one tag lookup, never a scan of the library
+    assert [r["path"] for r in zot.requests] == ["/items", "/tags"]
+    assert zot.requests[0]["q"] == "Needle"
+    assert zot.requests[0]["qmode"] == "everything"
+
+
+def test_search_finds_tag_matches_once():
+    zot = StubZotero(
+        [
+            annotation("TEXT0001", text="needle"),
+            annotation("TAG00001", tags=["Needlework"]),
+            annotation("BOTH0001", text="needle", tags=["needle"]),
+            annotation("OTHER001", tags=["-needle"]),
+        ]
+    )
+    matches = search_annotations(zot, "needle")
+    assert [a.key for a in matches] == ["TEXT0001", "BOTH0001", "TAG00001"]
+    tag_requests = [r for r in zot.requests if "tag" in r]
+    assert tag_requests[0]["tag"] == "Needlework || needle"
+
+
+def test_search_stops_at_limit():
+    zot = StubZotero([annotation(f"A{i:04d}", text="needle") for i in range(300)])
+    assert len(search_annotations(zot, "needle", limit=5)) == 5
+    assert [r["path"] for r in zot.requests] == ["/items"]
+
+
+def test_pdf_image_annotations_are_kept_without_a_rendered_image():
+    attachment = {"key": "ATT00001", "data": {"title": "Paper.pdf"}}
+    extracted = [
+        {"id": "1", "type": "highlight", "annotatedText": "needle", "page": 1},
+        {"id": "2", "type": "highlight", "annotatedText": "", "page": 1},
+        {"id": "3", "type": "image", "page": 2},
+        {"id": "4", "type": "ink", "comment": "sketch", "page": 3},
+    ]
+    annotations = [
+        Annotation.from_pdf_extraction(record, attachment, "PARENT01")
+        for record in extracted
+    ]
+    assert [a and a.has_image for a in annotations] == [False, None, True, True]
@@ -0,0 +1,75 @@
+"""Tests for the paging of AsyncZoteroClient reads."""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+import httpx
+
+from zotero_web_mcp.async_client import AsyncZoteroClient
+
+PARENT = "PARENT01"
+
+
+def make_client(
+    n_children: int, total_header: bool = True
+) -> Tuple[AsyncZoteroClient, List[httpx.Request]]:
+    """A client against a stand-in API with one parent of ``n_children``."""
+    children = [
+        {"key": f"CHILD{i:03d}", "data": {"key": f"CHILD{i:03d}", "parentItem": PARENT}}
+        for i in range(n_children)
+    ]
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        assert request.url.path == f"/users/1/items/{PARENT}/children"
+        start = int(request.url.params.get("start", 0))
+        # The Web API returns 25 objects unless asked for more, at most 100
+        limit = min(int(request.url.params.get("limit", 25)), 100)
+        headers = {"Total-Results": str(n_children)} if total_header else {}
+        return httpx.Response(
+            200, json=children[start : start + limit], headers=headers
+        )
+
+    client = AsyncZoteroClient(
+        "1",
+        endpoint="https://api.test",
+        transport=httpx.MockTransport(handler),
+    )
+    return client, requests
+
+
+def children_keys(client: AsyncZoteroClient, limit: Optional[int] = None) -> List[str]:
+    async def run() -> List[str]:
+        try:
+            params = {} if limit is None else {"limit": limit}
+            return [c["key"] for c in await client.children(PARENT, **params)]
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_children_beyond_default_page_size():
+    client, requests = make_client(42)
+    assert children_keys(client) == [f"CHILD{i:03d}" for i in range(42)]
+    assert len(requests) == 1
+    assert requests[0].url.params["limit"] == "100"
+
+
+def test_children_spanning_several_pages():
+    client, requests = make_client(250)
+    assert children_keys(client) == [f"CHILD{i:03d}" for i in range(250)]
+    assert sorted(int(r.url.params["start"]) for r in requests) == [0, 100, 200]
+
+
+def test_children_without_total_results():
+    client, requests = make_client(150, total_header=False)
+    assert len(children_keys(client)) == 150
+    assert len(requests) == 2
+
+
+def test_children_honors_limit():
+    client, requests = make_client(250)
+    assert len(children_keys(client, limit=120)) == 120
+    assert [r.url.params["limit"] for r in requests] == ["100", "20"]
@@ -0,0 +1,71 @@
+"""Tests for batch tag updates with multi-item writes and version checks."""
+
+import asyncio
+
+import pytest
+from fake_zotero import WORDS, make_library
+from fastmcp import Client
+
+from zotero_web_mcp.server import _write_tag_batch, mcp
+
+
+@pytest.fixture
+def library():
+    # Large enough for a query to match more than one write batch
+    return make_library(2000)
+
+
+def tags_of(library, key):
+    return {tag["tag"] for tag in library.items[key]["data"]["tags"]}
+
+
+def posts(fake_api):
+    return [url for method, url in fake_api.request_log if method == "POST"]
+
+
+def test_items_changed_elsewhere_are_refetched_and_written_again(
+    zot, library, fake_api
+):
+    keys = library.top_level_keys[:5]
+    items = zot.items(itemKey=",".join(keys))
+    library.edit(keys[0], tags=[{"tag": "added-elsewhere"}])
+
+    added = {"reviewed": 0}
+    updated, errors = _write_tag_batch(zot, items, ["reviewed"], [], added, {})
+    assert (updated, errors) == (5, [])
+    assert added == {"reviewed": 5}
+    # The conflicting item kept the tag written in the meantime
+    assert tags_of(library, keys[0]) == {"added-elsewhere", "reviewed"}
+    assert all("reviewed" in tags_of(library, key) for key in keys)
+    assert len(posts(fake_api)) == 2
+
+
+def test_unresolved_conflicts_are_reported(zot, library, monkeypatch):
+    key = library.top_level_keys[0]
+    items = zot.items(itemKey=key)
+    library.edit(key, tags=[])
+    # Every re-fetch returns the outdated item again
+    monkeypatch.setattr(zot, "items", lambda **params: items)
+
+    updated, errors = _write_tag_batch(
+        zot, items, ["reviewed"], [], {"reviewed": 0}, {}
+    )
+    assert updated == 0
+    assert len(errors) == 1 and errors[0].startswith(key)
+
+
+def test_tool_writes_fifty_items_per_request(zotero_env, library):
+    query = WORDS[0]
+
+    async def run() -> str:
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "zotero_batch_update_tags", {"query": query, "add_tags": ["reviewed"]}
+            )
+            return result[0].text
+
+    text = asyncio.run(run())
+    tagged = [key for key in library.items if "reviewed" in tags_of(library, key)]
+    assert f"Items updated: {len(tagged)}" in text
+    assert len(tagged) > 50
+    assert len(posts(zotero_env)) == -(-len(tagged) // 50)
@@ -0,0 +1,60 @@
+"""Tests for the size-bounded on-disk conversion cache."""
+
+import os
+
+from zotero_web_mcp.conversion_cache import ConversionCache
+
+
+def age(cache, attachment_key, seconds):
+    """Make an entry look ``seconds`` older than it is."""
+    path = cache._path(cache.cache_key(attachment_key, md5=attachment_key))
+    stat = path.stat()
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+    cache._entries[path] = (stat.st_size, stat.st_mtime - seconds)
+
+
+def test_least_recently_read_entries_are_evicted_first(tmp_path):
+    cache = ConversionCache(str(tmp_path), max_bytes=2500)
+    cache.put("A", "a" * 1000, md5="A")
+    cache.put("B", "b" * 1000, md5="B")
+    age(cache, "A", 20)
+    age(cache, "B", 10)
+    # Reading A makes B the least recently read entry
+    assert cache.get("A", md5="A") == "a" * 1000
+    cache.put("C", "c" * 1000, md5="C")
+
+    assert cache.get("B", md5="B") is None
+    assert cache.get("A", md5="A") is not None
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.entries == 2
+    assert stats.size == 2000
+
+
+def test_a_changed_file_is_a_miss(tmp_path):
+    cache = ConversionCache(str(tmp_path))
+    cache.put("A", "old", md5="1")
+    assert cache.get("A", md5="2") is None
+    assert cache.get("A", md5="1") == "old"
+
+
+def test_item_records_count_towards_the_bound(tmp_path):
+    cache = ConversionCache(str(tmp_path), max_bytes=2000)
+    for i in range(100):
+        cache.put_item("users/1", f"ITEM{i:04d}", 5, "A", "metadata" * 10)
+    stats = cache.stats()
+    assert stats.size <= 2000
+    assert stats.evictions == 100 - stats.entries
+    assert len(os.listdir(tmp_path / "items")) == stats.entries
+    # Reopening finds the same entries
+    reopened = ConversionCache(str(tmp_path), max_bytes=2000).stats()
+    assert (reopened.entries, reopened.size) == (stats.entries, stats.size)
+
+
+def test_item_records_only_serve_their_library_version(tmp_path):
+    cache = ConversionCache(str(tmp_path))
+    cache.put("ATT", "# Text", md5="1")
+    cache.put_item("users/1", "ITEM", 5, "ATT", "metadata", md5="1")
+    assert cache.get_item("users/1", "ITEM", 5) == ("metadata", "# Text")
+    assert cache.get_item("users/1", "ITEM", 6) is None
+    assert cache.get_item("groups/1", "ITEM", 5) is None
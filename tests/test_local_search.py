@@ -0,0 +1,149 @@
+"""Tests for evaluating advanced-search conditions against the mirror."""
+
+import pytest
+
+from zotero_web_mcp.local_search import (
+    SearchCondition,
+    SearchConditionError,
+    advanced_search,
+    compile_conditions,
+    normalize_date,
+)
+
+
+def search(mirror, *conditions, join_mode="all", **kwargs):
+    return advanced_search(
+        mirror,
+        [SearchCondition.from_dict(c) for c in conditions],
+        join_mode=join_mode,
+        **kwargs,
+    )
+
+
+def articles(library):
+    return {
+        key: item["data"]
+        for key, item in library.items.items()
+        if item["data"]["itemType"] == "journalArticle"
+    }
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        {"field": "title", "operation": "resembles", "value": "x"},
+        {"field": "title; DROP TABLE items", "operation": "is", "value": "x"},
+        {"field": "title", "operation": "isBefore", "value": "2000"},
+        {"field": "date", "operation": "is", "value": "last spring"},
+        {"field": "date", "operation": "isInTheLast", "value": "a while"},
+        {"field": "collection", "operation": "contains", "value": "x"},
+        {"field": "volume", "operation": "isLessThan", "value": "many"},
+    ],
+)
+def test_invalid_conditions_are_rejected(condition):
+    with pytest.raises(SearchConditionError):
+        compile_conditions([SearchCondition.from_dict(condition)])
+
+
+def test_values_are_bound_as_parameters():
+    value = "x' OR 1=1 --"
+    where, params = compile_conditions(
+        [SearchCondition("title", "is", value), SearchCondition("tag", "is", value)],
+        join_mode="any",
+    )
+    assert value not in where
+    assert " OR " in where
+    assert params == [value, value]
+
+
+def test_dates_are_normalized():
+    assert normalize_date("2021") == "2021"
+    assert normalize_date("2021/3/7") == "2021-03-07"
+
+
+def test_creator_tag_and_date_conditions(synced_mirror, library):
+    sample = next(iter(articles(library).values()))
+    name = sample["creators"][0]["lastName"]
+    tag = sample["tags"][0]["tag"]
+    before = str(int(sample["date"]) + 10)
+    expected = {
+        key
+        for key, data in articles(library).items()
+        if any(c["lastName"] == name for c in data["creators"])
+        and tag in {t["tag"] for t in data["tags"]}
+        and data["date"] < before
+    }
+    results = search(
+        synced_mirror,
+        {"field": "author", "operation": "is", "value": name.lower()},
+        {"field": "tag", "operation": "is", "value": tag},
+        {"field": "year", "operation": "isBefore", "value": before},
+    )
+    assert {item["key"] for item in results} == expected
+
+
+def test_any_join_and_negation(synced_mirror, library):
+    results = search(
+        synced_mirror,
+        {"field": "itemType", "operation": "isNot", "value": "attachment"},
+        {"field": "itemType", "operation": "isNot", "value": "annotation"},
+    )
+    item_types = {item["data"]["itemType"] for item in results}
+    assert "attachment" not in item_types and "annotation" not in item_types
+
+    results = search(
+        synced_mirror,
+        {"field": "itemType", "operation": "is", "value": "note"},
+        {"field": "itemType", "operation": "is", "value": "attachment"},
+        join_mode="any",
+    )
+    assert {item["data"]["itemType"] for item in results} == {"note", "attachment"}
+
+
+def test_sort_and_limit(synced_mirror):
+    results = search(
+        synced_mirror,
+        {"field": "itemType", "operation": "is", "value": "journalArticle"},
+        sort_by="date",
+        sort_direction="desc",
+        limit=5,
+    )
+    dates = [item["data"]["date"] for item in results]
+    assert len(dates) == 5
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_fulltext_matches_attachments_and_their_parents(synced_mirror, library):
+    attachment, document = next(iter(library.fulltext.items()))
+    parent = library.items[attachment]["data"]["parentItem"]
+    word = document["content"].split()[0]
+    creator = library.items[parent]["data"]["creators"][0]["lastName"]
+
+    keys = {
+        item["key"]
+        for item in search(
+            synced_mirror,
+            {"field": "fulltextContent", "operation": "contains", "value": word},
+        )
+    }
+    assert {attachment, parent} <= keys
+
+    # Combined with a condition on the parent's metadata
+    keys = {
+        item["key"]
+        for item in search(
+            synced_mirror,
+            {"field": "fulltextContent", "operation": "contains", "value": word},
+            {"field": "creator", "operation": "is", "value": creator},
+        )
+    }
+    assert parent in keys
+
+    keys = {
+        item["key"]
+        for item in search(
+            synced_mirror,
+            {"field": "fulltextContent", "operation": "doesNotContain", "value": word},
+        )
+    }
+    assert not {attachment, parent} & keys
@@ -0,0 +1,55 @@
+"""Tests for the metrics registry and the tool metrics middleware."""
+
+import asyncio
+from types import SimpleNamespace
+
+from fastmcp import Client, FastMCP
+from mcp.types import TextContent
+
+from zotero_web_mcp.metrics import Histogram, Metrics, get_metrics
+from zotero_web_mcp.server import ToolMetricsMiddleware, _result_text
+
+
+def test_histogram_quantiles_stay_within_observed_values():
+    histogram = Histogram((1, 10, 100))
+    for value in (2, 3, 4):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) >= 2
+    assert histogram.quantile(0.99) <= 4
+    assert histogram.summary()["count"] == 3
+
+
+def test_prometheus_rendering():
+    metrics = Metrics()
+    metrics.observe_tool_call("tool", 0.2, failed=True, requests=3)
+    text = metrics.render_prometheus()
+    assert 'zotero_tool_calls_total{tool="tool"} 1' in text
+    assert 'zotero_tool_errors_total{tool="tool"} 1' in text
+    assert 'zotero_tool_upstream_requests_bucket{tool="tool",le="3"} 1' in text
+
+
+def test_result_text_of_content_lists_and_tool_results():
+    blocks = [TextContent(type="text", text="Error: nope")]
+    assert _result_text(blocks) == "Error: nope"
+    assert _result_text(SimpleNamespace(content=blocks)) == "Error: nope"
+    assert _result_text([]) == ""
+
+
+def test_middleware_records_calls_and_error_results():
+    app = FastMCP("metrics-test")
+    app.add_middleware(ToolMetricsMiddleware())
+
+    @app.tool(name="metrics_test_echo")
+    def echo(text: str) -> str:
+        return text
+
+    async def run() -> None:
+        async with Client(app) as client:
+            await client.call_tool("metrics_test_echo", {"text": "fine"})
+            await client.call_tool("metrics_test_echo", {"text": "Error: failed"})
+
+    asyncio.run(run())
+    summary = get_metrics().summary()["tools"]["metrics_test_echo"]
+    assert summary["calls"] == 2
+    assert summary["errors"] == 1
+    assert summary["upstream_requests"]["max"] == 0
@@ -0,0 +1,110 @@
+"""Tests for the version-based sync of the local library mirror."""
+
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from zotero_web_mcp import mirror as mirror_module
+from zotero_web_mcp.server import get_synced_mirror
+
+
+def requests_since(fake_api, start):
+    """(path, query) of every request the fake API got after the first ``start``."""
+    requests = []
+    for _, url in fake_api.request_log[start:]:
+        parsed = urlparse(url)
+        requests.append((parsed.path, parse_qs(parsed.query)))
+    return requests
+
+
+def first_of_type(library, item_type):
+    return next(
+        key
+        for key, item in library.items.items()
+        if item["data"]["itemType"] == item_type
+    )
+
+
+def test_first_sync_pulls_the_whole_library(mirror, zot, library):
+    result = mirror.sync(zot)
+    assert result.items_updated == len(library.items)
+    assert result.collections_updated == len(library.collections)
+    assert mirror.library_version == library.version
+    key = first_of_type(library, "journalArticle")
+    assert mirror.item(key)["data"]["title"] == library.items[key]["data"]["title"]
+
+
+def test_incremental_sync_fetches_only_changes_and_deletions(
+    mirror, zot, library, fake_api
+):
+    mirror.sync(zot)
+    since = library.version
+    edited = first_of_type(library, "journalArticle")
+    deleted = first_of_type(library, "note")
+    library.edit(edited, title="Edited elsewhere")
+    library.delete(deleted)
+
+    start = len(fake_api.request_log)
+    result = mirror.sync(zot)
+    assert result.previous_version == since
+    assert result.library_version == library.version
+    assert result.items_updated == 1
+    assert result.objects_deleted == 1
+    assert mirror.item(edited)["data"]["title"] == "Edited elsewhere"
+    assert mirror.item(deleted) is None
+
+    requests = requests_since(fake_api, start)
+    assert {path.rsplit("/", 1)[-1] for path, _ in requests} == {
+        "collections",
+        "searches",
+        "items",
+        "deleted",
+    }
+    assert all(query["since"] == [str(since)] for _, query in requests)
+
+
+def test_sync_starts_over_when_the_library_changes_midway(
+    mirror, zot, library, monkeypatch
+):
+    edited = first_of_type(library, "journalArticle")
+    fetch_all_pages = mirror_module.fetch_all_pages
+    attempts = []
+
+    def edit_before_items(zot, path, **kwargs):
+        if path == "/items":
+            attempts.append(kwargs["headers"]["If-Unmodified-Since-Version"])
+            if len(attempts) == 1:
+                library.edit(edited, title="Edited during the sync")
+        return fetch_all_pages(zot, path, **kwargs)
+
+    monkeypatch.setattr(mirror_module, "fetch_all_pages", edit_before_items)
+    result = mirror.sync(zot)
+    # The first attempt was pinned to the version before the edit
+    assert attempts == [str(library.version - 1), str(library.version)]
+    assert result.library_version == library.version
+    assert mirror.item(edited)["data"]["title"] == "Edited during the sync"
+
+
+def test_ensure_synced_waits_for_the_interval(mirror, zot, fake_api):
+    assert mirror.ensure_synced(zot, max_age=60) is not None
+    start = len(fake_api.request_log)
+    assert mirror.ensure_synced(zot, max_age=60) is None
+    assert len(fake_api.request_log) == start
+
+
+def test_fulltext_sync_is_capped_and_resumes(mirror, zot, library):
+    mirror.sync(zot)
+    assert mirror.ensure_fulltext_synced(zot, max_age=60, max_items=10) == 10
+    assert mirror.fulltext_pending == len(library.fulltext) - 10
+    # An incomplete index stays due, and the next run picks up the rest
+    indexed = mirror.ensure_fulltext_synced(zot, max_age=60)
+    assert indexed == len(library.fulltext) - 10
+    assert mirror.fulltext_pending == 0
+    assert mirror.ensure_fulltext_synced(zot, max_age=60) is None
+
+
+def test_synced_mirror_for_local_only_tools_waits_for_the_interval(zotero_env, zot):
+    ctx = SimpleNamespace(info=lambda *args: None, warning=lambda *args: None)
+    assert get_synced_mirror(zot, ctx, even_if_disabled=True) is not None
+    start = len(zotero_env.request_log)
+    assert get_synced_mirror(zot, ctx, even_if_disabled=True) is not None
+    assert len(zotero_env.request_log) == start
@@ -0,0 +1,105 @@
+"""Tests for the rate limiter and the Backoff/Retry-After handling."""
+
+import email.utils
+import threading
+import time
+
+import httpx
+import pytest
+
+from zotero_web_mcp.rate_limit import (
+    BACKGROUND,
+    INTERACTIVE,
+    RateLimitedTransport,
+    RateLimiter,
+    background_requests,
+    parse_retry_after,
+)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    later = email.utils.formatdate(time.time() + 60, usegmt=True)
+    assert 55 < parse_retry_after(later) <= 60
+
+
+def test_burst_then_sustained_rate():
+    limiter = RateLimiter(rate=20, burst=3)
+    waits = [limiter.acquire() for _ in range(5)]
+    assert max(waits[:3]) < 0.01
+    assert 0.03 < waits[3] < 0.2
+
+
+def test_interactive_requests_go_before_waiting_background_ones():
+    limiter = RateLimiter(rate=10, burst=1)
+    limiter.acquire()
+    order = []
+
+    def acquire(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+
+    background = threading.Thread(target=acquire, args=(BACKGROUND,))
+    background.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=acquire, args=(INTERACTIVE,))
+    interactive.start()
+    background.join()
+    interactive.join()
+    assert order == [INTERACTIVE, BACKGROUND]
+
+
+def test_background_requests_sets_the_default_priority(monkeypatch):
+    limiter = RateLimiter(rate=0)
+    priorities = []
+    monkeypatch.setattr(limiter, "_take", lambda p: priorities.append(p) or 0.0)
+    limiter.acquire()
+    with background_requests():
+        limiter.acquire()
+    assert priorities == [INTERACTIVE, BACKGROUND]
+
+
+@pytest.fixture
+def limited(fake_api):
+    limiter = RateLimiter(rate=0)
+    transport = RateLimitedTransport(httpx.HTTPTransport(), limiter, max_retries=2)
+    with httpx.Client(transport=transport, base_url=fake_api.url) as http:
+        yield http, limiter
+
+
+def test_retry_after_pauses_and_retries(limited, fake_api):
+    http, limiter = limited
+    fake_api.throttle(headers={"Retry-After": "0.3"})
+    started = time.monotonic()
+    response = http.get("/users/1/collections")
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.3
+    assert fake_api.requests == 2
+    stats = limiter.stats()
+    assert (stats.pauses, stats.retries) == (1, 1)
+
+
+def test_writes_are_not_retried(limited, fake_api):
+    http, limiter = limited
+    fake_api.throttle(status=503, headers={"Retry-After": "0"})
+    assert http.post("/users/1/items", json=[]).status_code == 503
+    assert fake_api.requests == 1
+    assert limiter.stats().retries == 0
+
+
+def test_retries_are_bounded(limited, fake_api):
+    http, limiter = limited
+    fake_api.throttle(count=5, headers={"Retry-After": "0"})
+    assert http.get("/users/1/collections").status_code == 429
+    assert fake_api.requests == 3
+
+
+def test_a_pause_holds_back_later_requests(limited, fake_api):
+    http, limiter = limited
+    limiter.pause(0.3)
+    started = time.monotonic()
+    assert http.get("/users/1/collections").status_code == 200
+    assert time.monotonic() - started >= 0.3
@@ -0,0 +1,118 @@
+"""Tests for the in-memory tool result cache."""
+
+import time
+
+from zotero_web_mcp.library_version import LibraryChanges
+from zotero_web_mcp.result_cache import COLLECTIONS, ITEMS, ToolResultCache
+
+ITEMS_KEY = ToolResultCache.make_key("zotero_search_items", {"query": "a"})
+COLLECTIONS_KEY = ToolResultCache.make_key("zotero_get_collections", {"limit": None})
+
+
+def test_keys_ignore_argument_order():
+    assert ToolResultCache.make_key("tool", {"a": 1, "b": 2}) == (
+        ToolResultCache.make_key("tool", {"b": 2, "a": 1})
+    )
+
+
+def test_results_are_served_for_their_version_until_they_expire():
+    cache = ToolResultCache()
+    cache.put(ITEMS_KEY, "result", version=5, ttl=0.1)
+    assert cache.get(ITEMS_KEY, 5) == "result"
+    assert cache.get(ITEMS_KEY, 6) is None
+    time.sleep(0.15)
+    assert cache.get(ITEMS_KEY, 5) is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+def test_results_without_a_ttl_are_not_stored():
+    cache = ToolResultCache()
+    cache.put(ITEMS_KEY, "result", version=5, ttl=0)
+    assert cache.stats().entries == 0
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = ToolResultCache(max_entries=2)
+    keys = [ToolResultCache.make_key("tool", {"n": n}) for n in range(3)]
+    cache.put(keys[0], "0", version=1, ttl=60)
+    cache.put(keys[1], "1", version=1, ttl=60)
+    cache.get(keys[0], 1)
+    cache.put(keys[2], "2", version=1, ttl=60)
+    assert cache.get(keys[1], 1) is None
+    assert cache.get(keys[0], 1) == "0"
+    assert cache.stats().evictions == 1
+
+
+def test_total_size_is_bounded():
+    cache = ToolResultCache(max_bytes=250)
+    for n in range(5):
+        cache.put(ToolResultCache.make_key("tool", {"n": n}), "x" * 100, 1, ttl=60)
+    # A result larger than the whole cache is never stored
+    cache.put(ToolResultCache.make_key("tool", {"n": 5}), "x" * 300, 1, ttl=60)
+    stats = cache.stats()
+    assert (stats.entries, stats.size, stats.evictions) == (2, 200, 3)
+
+
+def test_unaffected_results_are_carried_to_the_new_version():
+    cache = ToolResultCache()
+    cache.put(ITEMS_KEY, "items", version=5, ttl=60)
+    cache.put(COLLECTIONS_KEY, "collections", 5, ttl=60, depends_on=(COLLECTIONS,))
+    cache.apply_changes(LibraryChanges(5, 6, item_keys={"ABCD2345"}))
+    assert cache.get(COLLECTIONS_KEY, 6) == "collections"
+    assert cache.get(ITEMS_KEY, 6) is None
+
+    cache.apply_changes(LibraryChanges(6, 7, everything=True))
+    assert cache.get(COLLECTIONS_KEY, 7) is None
+
+
+def test_outdated_results_can_be_peeked_while_refreshing():
+    cache = ToolResultCache()
+    cache.put(ITEMS_KEY, "items", version=5, ttl=60, depends_on=(ITEMS,))
+    cache.apply_changes(LibraryChanges(5, 6, item_keys={"ABCD2345"}))
+    peeked = cache.peek(ITEMS_KEY, max_age=60)
+    assert (peeked.value, peeked.version, peeked.expired) == ("items", 5, False)
+    assert cache.peek(ITEMS_KEY, max_age=0) is None
+
+    cache.record_peek(stale=True)
+    cache.record_peek(stale=False)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.stale_hits) == (1, 0, 1)
+
+
+def test_invalidate_drops_one_tool_or_everything():
+    cache = ToolResultCache()
+    cache.put(ITEMS_KEY, "items", version=5, ttl=60)
+    cache.put(COLLECTIONS_KEY, "collections", version=5, ttl=60)
+    cache.invalidate("zotero_search_items")
+    assert cache.get(ITEMS_KEY, 5) is None
+    assert cache.get(COLLECTIONS_KEY, 5) == "collections"
+    cache.invalidate()
+    assert cache.stats().entries == 0
+
+
+def test_saved_results_are_loaded_in_order(tmp_path):
+    path = str(tmp_path / "cache" / "results.json")
+    cache = ToolResultCache()
+    keys = [ToolResultCache.make_key("tool", {"n": n}) for n in range(3)]
+    for n, key in enumerate(keys):
+        cache.put(key, str(n), version=5, ttl=60)
+    cache.get(keys[0], 5)
+    cache.save(path, library_version=5)
+
+    # Only the two most recently used results fit
+    loaded = ToolResultCache(max_entries=2)
+    assert loaded.load(path) == 5
+    assert loaded.get(keys[1], 5) is None
+    assert loaded.get(keys[2], 5) == "2"
+    assert loaded.get(keys[0], 5) == "0"
+    # Results cached before loading are kept
+    cache.put(keys[0], "new", version=6, ttl=60)
+    assert cache.load(path) == 5
+    assert cache.get(keys[0], 6) == "new"
+
+
+def test_a_missing_file_loads_nothing(tmp_path):
+    cache = ToolResultCache()
+    assert cache.load(str(tmp_path / "missing.json")) is None
+    assert cache.stats().entries == 0
@@ -0,0 +1,82 @@
+"""Tests for coalescing identical concurrent requests."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from zotero_web_mcp.single_flight import (
+    COALESCED,
+    AsyncSingleFlightTransport,
+    SingleFlight,
+    SingleFlightTransport,
+)
+
+
+@pytest.fixture
+def flights():
+    return SingleFlight()
+
+
+@pytest.fixture
+def http(fake_api, flights):
+    # Slow enough for concurrent requests to overlap
+    fake_api.latency = 0.2
+    transport = SingleFlightTransport(httpx.HTTPTransport(), flights)
+    with httpx.Client(transport=transport, base_url=fake_api.url) as http:
+        yield http
+
+
+def concurrently(*calls):
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        return [f.result() for f in [pool.submit(call) for call in calls]]
+
+
+def test_identical_concurrent_gets_share_one_request(http, flights, fake_api):
+    responses = concurrently(*[lambda: http.get("/users/1/items/top")] * 5)
+    assert fake_api.requests == 1
+    assert (flights.stats().issued, flights.stats().coalesced) == (1, 4)
+    assert sum(bool(r.extensions.get(COALESCED)) for r in responses) == 4
+
+    # Every caller parses its own copy
+    bodies = [r.json() for r in responses]
+    bodies[0].clear()
+    assert all(body == bodies[1] for body in bodies[2:]) and bodies[1]
+
+
+def test_different_requests_are_sent_separately(http, fake_api):
+    concurrently(
+        lambda: http.get("/users/1/items/top"),
+        lambda: http.get("/users/1/items/top", params={"limit": 5}),
+        lambda: http.get("/users/1/items/top", headers={"Zotero-API-Key": "other"}),
+        lambda: http.post("/users/1/items", json=[]),
+        lambda: http.post("/users/1/items", json=[]),
+    )
+    assert fake_api.requests == 5
+
+
+def test_finished_requests_are_not_reused(http, fake_api):
+    http.get("/users/1/collections")
+    http.get("/users/1/collections")
+    assert fake_api.requests == 2
+
+
+def test_async_requests_coalesce_on_their_own_event_loop(http, flights, fake_api):
+    async def get_async():
+        transport = AsyncSingleFlightTransport(httpx.AsyncHTTPTransport(), flights)
+        async with httpx.AsyncClient(
+            transport=transport, base_url=fake_api.url
+        ) as client:
+            return await asyncio.gather(
+                *[client.get("/users/1/items/top") for _ in range(3)]
+            )
+
+    responses = concurrently(
+        lambda: asyncio.run(get_async()), lambda: http.get("/users/1/items/top")
+    )
+    # One request for the async client and one for the sync one, which runs
+    # on no event loop the async requests could wait on
+    assert fake_api.requests == 2
+    assert flights.stats().coalesced == 2
+    assert all(r.status_code == 200 for r in [*responses[0], responses[1]])